@@ -0,0 +1,143 @@
+"""Benchmark aplikasi Streamlit secara headless dengan spreadsheet palsu berisi data sintetis.
+
+Tidak perlu akun Google: kas.data.build_client diganti supaya
+connect_to_gsheet membuka FakeSpreadsheet, lalu skrip dijalankan lewat
+streamlit.testing AppTest. Tiap skenario melaporkan jumlah API call dan
+waktu wall-clock.
+
+Jalankan: python -m benchmarks.app [--baris 500] [--latency 0.1]
+"""
+import argparse
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synthetic import nama_bulan, synthetic_spreadsheet
+
+APP = Path(__file__).resolve().parent.parent / "kascendana.py"
+TAHUN = 2025
+IURAN = f"StatusIuran{TAHUN}"
+
+
+class AppHarness:
+    def __init__(self, spreadsheet, timeout=300):
+        self.spreadsheet = spreadsheet
+        self.timeout = timeout
+        self.halaman = "Overview"
+        self.hasil = []
+
+    @contextmanager
+    def patched(self):
+        client = mock.Mock()
+        client.open.return_value = self.spreadsheet
+        client.open_by_key.return_value = self.spreadsheet
+        with tempfile.TemporaryDirectory() as mirror_dir, mock.patch.dict(os.environ, {
+            "KAS_MIRROR_DIR": mirror_dir,
+            # Sinkronisasi latar dimatikan supaya hitungan API call per skenario tidak tercampur
+            "KAS_MIRROR_SYNC_INTERVAL": "86400",
+        }), mock.patch("kas.data.build_client", return_value=client), mock.patch(
+            "streamlit_option_menu.option_menu", side_effect=lambda **kwargs: self.halaman
+        ):
+            st.cache_resource.clear()
+            yield
+
+    def new_app(self):
+        at = AppTest.from_file(str(APP), default_timeout=self.timeout)
+        at.secrets["gcp_service_account"] = {}
+        return at
+
+    def ukur(self, label, fn):
+        self.spreadsheet.reset_calls()
+        mulai = time.perf_counter()
+        at = fn()
+        durasi = time.perf_counter() - mulai
+        if at is not None:
+            assert not at.exception, [e.value for e in at.exception]
+            assert not at.error, [e.value for e in at.error]
+        self.hasil.append((label, self.spreadsheet.total_calls, durasi, dict(self.spreadsheet.calls)))
+        return at
+
+    def tunggu(self, kondisi, timeout=30):
+        batas = time.monotonic() + timeout
+        while not kondisi():
+            if time.monotonic() > batas:
+                raise TimeoutError("kondisi tidak terpenuhi")
+            time.sleep(0.01)
+
+    def laporan(self):
+        print(f"{'skenario':<34} {'call':>5} {'ms':>9}  rincian")
+        for label, calls, durasi, rincian in self.hasil:
+            print(f"{label:<34} {calls:>5} {durasi * 1000:>9.1f}  {rincian}")
+
+
+def nilai_sheet(spreadsheet, nama_sheet):
+    return spreadsheet._worksheets[nama_sheet].values
+
+
+def jalankan(baris_per_bulan, latency):
+    ss = synthetic_spreadsheet(baris_per_bulan, latency=latency, tahun=TAHUN)
+    h = AppHarness(ss)
+    bulan_list = nama_bulan(TAHUN)
+    bulan_awal = bulan_list[min(max(time.localtime().tm_mon - 6, 0), len(bulan_list) - 1)]
+    bulan_lain = bulan_list[0] if bulan_awal != bulan_list[0] else bulan_list[1]
+
+    with h.patched():
+        at = h.new_app()
+        h.ukur("load_data + Overview (cold)", lambda: at.run())
+        h.ukur("Overview rerun (warm)", lambda: at.run())
+        pilih_bulan = [s for s in at.selectbox if s.label == "Pilih Bulan:"][0]
+        h.ukur("ganti bulan", lambda: pilih_bulan.set_value(bulan_lain).run())
+
+        h.halaman = "Analitik Tahunan"
+        h.ukur("Analitik Tahunan", lambda: at.run())
+
+        # Tandai lunas: pilih dua baris pertama halaman 1 lewat state data_editor
+        h.halaman = "Overview"
+        at.run()
+        versi = at.session_state["versi_editor_belum"] if "versi_editor_belum" in at.session_state else 0
+        at.session_state[f"editor_belum_{bulan_lain}_1_{versi}"] = {
+            "edited_rows": {0: {"Pilih": True}, 1: {"Pilih": True}}, "added_rows": [], "deleted_rows": [],
+        }
+        tombol = [b for b in at.button if b.label == "Tandai Lunas yang Dipilih"][0]
+        h.ukur("tandai lunas 2 baris", lambda: tombol.click().run())
+
+        h.halaman = "Input Pengeluaran"
+        at.run()
+        baris_awal = len(nilai_sheet(ss, bulan_lain))
+        [n for n in at.number_input if n.label == "Jumlah"][0].set_value(25000)
+        tombol = [b for b in at.button if "Simpan" in b.label][0]
+        h.ukur("input pengeluaran", lambda: tombol.click().run())
+        assert len(nilai_sheet(ss, bulan_lain)) == baris_awal + 1
+
+        # Toggle iuran: klik kembali seketika, penulisan diukur sampai benar-benar tersimpan di sheet
+        h.halaman = "Input Pembayaran Kas"
+        at.run()
+        cb = at.checkbox(key="cb_Yopha")
+        target = "BELUM LUNAS" if cb.value else "LUNAS"
+        tersimpan = lambda: any(row[:3] == [bulan_lain, "Yopha", target] for row in nilai_sheet(ss, IURAN))
+        h.ukur("toggle iuran (klik)", lambda: cb.set_value(target == "LUNAS").run())
+        h.ukur("toggle iuran (sampai tersimpan)", lambda: h.tunggu(tersimpan))
+        # Cache & mirror di-patch oleh thread latar setelah sheet ditulis; tunggu sampai status ⏳ hilang
+        h.tunggu(lambda: not any("⏳" in c.value for c in at.run().caption))
+
+    h.laporan()
+    return h.hasil
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, default=500, help="baris pengeluaran per bulan")
+    parser.add_argument("--latency", type=float, default=0.1, help="detik per panggilan API palsu")
+    args = parser.parse_args(argv)
+    print(f"{args.baris} baris/bulan, latency {args.latency * 1000:.0f} ms/call")
+    jalankan(args.baris, args.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Cold start mode tabel: tabel transaksi dibaca utuh vs per potongan A1 dari baris terbaru.
+
+Jalur lama: satu values_batch_get seluruh tabel ke mirror, read_values, lalu
+pecah_per_bulan; halaman baru bisa dirender setelah semuanya selesai. Jalur
+baru: stream_mirror + TabelBertahap; ringkasan bulan terbaru bisa dirender
+setelah potongan pertama. Diukur waktu sampai render pertama (spreadsheet
+palsu dengan latency per request dan per sel) dan memori puncak (tracemalloc),
+juga untuk membangun ulang cache dari mirror (read_values vs read_chunks) dan
+untuk tarik penuh ke mirror yang sudah ada (Muat Ulang, cari ulang saat Tandai
+Lunas, perbandingan penuh poller): satu values_batch_get vs sync_bertahap.
+
+Jalankan: python -m benchmarks.baca_bertahap [--baris 5000] [--potongan 2000]
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import nama_bulan, synthetic_spreadsheet
+from kas.migrasi import migrasi
+from kas.mirror import LocalMirror, stream_mirror, sync_mirror
+from kas.transaksi import TabelBertahap, pecah_per_bulan
+
+TABEL = "Transaksi"
+
+
+def jalur_lama(ss, mirror, bulan, ukuran):
+    sync_mirror(ss, mirror, [TABEL])
+    frames = pecah_per_bulan(mirror.read_values(TABEL))
+    yield frames[bulan]
+    yield frames
+
+
+def jalur_baru(ss, mirror, bulan, ukuran):
+    headers, potongan = stream_mirror(ss, mirror, TABEL, ukuran)
+    tabel = TabelBertahap(headers)
+    for first_row, rows in potongan:
+        tabel.tambah(first_row, rows)
+        yield tabel.bulan(bulan)
+    yield tabel.frames()
+
+
+def mirror_lama(mirror, ukuran):
+    return pecah_per_bulan(mirror.read_values(TABEL))
+
+
+def mirror_baru(mirror, ukuran):
+    headers, potongan = mirror.read_chunks(TABEL, ukuran)
+    tabel = TabelBertahap(headers)
+    for first_row, rows in potongan:
+        tabel.tambah(first_row, rows)
+    return tabel.frames()
+
+
+def ukur_waktu(jalur, ss, bulan, ukuran):
+    # (ms sampai DataFrame bulan pertama kali ada, ms sampai semua bulan selesai, jumlah request, frames)
+    with tempfile.TemporaryDirectory() as tmp:
+        ss.reset_calls()
+        mulai = time.perf_counter()
+        hasil = jalur(ss, LocalMirror(tmp), bulan, ukuran)
+        pertama = next(hasil)
+        t_pertama = time.perf_counter() - mulai
+        for frames in hasil:
+            pass
+        return t_pertama * 1000, (time.perf_counter() - mulai) * 1000, ss.total_calls, len(pertama), frames
+
+
+def ukur_memori(fn):
+    tracemalloc.start()
+    try:
+        hasil = fn()
+        return hasil, tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def sama(a, b):
+    assert list(a) == list(b)
+    for bulan in a:
+        pd.testing.assert_frame_equal(a[bulan], b[bulan])
+        assert a[bulan].attrs == b[bulan].attrs, bulan
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, default=5000, help="baris pengeluaran per bulan")
+    parser.add_argument("--potongan", type=int, default=2000, help="baris per request di jalur baru")
+    parser.add_argument("--latency", type=float, default=0.15, help="detik per request")
+    parser.add_argument("--latency-sel", type=float, default=2e-6, help="detik per sel yang dikirim")
+    args = parser.parse_args(argv)
+
+    ss = synthetic_spreadsheet(args.baris)
+    migrasi(ss)
+    bulan = nama_bulan(2025)[-1]
+    jumlah = len(ss._worksheets[TABEL].values) - 1
+    print(f"{jumlah} baris transaksi, potongan {args.potongan} baris, bulan terbaru {bulan}")
+
+    ss.latency, ss.cell_latency = args.latency, args.latency_sel
+    print(f"{'cold start':<12} {'render pertama':>15} {'selesai':>10} {'request':>8} {'baris bulan':>12} {'memori puncak':>14}")
+    hasil = {}
+    for nama, jalur in (("utuh", jalur_lama), ("bertahap", jalur_baru)):
+        t_pertama, t_total, calls, baris, frames = ukur_waktu(jalur, ss, bulan, args.potongan)
+        hasil[nama] = (t_pertama, t_total, frames)
+        ss.latency, latency_sel, ss.cell_latency = 0.0, ss.cell_latency, 0.0
+        with tempfile.TemporaryDirectory() as tmp:
+            mirror = LocalMirror(tmp)
+            _, puncak = ukur_memori(lambda: list(jalur(ss, mirror, bulan, args.potongan)))
+        ss.latency, ss.cell_latency = args.latency, latency_sel
+        hasil[nama] += (puncak,)
+        print(f"{nama:<12} {t_pertama:>12.0f} ms {t_total:>7.0f} ms {calls:>8} {baris:>12} {puncak:>11.1f} MB")
+
+    sama(hasil["utuh"][2], hasil["bertahap"][2])
+    assert hasil["bertahap"][0] < hasil["utuh"][0], "render pertama tidak lebih cepat"
+    assert hasil["bertahap"][3] < hasil["utuh"][3], "memori puncak tidak lebih kecil"
+
+    # Cache dibangun ulang dari mirror (mis. setelah tabel transaksi berubah): tanpa request
+    ss.latency = ss.cell_latency = 0.0
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = LocalMirror(tmp)
+        sync_mirror(ss, mirror, [TABEL])
+        print(f"{'dari mirror':<12} {'waktu':>15} {'memori puncak':>25}")
+        frames = {}
+        for nama, fn in (("read_values", mirror_lama), ("read_chunks", mirror_baru)):
+            mulai = time.perf_counter()
+            fn(mirror, args.potongan)
+            t = (time.perf_counter() - mulai) * 1000
+            frames[nama], puncak = ukur_memori(lambda: fn(mirror, args.potongan))
+            print(f"{nama:<12} {t:>12.0f} ms {puncak:>22.1f} MB")
+        sama(frames["read_values"], frames["read_chunks"])
+        # Tarik penuh saat mirror sudah ada, satu status diubah orang lain
+        print(f"{'tarik penuh':<12} {'waktu':>15} {'memori puncak':>25}")
+        for nama, bertahap in (("utuh", None), ("bertahap", {TABEL: args.potongan})):
+            with tempfile.TemporaryDirectory() as tmp2:
+                mirror2 = LocalMirror(tmp2)
+                sync_mirror(ss, mirror2, [TABEL])
+                ws = ss._worksheets[TABEL]
+
+                def tarik():
+                    ws.values[-10][7] = "SUDAH" if ws.values[-10][7] != "SUDAH" else "BELUM"
+                    changed = sync_mirror(ss, mirror2, [TABEL], full=True, bertahap=bertahap)
+                    assert changed == [TABEL], changed
+
+                mulai = time.perf_counter()
+                tarik()
+                t = (time.perf_counter() - mulai) * 1000
+                _, puncak = ukur_memori(tarik)
+                assert mirror2.read_values(TABEL) == ws.values
+                print(f"{nama:<12} {t:>12.0f} ms {puncak:>22.1f} MB")
+                hasil["tarik " + nama] = puncak
+        assert hasil["tarik bertahap"] < hasil["tarik utuh"], "memori puncak tarik penuh tidak lebih kecil"
+    print("DataFrame semua bulan identik di kedua jalur, mirror identik dengan sheet")
+
+
+if __name__ == "__main__":
+    main()
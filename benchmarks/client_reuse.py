@@ -0,0 +1,110 @@
+"""Hitung request yang dihemat oleh kas.client: token bersama, key spreadsheet, handle worksheet.
+
+Token endpoint Google diganti callable palsu yang mencatat jumlah panggilan,
+jadi tidak butuh jaringan maupun service account sungguhan.
+
+Jalankan: python -m benchmarks.client_reuse
+"""
+import json
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.oauth2 import service_account
+
+from benchmarks.fake_gsheet import FakeSpreadsheet
+from kas.client import CachingSpreadsheet, SharedTokenCredentials, SpreadsheetKeyCache, open_spreadsheet
+
+REPLIKA = 4
+
+
+def service_account_info():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    return {
+        "type": "service_account",
+        "client_email": "kas@contoh.iam.gserviceaccount.com",
+        "private_key": pem,
+        "private_key_id": "1",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }
+
+
+class FakeTokenEndpoint:
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, method="GET", body=None, headers=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+            nomor = self.calls
+        time.sleep(self.latency)
+        data = json.dumps({"access_token": f"token-{nomor}", "expires_in": 3600}).encode()
+        return mock.Mock(status=200, data=data, headers={})
+
+
+def refresh_paralel(daftar_creds, request):
+    threads = [threading.Thread(target=creds.refresh, args=(request,)) for creds in daftar_creds]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def skenario_token(info):
+    # Tiap replika punya objek kredensial sendiri; yang dibagi hanya file token
+    endpoint = FakeTokenEndpoint()
+    biasa = [service_account.Credentials.from_service_account_info(info, scopes=["x"]) for _ in range(REPLIKA)]
+    refresh_paralel(biasa, endpoint)
+    calls_biasa = endpoint.calls
+
+    endpoint = FakeTokenEndpoint()
+    with tempfile.TemporaryDirectory() as tmp:
+        bersama = [SharedTokenCredentials.from_info(info, token_file=f"{tmp}/token.json") for _ in range(REPLIKA)]
+        refresh_paralel(bersama, endpoint)
+        assert endpoint.calls == 1
+        assert len({creds.token for creds in bersama}) == 1
+        # Replika yang start belakangan juga memakai token yang sama tanpa request
+        telat = SharedTokenCredentials.from_info(info, token_file=f"{tmp}/token.json")
+        telat.refresh(endpoint)
+        assert endpoint.calls == 1 and telat.token == bersama[0].token
+    print(f"{REPLIKA} replika refresh token: biasa {calls_biasa} request, file bersama {endpoint.calls} request")
+
+
+def skenario_key():
+    ss = FakeSpreadsheet({"Juni2025": [["Tanggal"]]})
+    client = mock.Mock()
+    client.open.return_value = ss
+    client.open_by_key.return_value = ss
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(REPLIKA):
+            # Cold start tiap replika: cache key dibaca dari direktori bersama
+            assert open_spreadsheet(client, "KAS CENDANA", SpreadsheetKeyCache(tmp)) is ss
+    assert client.open.call_count == 1 and client.open_by_key.call_count == REPLIKA - 1
+    print(f"{REPLIKA} cold start: {client.open.call_count} pencarian Drive (open), {client.open_by_key.call_count} open_by_key")
+
+
+def skenario_worksheet(jumlah_tulis=20):
+    ss = FakeSpreadsheet({"Juni2025": [["Tanggal"]]})
+    cached = CachingSpreadsheet(ss)
+    for _ in range(jumlah_tulis):
+        cached.worksheet("Juni2025").append_rows([["2025-06-01"]])
+    assert ss.calls["worksheet"] == 1 and ss.calls["append_rows"] == jumlah_tulis
+    print(f"{jumlah_tulis} penulisan: {ss.calls['worksheet']} lookup worksheet (tanpa cache: {jumlah_tulis})")
+
+
+def main():
+    skenario_token(service_account_info())
+    skenario_key()
+    skenario_worksheet()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Spreadsheet palsu di memori yang meniru method gspread yang dipakai aplikasi.
+
+Setiap panggilan yang di gspread asli berarti satu request ke Google API
+dicatat di `calls` (dan jumlah sel yang dikembalikan values_batch_get di
+`cells_read`), sehingga benchmark bisa menghitung round trip tanpa akun Google.
+Setiap request dijalankan atomik (satu lock) dan setiap penulisan menaikkan
+revisi yang dibaca lewat `get_lastUpdateTime`, seperti modifiedTime di Drive,
+jadi beberapa thread bisa meniru penghuni yang menulis bersamaan.
+"""
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import requests
+from gspread.cell import Cell
+from gspread.exceptions import APIError, WorksheetNotFound
+from gspread.utils import a1_range_to_grid_range, a1_to_rowcol
+
+
+def _api_error(code, message):
+    response = requests.Response()
+    response.status_code = code
+    response._content = json.dumps({"error": {"code": code, "message": message}}).encode()
+    return APIError(response)
+
+
+def _split_range(range_name):
+    # "'Juni2025'!A2:E10" -> ("Juni2025", "A2:E10"); tanpa "!" berarti seluruh sheet
+    if "!" in range_name:
+        title, a1 = range_name.rsplit("!", 1)
+    else:
+        title, a1 = range_name, ""
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    return title, a1
+
+
+class FakeSpreadsheet:
+    def __init__(self, sheets=None, latency=0.0, id="fake-spreadsheet-key", cell_latency=0.0):
+        # latency: jeda (detik) per panggilan untuk meniru round trip ke Google API;
+        # cell_latency: jeda tambahan per sel yang dikembalikan values_batch_get (ukuran payload)
+        self.id = id
+        self.latency = latency
+        self.cell_latency = cell_latency
+        self.calls = Counter()
+        self.cells_read = 0
+        self._failures = Counter()
+        self.revision = 0
+        self._lock = threading.RLock()
+        self._worksheets = {}
+        for title, values in (sheets or {}).items():
+            self._worksheets[title] = FakeWorksheet(self, title, values)
+
+    def add_worksheet(self, title, rows=1000, cols=26, index=None):
+        # Signature sama dengan gspread; ukuran grid tidak disimulasikan
+        self._record("add_worksheet")
+        with self._tulis():
+            if title in self._worksheets:
+                raise _api_error(400, f'A sheet with the name "{title}" already exists.')
+            ws = FakeWorksheet(self, title, rows=rows)
+            self._worksheets[title] = ws
+        return ws
+
+    @contextmanager
+    def _tulis(self):
+        with self._lock:
+            yield
+            self.revision += 1
+
+    def get_lastUpdateTime(self):
+        # Di gspread satu request metadata ke Drive API; di sini cukup nomor revisi
+        self._record("get_lastUpdateTime")
+        with self._lock:
+            return str(self.revision)
+
+    def fail_next(self, name, times=1):
+        # Panggilan `name` berikutnya sebanyak `times` kali gagal dengan 503 (setelah latency)
+        self._failures[name] += times
+
+    def _record(self, name):
+        with self._lock:
+            self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self._failures[name] > 0:
+            self._failures[name] -= 1
+            raise _api_error(503, "The service is currently unavailable.")
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def reset_calls(self):
+        with self._lock:
+            self.calls.clear()
+            self.cells_read = 0
+
+    def worksheet(self, title):
+        self._record("worksheet")
+        try:
+            return self._worksheets[title]
+        except KeyError:
+            raise WorksheetNotFound(title) from None
+
+    def worksheets(self):
+        self._record("worksheets")
+        return list(self._worksheets.values())
+
+    def values_batch_get(self, ranges, params=None):
+        self._record("values_batch_get")
+        value_ranges = []
+        with self._lock:
+            for range_name in ranges:
+                title, a1 = _split_range(range_name)
+                if title not in self._worksheets:
+                    raise _api_error(400, f"Unable to parse range: {range_name}")
+                value_ranges.append({
+                    "range": range_name,
+                    "values": self._worksheets[title]._slice(a1),
+                })
+        sel = sum(len(row) for vr in value_ranges for row in vr["values"])
+        with self._lock:
+            self.cells_read += sel
+        if self.cell_latency:
+            time.sleep(self.cell_latency * sel)
+        return {"valueRanges": value_ranges}
+
+    def values_batch_update(self, body=None):
+        self._record("values_batch_update")
+        with self._tulis():
+            for item in body["data"]:
+                title, a1 = _split_range(item["range"])
+                if title not in self._worksheets:
+                    raise _api_error(400, f"Unable to parse range: {item['range']}")
+                self._worksheets[title]._write(a1, item["values"])
+        return {"totalUpdatedCells": sum(len(v) for item in body["data"] for v in item["values"])}
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet, title, values=None, rows=0):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.values = [list(row) for row in (values or [])]
+        # Ukuran grid: baris kosong di bawah data ikut dihitung, seperti Worksheet.row_count
+        self.rows = rows
+
+    @property
+    def row_count(self):
+        return max(self.rows, len(self.values))
+
+    def _record(self, name):
+        self.spreadsheet._record(name)
+
+    def _tulis(self):
+        return self.spreadsheet._tulis()
+
+    def _set(self, row, col, value):
+        while len(self.values) < row:
+            self.values.append([])
+        baris = self.values[row - 1]
+        while len(baris) < col:
+            baris.append("")
+        baris[col - 1] = str(value)
+
+    def _slice(self, a1):
+        if not a1:
+            return [list(row) for row in self.values]
+        grid = a1_range_to_grid_range(a1)
+        rows = self.values[grid.get("startRowIndex", 0):grid.get("endRowIndex")]
+        c0, c1 = grid.get("startColumnIndex", 0), grid.get("endColumnIndex")
+        return [row[c0:c1] for row in rows]
+
+    def get_all_values(self):
+        self._record("get_all_values")
+        with self.spreadsheet._lock:
+            return [list(row) for row in self.values]
+
+    def batch_get(self, ranges, **kwargs):
+        self._record("batch_get")
+        with self.spreadsheet._lock:
+            return [self._slice(a1.split("!")[-1]) for a1 in ranges]
+
+    def get_all_records(self):
+        self._record("get_all_records")
+        if not self.values:
+            return []
+        headers = self.values[0]
+        return [dict(zip(headers, row)) for row in self.values[1:]]
+
+    def findall(self, query, in_column=None):
+        self._record("findall")
+        hasil = []
+        for r, row in enumerate(self.values, start=1):
+            for c, value in enumerate(row, start=1):
+                if in_column is not None and c != in_column:
+                    continue
+                if value == query:
+                    hasil.append(Cell(r, c, value))
+        return hasil
+
+    def cell(self, row, col):
+        self._record("cell")
+        try:
+            value = self.values[row - 1][col - 1]
+        except IndexError:
+            value = None
+        return Cell(row, col, value)
+
+    def update_cell(self, row, col, value):
+        self._record("update_cell")
+        with self._tulis():
+            self._set(row, col, value)
+        return {}
+
+    def _write(self, a1, values):
+        row0, col0 = a1_to_rowcol(a1.split(":")[0])
+        for dr, baris in enumerate(values):
+            for dc, value in enumerate(baris):
+                self._set(row0 + dr, col0 + dc, value)
+
+    def batch_update(self, data, **kwargs):
+        self._record("batch_update")
+        with self._tulis():
+            for item in data:
+                self._write(item["range"].split("!")[-1], item["values"])
+        return {}
+
+    def _append(self, rows):
+        with self._tulis():
+            awal = len(self.values) + 1
+            for row in rows:
+                self.values.append([str(v) for v in row])
+            akhir = len(self.values)
+        return {"updates": {"updatedRange": f"{self.title}!A{awal}:Z{akhir}"}}
+
+    def append_row(self, values, **kwargs):
+        self._record("append_row")
+        return self._append([values])
+
+    def append_rows(self, values, **kwargs):
+        self._record("append_rows")
+        return self._append(values)
+
+    def insert_row(self, values, index=1, **kwargs):
+        # Meniru penghuni lain yang menyisipkan baris langsung di Sheets
+        self._record("insert_row")
+        with self._tulis():
+            self.values.insert(index - 1, [str(v) for v in values])
+        return {}
+
+    def delete_rows(self, start_index, end_index=None):
+        self._record("delete_rows")
+        with self._tulis():
+            del self.values[start_index - 1:(end_index or start_index)]
+        return {}
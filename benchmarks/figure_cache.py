@@ -0,0 +1,64 @@
+"""Bangun ulang pie distribusi tiap rerun vs ambil dari FigureCache, plus cek invalidasi & LRU.
+
+Jalankan: python -m benchmarks.figure_cache [--baris 200] [--ulang 50]
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import synthetic_sheets
+from kas.aggregate import aggregate_month, distribusi_pengeluaran
+from kas.figures import FigureCache
+from kas.sheets import FRAME_BUILDERS
+from kas.views.overview import pie_distribusi
+
+
+def ukur(fn, ulang):
+    mulai = time.perf_counter()
+    for _ in range(ulang):
+        fn()
+    return (time.perf_counter() - mulai) / ulang * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, default=200, help="baris pengeluaran per bulan")
+    parser.add_argument("--ulang", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    sheets = synthetic_sheets(args.baris)
+    distribusi = {
+        nama: distribusi_pengeluaran(aggregate_month(FRAME_BUILDERS['expense'](values)))
+        for nama, values in sheets.items() if not nama.startswith("StatusIuran")
+    }
+    bulan = next(iter(distribusi))
+
+    t_bangun = ukur(lambda: pie_distribusi(distribusi[bulan]), args.ulang)
+    cache = FigureCache()
+
+    def ambil():
+        return cache.get(('pie_distribusi', bulan), 1, lambda: pie_distribusi(distribusi[bulan]))
+
+    fig = ambil()
+    t_hit = ukur(ambil, args.ulang)
+    assert cache.stats['misses'] == 1 and cache.stats['hits'] == args.ulang
+    print(f"pie distribusi {bulan}: bangun ulang {t_bangun:.2f} ms/rerun, dari cache {t_hit:.4f} ms/rerun")
+
+    # Objek yang sama dikembalikan, jadi JSON yang dikirim ke browser juga identik
+    assert ambil() is fig
+    # Versi data berubah (patch/invalidate) -> dibangun ulang, entri lama diganti
+    baru = cache.get(('pie_distribusi', bulan), 2, lambda: pie_distribusi(distribusi[bulan]))
+    assert baru is not fig and len(cache) == 1 and cache.stats['misses'] == 2
+
+    # LRU: hanya `maxsize` grafik terakhir yang disimpan
+    kecil = FigureCache(maxsize=3)
+    for nama in distribusi:
+        kecil.get(('pie_distribusi', nama), 1, lambda nama=nama: pie_distribusi(distribusi[nama]))
+    assert len(kecil) == 3 and kecil.stats['evictions'] == len(distribusi) - 3
+    terakhir = list(distribusi)[-1]
+    kecil.get(('pie_distribusi', terakhir), 1, lambda: None)
+    assert kecil.stats['hits'] == 1
+    print(f"LRU maxsize=3 untuk {len(distribusi)} bulan: {kecil.stats['evictions']} eviction")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Bandingkan .apply(format_tanggal_indonesia) per baris vs format_tanggal_series.
+
+Jalankan: python -m benchmarks.format_tanggal
+"""
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from kas.formatting import format_tanggal_indonesia, format_tanggal_series
+
+
+def tanggal_sintetis(n, hari=214, seed=0):
+    # Juni-Desember: banyak baris, sedikit tanggal unik; sekitar 1% tanggal rusak
+    rng = np.random.default_rng(seed)
+    tanggal = pd.Timestamp("2025-06-01") + pd.to_timedelta(rng.integers(0, hari, n), unit="D")
+    series = pd.Series(tanggal)
+    series[rng.random(n) < 0.01] = pd.NaT
+    return series
+
+
+def apply_lama(series):
+    # Jalur lama: satu panggilan Python per baris (di sini NaT ditangani agar bisa dibandingkan)
+    return series.apply(lambda t: format_tanggal_indonesia(t) if pd.notna(t) else "(tanggal tidak valid)")
+
+
+def main(ulang=3):
+    for n in (1_000, 100_000, 1_000_000):
+        series = tanggal_sintetis(n)
+        assert (apply_lama(series) == format_tanggal_series(series)).all()
+        t_lama = min(timeit.repeat(lambda: apply_lama(series), number=1, repeat=ulang))
+        t_baru = min(timeit.repeat(lambda: format_tanggal_series(series), number=1, repeat=ulang))
+        print(f"{n:>9,} baris  apply: {t_lama * 1000:8.1f} ms  unik: {t_baru * 1000:7.1f} ms  ({t_lama / t_baru:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Impor CSV pengeluaran: satu append_row per baris (form lama) vs satu append_rows per sheet bulan.
+
+Berkas berisi baris baru untuk semua bulan plus sebagian baris yang sudah ada
+di sheet, jadi deteksi duplikat ikut diuji.
+
+Jalankan: python -m benchmarks.impor_pengeluaran [--baris 100] [--latency 0.05]
+"""
+import argparse
+import csv
+import io
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import expense_rows, synthetic_spreadsheet
+from kas.config import LIST_BULAN
+from kas.importer import DUPLIKAT, baris_per_bulan, validasi_berkas
+from kas.sheets import EXPENSE_COLUMNS, expense_frame
+
+
+def buat_csv(spreadsheet, baris_per_bulan_baru, duplikat_per_bulan, seed=1):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for offset, bulan in enumerate(LIST_BULAN):
+        # Seed lain dari spreadsheet sintetis, jadi baris baru hampir pasti belum ada di sheet
+        baru = expense_rows(2025, 6 + offset, baris_per_bulan_baru, rng, rusak=0.01)
+        lama = spreadsheet.worksheet(bulan).get_all_values()[1:duplikat_per_bulan + 1]
+        rows.extend(baru + lama)
+    berkas = io.StringIO()
+    writer = csv.writer(berkas, delimiter=';')
+    writer.writerow(EXPENSE_COLUMNS)
+    writer.writerows(rows)
+    return berkas.getvalue().encode()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, default=100, help="baris baru per bulan di berkas")
+    parser.add_argument("--latency", type=float, default=0.05, help="detik per panggilan API palsu")
+    args = parser.parse_args(argv)
+
+    ss = synthetic_spreadsheet(200)
+    isi = buat_csv(ss, args.baris, duplikat_per_bulan=10)
+
+    mulai = time.perf_counter()
+    hasil = validasi_berkas(
+        io.BytesIO(isi), "impor.csv", lambda bulan: expense_frame(ss.worksheet(bulan).get_all_values()), ukuran=250
+    )
+    t_validasi = time.perf_counter() - mulai
+    per_bulan = baris_per_bulan(hasil)
+    siap = sum(len(rows) for rows in per_bulan.values())
+    duplikat = int((hasil['Masalah'] == DUPLIKAT).sum())
+    print(f"{len(hasil)} baris divalidasi dalam {t_validasi * 1000:.0f} ms: "
+          f"{siap} siap, {duplikat} duplikat, {len(hasil) - siap - duplikat} tidak valid")
+    # Baris lama yang selnya rusak ("??") masuk tidak valid, bukan duplikat
+    assert duplikat >= 10 * len(LIST_BULAN) * 0.9
+
+    ss.latency = args.latency
+    ss.reset_calls()
+    mulai = time.perf_counter()
+    for bulan, rows in per_bulan.items():
+        ws = ss.worksheet(bulan)
+        for row in rows:
+            ws.append_row(row)
+    t_per_baris = time.perf_counter() - mulai
+    calls_per_baris = ss.calls['append_row']
+
+    ss.reset_calls()
+    mulai = time.perf_counter()
+    for bulan, rows in per_bulan.items():
+        ss.worksheet(bulan).append_rows(rows)
+    t_batch = time.perf_counter() - mulai
+    assert ss.calls['append_rows'] == len(per_bulan)
+    print(f"append_row per baris : {calls_per_baris:5d} request, {t_per_baris:6.2f} s")
+    print(f"append_rows per bulan: {ss.calls['append_rows']:5d} request, {t_batch:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Uji IuranWriteBehind terhadap spreadsheet palsu dengan latency dan error yang disuntikkan.
+
+Jalankan: python -m benchmarks.iuran_write_behind
+"""
+import time
+
+from benchmarks.iuran_writes import NAMA, SHEET, buat_sheet_iuran
+from kas.iuran import IuranWriter
+from kas.writebehind import FAILED, PENDING, IuranWriteBehind
+
+LATENCY = 0.2
+
+
+def buat_antrean(ss, **kwargs):
+    ditulis = []
+    antrean = IuranWriteBehind(
+        IuranWriter(ss.worksheet(SHEET)),
+        on_written=lambda written, writer: ditulis.append(dict(written)),
+        **kwargs,
+    )
+    ss.reset_calls()
+    return antrean.start(), ditulis
+
+
+def status_di_sheet(ss, bulan, nama):
+    for row in ss._worksheets[SHEET].values[1:]:
+        if row[:2] == [bulan, nama]:
+            return row[2]
+    return None
+
+
+def skenario_latency():
+    # Klik tidak menunggu round trip: submit harus jauh lebih cepat dari satu panggilan API
+    ss = buat_sheet_iuran(6)
+    ss.latency = LATENCY
+    antrean, _ = buat_antrean(ss)
+    mulai = time.perf_counter()
+    antrean.submit("Bulan3", "Degus", "BELUM LUNAS")
+    t_klik = time.perf_counter() - mulai
+    assert antrean.status("Bulan3", "Degus") == (PENDING, None)
+    assert antrean.wait_idle(timeout=10)
+    t_tersimpan = time.perf_counter() - mulai
+    assert status_di_sheet(ss, "Bulan3", "Degus") == "BELUM LUNAS"
+    assert antrean.status("Bulan3", "Degus") == (None, None)
+    antrean.stop()
+    print(f"latency {LATENCY * 1000:.0f} ms/call   klik: {t_klik * 1000:6.2f} ms   tersimpan: {t_tersimpan * 1000:6.0f} ms")
+
+
+def skenario_toggle_beruntun(jumlah_toggle=20):
+    # Toggle cepat berulang digabung: nilai terakhir yang tersimpan, dengan jauh lebih sedikit call
+    ss = buat_sheet_iuran(6)
+    ss.latency = LATENCY
+    antrean, ditulis = buat_antrean(ss)
+    for i in range(jumlah_toggle):
+        for nama in NAMA:
+            antrean.submit("Bulan9", nama, "LUNAS" if i % 2 == 0 else "BELUM LUNAS")
+        time.sleep(LATENCY / 10)
+    assert antrean.wait_idle(timeout=10)
+    terakhir = "LUNAS" if (jumlah_toggle - 1) % 2 == 0 else "BELUM LUNAS"
+    assert all(status_di_sheet(ss, "Bulan9", nama) == terakhir for nama in NAMA)
+    antrean.stop()
+    print(f"{jumlah_toggle * len(NAMA)} toggle -> {len(ditulis)} flush, {ss.total_calls} API call {dict(ss.calls)}")
+
+
+def skenario_error_sementara():
+    # Dua kali 503 lalu berhasil: dicoba ulang dengan backoff, tidak ada status gagal yang tersisa
+    ss = buat_sheet_iuran(6)
+    antrean, _ = buat_antrean(ss, backoff=0.05)
+    ss.fail_next("batch_update", times=2)
+    antrean.submit("Bulan1", "Delon", "BELUM LUNAS")
+    time.sleep(0.01)
+    assert antrean.status("Bulan1", "Delon")[0] == PENDING
+    assert antrean.wait_idle(timeout=10)
+    assert status_di_sheet(ss, "Bulan1", "Delon") == "BELUM LUNAS"
+    assert antrean.status("Bulan1", "Delon") == (None, None)
+    antrean.stop()
+    print(f"2x 503 lalu sukses: {ss.calls['batch_update']} batch_update, {ss.calls['get_all_values']} get_all_values")
+
+
+def skenario_error_permanen():
+    # Gagal terus: setelah max_retries status jadi FAILED, lalu 'Coba lagi' (submit ulang) berhasil
+    ss = buat_sheet_iuran(6)
+    antrean, _ = buat_antrean(ss, max_retries=3, backoff=0.01)
+    ss.fail_next("batch_update", times=4)
+    antrean.submit("Bulan2", "Dipta", "BELUM LUNAS")
+    assert antrean.wait_idle(timeout=10)
+    status, error = antrean.status("Bulan2", "Dipta")
+    assert status == FAILED and "503" in error, (status, error)
+    assert status_di_sheet(ss, "Bulan2", "Dipta") == "LUNAS"
+    antrean.submit("Bulan2", "Dipta", "BELUM LUNAS")
+    assert antrean.wait_idle(timeout=10)
+    assert antrean.status("Bulan2", "Dipta") == (None, None)
+    assert status_di_sheet(ss, "Bulan2", "Dipta") == "BELUM LUNAS"
+    antrean.stop()
+    print(f"gagal permanen: FAILED setelah {ss.calls['batch_update'] - 1} percobaan, coba lagi -> tersimpan")
+
+
+def skenario_toggle_saat_gagal():
+    # Toggle baru yang masuk selagi percobaan gagal tidak boleh ditimpa nilai lama
+    ss = buat_sheet_iuran(6)
+    ss.latency = LATENCY
+    antrean, _ = buat_antrean(ss, backoff=0.01)
+    ss.fail_next("batch_update")
+    antrean.submit("Bulan4", "Yopha", "BELUM LUNAS")
+    time.sleep(LATENCY / 2)
+    antrean.submit("Bulan4", "Yopha", "LUNAS")
+    assert antrean.pending_for("Bulan4") == {"Yopha": "LUNAS"}
+    assert antrean.wait_idle(timeout=10)
+    assert status_di_sheet(ss, "Bulan4", "Yopha") == "LUNAS"
+    antrean.stop()
+    print("toggle selama retry: nilai terbaru yang tersimpan")
+
+
+def main():
+    skenario_latency()
+    skenario_toggle_beruntun()
+    skenario_error_sementara()
+    skenario_error_permanen()
+    skenario_toggle_saat_gagal()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Bandingkan jumlah API call per klik checkbox iuran: jalur lama vs IuranWriter.
+
+Jalankan: python -m benchmarks.iuran_writes
+"""
+from benchmarks.fake_gsheet import FakeSpreadsheet
+from kas.iuran import IuranWriter
+
+NAMA = ["Yopha", "Degus", "Delon", "Dipta"]
+SHEET = "StatusIuran2025"
+
+
+def buat_sheet_iuran(jumlah_bulan):
+    values = [["Bulan", "Nama", "Status"]]
+    for i in range(jumlah_bulan):
+        for nama in NAMA:
+            values.append([f"Bulan{i}", nama, "LUNAS"])
+    return FakeSpreadsheet({SHEET: values})
+
+
+def update_lama(spreadsheet, bulan, nama, status):
+    # Salinan update_iuran_status_in_gsheet sebelum IuranWriter
+    iuran_sheet = spreadsheet.worksheet(SHEET)
+    cell_list = iuran_sheet.findall(nama, in_column=2)
+    found = False
+    for cell in cell_list:
+        if iuran_sheet.cell(cell.row, 1).value == bulan:
+            iuran_sheet.update_cell(cell.row, 3, status)
+            found = True
+            break
+    if not found:
+        iuran_sheet.append_row([bulan, nama, status])
+
+
+def skenario_lama(jumlah_bulan, bulan):
+    ss = buat_sheet_iuran(jumlah_bulan)
+    for nama in NAMA:
+        update_lama(ss, bulan, nama, "BELUM LUNAS")
+    return ss.total_calls
+
+
+def skenario_writer(jumlah_bulan, bulan):
+    ss = buat_sheet_iuran(jumlah_bulan)
+    writer = IuranWriter(ss.worksheet(SHEET))
+    # Satu flush per rerun, seperti di display_pembayaran_kas
+    for nama in NAMA:
+        writer.queue(bulan, nama, "BELUM LUNAS")
+        writer.flush()
+    return ss.total_calls
+
+
+def main():
+    print(f"{'bulan':>6} {'target':>10} {'lama/toggle':>12} {'writer/toggle':>14}")
+    for jumlah_bulan in (1, 7, 24, 120):
+        for label, bulan in (("terakhir", f"Bulan{jumlah_bulan - 1}"), ("baru", "BulanBaru")):
+            calls_lama = skenario_lama(jumlah_bulan, bulan)
+            calls_writer = skenario_writer(jumlah_bulan, bulan)
+            print(
+                f"{jumlah_bulan:>6} {label:>10} "
+                f"{calls_lama / len(NAMA):>12.2f} {calls_writer / len(NAMA):>14.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Cold start vs warm start dengan mirror SQLite lokal, plus sinkronisasi inkremental.
+
+Jalankan: python -m benchmarks.mirror_sync
+"""
+import tempfile
+import time
+
+from benchmarks.fake_gsheet import FakeSpreadsheet
+from kas.mirror import LocalMirror, sync_mirror
+from kas.sheets import FRAME_BUILDERS
+
+BULAN = [f"{b}2025" for b in ["Juni", "Juli", "Agustus", "September", "Oktober", "November", "Desember"]]
+IURAN = "StatusIuran2025"
+HEADER = ["Tanggal", "Keperluan", "Jumlah", "Yang Bayar", "Sudah Diganti?"]
+
+
+def buat_spreadsheet(baris_per_bulan, latency):
+    sheets = {}
+    for i, bulan in enumerate(BULAN):
+        sheets[bulan] = [HEADER] + [
+            [f"2025-{i + 6:02d}-{(n % 28) + 1:02d}", "Galon", f"Rp {20000 + n:,}".replace(",", "."), "Yopha", "BELUM"]
+            for n in range(baris_per_bulan)
+        ]
+    sheets[IURAN] = [["Bulan", "Nama", "Status"]] + [[b, "Yopha", "LUNAS"] for b in BULAN]
+    return FakeSpreadsheet(sheets, latency=latency)
+
+
+def bangun_frames(mirror):
+    targets = {b: "expense" for b in BULAN}
+    targets[IURAN] = "iuran"
+    return {n: FRAME_BUILDERS[t](mirror.read_values(n)) for n, t in targets.items()}
+
+
+def ukur(label, ss, fn):
+    ss.reset_calls()
+    mulai = time.perf_counter()
+    hasil = fn()
+    print(f"{label:<28} {ss.total_calls:>5} call  {(time.perf_counter() - mulai) * 1000:>8.1f} ms")
+    return hasil
+
+
+def main(baris_per_bulan=500, latency=0.3):
+    ss = buat_spreadsheet(baris_per_bulan, latency)
+    names = BULAN + [IURAN]
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = LocalMirror(tmp)
+
+        ukur("cold start (mirror kosong)", ss, lambda: (sync_mirror(ss, mirror, names), bangun_frames(mirror)))
+        frames = ukur("warm start (dari mirror)", ss, lambda: bangun_frames(mirror))
+        assert len(frames[BULAN[0]]) == baris_per_bulan
+
+        # Penghuni lain menambah baris langsung di Google Sheets
+        for bulan in BULAN[:2]:
+            ss._worksheets[bulan].values.append(["2025-06-30", "Gas", "Rp 25.000", "Degus", "BELUM"])
+        changed = ukur("sinkron inkremental", ss, lambda: sync_mirror(ss, mirror, names))
+        assert changed == BULAN[:2], changed
+        ukur("sinkron tanpa perubahan", ss, lambda: sync_mirror(ss, mirror, names))
+
+        for bulan in names:
+            assert mirror.read_values(bulan) == ss._worksheets[bulan].values, bulan
+        print("isi mirror identik dengan spreadsheet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Microbenchmark parse kolom Jumlah: rantai .str.replace lama vs parse_rupiah.
+
+Jalankan: python -m benchmarks.parse_jumlah
+"""
+import random
+import timeit
+
+import pandas as pd
+
+from kas.schema import parse_rupiah
+
+
+def jumlah_lama(series):
+    # Salinan pembersihan Jumlah di load_data sebelum kas.schema
+    jumlah_str = series.astype(str)
+    jumlah_bersih = (
+        jumlah_str.str.replace('Rp', '', regex=False)
+                  .str.strip()
+                  .str.replace('.', '', regex=False)
+                  .str.replace(',', '.', regex=False)
+    )
+    return pd.to_numeric(jumlah_bersih, errors='coerce').fillna(0)
+
+
+def data_sintetis(n, seed=0):
+    rng = random.Random(seed)
+    nilai = []
+    for _ in range(n):
+        angka = rng.randrange(1, 500) * 1000
+        bentuk = rng.random()
+        if bentuk < 0.4:
+            nilai.append(f"Rp {angka:,}".replace(",", "."))
+        elif bentuk < 0.7:
+            nilai.append(str(angka))
+        elif bentuk < 0.9:
+            nilai.append(f"Rp{angka:,}".replace(",", ".") + ",00")
+        else:
+            nilai.append(f"{angka:,}".replace(",", "."))
+    return pd.Series(nilai)
+
+
+def main(n=100_000, ulang=5):
+    series = data_sintetis(n)
+    lama = jumlah_lama(series)
+    baru, gagal = parse_rupiah(series)
+    assert not gagal.any()
+    assert (lama.astype('int64') == baru).all()
+
+    t_lama = min(timeit.repeat(lambda: jumlah_lama(series), number=1, repeat=ulang))
+    t_baru = min(timeit.repeat(lambda: parse_rupiah(series), number=1, repeat=ulang))
+    print(f"{n:,} baris")
+    print(f"rantai lama   : {t_lama * 1000:8.1f} ms  dtype={lama.dtype}")
+    print(f"parse_rupiah  : {t_baru * 1000:8.1f} ms  dtype={baru.dtype}")
+    print(f"speedup       : {t_lama / t_baru:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
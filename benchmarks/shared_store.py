@@ -0,0 +1,250 @@
+"""Satu poller bersama (MirrorSync + revisi spreadsheet) melawan beberapa penulis yang menulis bersamaan.
+
+Yang dicek: tanpa perubahan hanya revisi yang dibaca (kecuali cek murah di
+poll pertama), tulisan aplikasi sendiri tidak memicu tarikan, perubahan orang
+lain ditarik lewat cek murah (kolom status + baris baru) dan hanya sheet yang
+strukturnya berubah yang ditarik penuh, hanya sheet yang berubah yang
+di-invalidate, sesi yang memantau MirrorSync.generation selalu berakhir dengan
+data yang sama dengan isi sheet, dan mirror identik dengan spreadsheet setelah
+semua penulis selesai. Jumlah sel yang ditarik dibandingkan dengan isi semua sheet.
+
+Jalankan: python -m benchmarks.shared_store [--baris 200] [--penulis 4] [--tulis 40]
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+
+from benchmarks.synthetic import synthetic_spreadsheet
+from kas.cache import DataCache
+from kas.mirror import LocalMirror, MirrorSync, sync_mirror
+from kas.sheets import FRAME_BUILDERS, KOLOM_SUDAH_DIGANTI
+
+IURAN = "StatusIuran2025"
+KOLOM_STATUS = {'expense': KOLOM_SUDAH_DIGANTI, 'iuran': 3}
+
+
+def targets_dari(ss):
+    return {nama: 'iuran' if nama == IURAN else 'expense' for nama in ss._worksheets}
+
+
+def isi_sheet(ss, nama):
+    with ss._lock:
+        return [list(row) for row in ss._worksheets[nama].values]
+
+
+def total_sel(ss):
+    return sum(len(row) for nama in ss._worksheets for row in isi_sheet(ss, nama))
+
+
+def pasang(ss, tmp, revision=True, interval=60):
+    # Sama dengan kas.data.start_mirror_sync: on_change meng-invalidate entri DataCache sheet yang berubah
+    targets = targets_dari(ss)
+    mirror = LocalMirror(tmp)
+    cache = DataCache()
+    dilaporkan = []
+    sync_mirror(ss, mirror, targets)
+
+    def on_change(changed):
+        dilaporkan.append(sorted(changed))
+        for nama in changed:
+            cache.invalidate((nama, targets[nama]))
+
+    sync = MirrorSync(
+        ss, mirror, targets, interval=interval, on_change=on_change,
+        revision=ss.get_lastUpdateTime if revision else None,
+        kolom_status={nama: KOLOM_STATUS[tipe] for nama, tipe in targets.items()},
+    )
+    return sync, mirror, cache, dilaporkan
+
+
+def baca(cache, mirror, nama, tipe):
+    return cache.get((nama, tipe), lambda: FRAME_BUILDERS[tipe](mirror.read_values(nama)))
+
+
+def skenario_tanpa_perubahan(ss, poll=20):
+    # Dengan revisi: poll pertama (revisi belum diketahui) cek murah lalu bandingkan penuh, selebihnya hanya metadata
+    hasil = {}
+    for revision in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            sync, _, _, dilaporkan = pasang(ss, tmp, revision=revision)
+            ss.reset_calls()
+            for _ in range(poll):
+                sync.poll_once()
+            hasil[revision] = dict(ss.calls)
+            assert dilaporkan == [] and sync.generation == 0
+    assert hasil[True]['values_batch_get'] == 2, hasil[True]
+    assert hasil[True]['get_lastUpdateTime'] == poll
+    print(f"{poll} poll tanpa perubahan:  tanpa revisi {hasil[False]}   dengan revisi {hasil[True]}")
+
+
+def skenario_tulisan_sendiri(ss):
+    # Tulisan aplikasi yang langsung dicatat ke mirror tetap mengubah revisi: cek murah tidak menemukan apa pun,
+    # perbandingan penuh pun sama dengan mirror, jadi tidak ada yang dilaporkan. Tulisan orang lain di sekitar
+    # tulisan aplikasi tetap ditarik: status lewat cek murah, kolom lain yang masuk bersamaan lewat perbandingan
+    # penuh saat full_interval jatuh tempo (dilewati bila revisi tidak berubah sejak perbandingan penuh terakhir)
+    nama = next(n for n in ss._worksheets if n != IURAN)
+    baris = ["2025-06-30", "Galon", "20000", "Yopha", "BELUM"]
+    with tempfile.TemporaryDirectory() as tmp:
+        sync, mirror, _, dilaporkan = pasang(ss, tmp)
+        sync.poll_once()
+
+        ss.reset_calls()
+        ss.worksheet(nama).append_rows([baris])
+        mirror.append(nama, [baris], mirror.last_row(nama) + 1)
+        ss.reset_calls()
+        assert sync.poll_once() == [] and dilaporkan == [] and ss.calls['values_batch_get'] == 2, dict(ss.calls)
+        sendiri = dict(ss.calls)
+
+        ss.worksheet(IURAN).update_cell(3, 3, "LUNAS" if isi_sheet(ss, IURAN)[2][2] != "LUNAS" else "BELUM LUNAS")
+        ss.worksheet(nama).append_rows([baris])
+        mirror.append(nama, [baris], mirror.last_row(nama) + 1)
+        ss.worksheet(nama).update_cell(3, 2, "Gas")
+        assert sync.poll_once() == [IURAN] and dilaporkan == [[IURAN]]
+        sync._last_full = float("-inf")
+        assert sync.poll_once() == [nama] and dilaporkan == [[IURAN], [nama]]
+        assert all(mirror.read_values(n) == isi_sheet(ss, n) for n in targets_dari(ss))
+        ss.reset_calls()
+        sync._last_full = float("-inf")
+        assert sync.poll_once() == [] and ss.calls['values_batch_get'] == 0, dict(ss.calls)
+    print(f"tulisan aplikasi sendiri: {sendiri} tanpa laporan, tulisan orang lain di sekitarnya tetap ditarik")
+
+
+def skenario_satu_sheet(ss):
+    # Editan orang lain: status di tengah sheet lewat cek murah, sisipan baris lewat tarik penuh sheet itu
+    # saja, editan kolom lain lewat perbandingan penuh semua sheet. Hanya sheet itu yang di-invalidate
+    nama = next(n for n in ss._worksheets if n != IURAN)
+    targets = targets_dari(ss)
+    with tempfile.TemporaryDirectory() as tmp:
+        sync, mirror, cache, dilaporkan = pasang(ss, tmp)
+        sync.poll_once()
+        for n, tipe in targets.items():
+            baca(cache, mirror, n, tipe)
+
+        def editan(ubah, full=False):
+            versi = {n: cache.version((n, t)) for n, t in targets.items()}
+            ubah(ss.worksheet(nama))
+            ss.reset_calls()
+            if full:
+                sync._last_full = float("-inf")
+            changed = sync.poll_once()
+            berubah = [n for n, t in targets.items() if cache.version((n, t)) != versi[n]]
+            assert changed == berubah, (changed, berubah)
+            assert mirror.read_values(nama) == isi_sheet(ss, nama)
+            return changed, ss.calls['values_batch_get'], ss.cells_read
+
+        status = "SUDAH" if isi_sheet(ss, nama)[4][4] != "SUDAH" else "BELUM"
+        hasil = {"status": editan(lambda ws: ws.update_cell(5, 5, status))}
+        assert hasil["status"][:2] == ([nama], 1)
+        assert baca(cache, mirror, nama, 'expense').loc[3, 'Sudah Diganti?'] == status
+        hasil["sisip baris"] = editan(lambda ws: ws.insert_row(["2025-06-01", "Gas", "30000", "Delon", "BELUM"], index=3))
+        assert hasil["sisip baris"][:2] == ([nama], 2)
+        # Kolom selain status tidak terlihat oleh cek murah: revisi berubah tanpa temuan -> bandingkan penuh
+        hasil["kolom lain"] = editan(lambda ws: ws.update_cell(5, 2, "Gas"))
+        assert hasil["kolom lain"][:2] == ([nama], 2)
+        # full_interval jatuh tempo, tapi revisinya masih revisi perbandingan penuh barusan: tidak dibaca ulang
+        assert editan(lambda ws: None, full=True)[:2] == ([], 0)
+        assert baca(cache, mirror, nama, 'expense').loc[3, 'Keperluan'] == "Gas"
+        assert len(dilaporkan) == 3 and all(d == [nama] for d in dilaporkan)
+    for label, (_, request, sel) in hasil.items():
+        print(f"editan di {nama} ({label}): {request} values_batch_get, {sel} sel dari {total_sel(ss)}")
+
+
+def penulis(ss, nomor, jumlah_tulis, jeda):
+    rng = random.Random(nomor)
+    bulan = [n for n in ss._worksheets if n != IURAN]
+    for i in range(jumlah_tulis):
+        aksi = rng.random()
+        if aksi < 0.5:
+            ws = ss.worksheet(rng.choice(bulan))
+            ws.append_rows([[f"2025-06-{i % 28 + 1:02d}", "Galon", str(20000 + nomor), f"Penulis{nomor}", "BELUM"]])
+        elif aksi < 0.8:
+            ws = ss.worksheet(rng.choice(bulan))
+            ws.update_cell(rng.randint(2, 20), 5, "SUDAH")
+        else:
+            ss.worksheet(IURAN).update_cell(rng.randint(2, 20), 3, rng.choice(["LUNAS", "BELUM LUNAS"]))
+        time.sleep(rng.uniform(0, jeda))
+
+
+def sesi(sync, cache, mirror, targets, berhenti, catatan):
+    # Meniru fragment status_sinkron: rerun (baca ulang dari cache) hanya bila generasi berubah
+    generasi, rerun = None, 0
+    while True:
+        selesai = berhenti.is_set()
+        if sync.generation != generasi:
+            generasi = sync.generation
+            frames = {n: baca(cache, mirror, n, t) for n, t in targets.items()}
+            rerun += 1
+        if selesai:
+            break
+        time.sleep(0.005)
+    catatan.append((rerun, frames))
+
+
+def skenario_penulis_bersamaan(ss, jumlah_penulis, jumlah_tulis, jumlah_sesi=3, interval=0.02):
+    targets = targets_dari(ss)
+    ss.latency = 0.001
+    with tempfile.TemporaryDirectory() as tmp:
+        sync, mirror, cache, dilaporkan = pasang(ss, tmp, interval=interval)
+        ss.reset_calls()
+        sync.start()
+        berhenti, catatan = threading.Event(), []
+        pengamat = [
+            threading.Thread(target=sesi, args=(sync, cache, mirror, targets, berhenti, catatan))
+            for _ in range(jumlah_sesi)
+        ]
+        threads = [
+            threading.Thread(target=penulis, args=(ss, i, jumlah_tulis, interval))
+            for i in range(jumlah_penulis)
+        ]
+        mulai = time.perf_counter()
+        for t in pengamat + threads:
+            t.start()
+        for t in threads:
+            t.join()
+        t_tulis = time.perf_counter() - mulai
+
+        # Setelah penulis selesai poller harus menyusul dalam beberapa interval
+        batas = time.monotonic() + 5
+        while any(mirror.read_values(n) != isi_sheet(ss, n) for n in targets):
+            assert time.monotonic() < batas, "mirror tidak menyusul spreadsheet"
+            time.sleep(interval)
+        t_susul = time.perf_counter() - mulai - t_tulis
+        # Satu poll lagi setelah konvergen, supaya generasi terakhir sudah dilihat sesi
+        time.sleep(interval * 3)
+        berhenti.set()
+        for t in pengamat:
+            t.join()
+        sync.stop()
+        sync._thread.join()
+        assert sync.last_error is None, sync.last_error
+
+        harapan = {n: FRAME_BUILDERS[t](isi_sheet(ss, n)) for n, t in targets.items()}
+        for rerun, frames in catatan:
+            for n in targets:
+                assert frames[n].equals(harapan[n]), n
+        poll = ss.calls['get_lastUpdateTime']
+        print(
+            f"{jumlah_penulis} penulis x {jumlah_tulis} tulis ({t_tulis:.2f} s): {poll} poll, "
+            f"{ss.calls['values_batch_get']} values_batch_get, generasi {sync.generation}, "
+            f"rerun per sesi {[r for r, _ in catatan]}, menyusul {t_susul * 1000:.0f} ms setelah tulis terakhir"
+        )
+        print("mirror dan data semua sesi identik dengan spreadsheet")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, default=200, help="baris pengeluaran per bulan")
+    parser.add_argument("--penulis", type=int, default=4)
+    parser.add_argument("--tulis", type=int, default=40, help="penulisan per penulis")
+    args = parser.parse_args(argv)
+
+    skenario_tanpa_perubahan(synthetic_spreadsheet(args.baris))
+    skenario_tulisan_sendiri(synthetic_spreadsheet(args.baris))
+    skenario_satu_sheet(synthetic_spreadsheet(args.baris))
+    skenario_penulis_bersamaan(synthetic_spreadsheet(args.baris), args.penulis, args.tulis)
+
+
+if __name__ == "__main__":
+    main()
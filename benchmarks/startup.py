@@ -0,0 +1,87 @@
+"""Waktu startup per halaman: cold import modul aplikasi dan render pertama, tiap ukuran di proses baru.
+
+Selain waktu, dicek juga bahwa plotly.express hanya dimuat oleh halaman yang
+menggambar grafik, supaya regresi lazy import langsung ketahuan.
+
+Jalankan: python -m benchmarks.startup [--ulang 3] [--budget-ms 3000]
+"""
+import argparse
+import importlib
+import json
+import subprocess
+import sys
+import time
+
+HALAMAN = {
+    "Overview": "kas.views.overview",
+    "Analitik Tahunan": "kas.views.analitik",
+    "Input Pembayaran Kas": "kas.views.pembayaran_kas",
+    "Input Pengeluaran": "kas.views.input_pengeluaran",
+    "Impor Pengeluaran": "kas.views.impor_pengeluaran",
+}
+HALAMAN_GRAFIK = {"Overview", "Analitik Tahunan"}
+
+
+def ukur_import(halaman):
+    # streamlit sudah pasti dimuat oleh server; yang diukur modul aplikasi + modul halaman
+    import streamlit  # noqa: F401
+    mulai = time.perf_counter()
+    importlib.import_module("kas.data")
+    importlib.import_module(HALAMAN[halaman])
+    return {"import_ms": (time.perf_counter() - mulai) * 1000}
+
+
+def ukur_render(halaman):
+    from benchmarks.app import AppHarness
+    from benchmarks.synthetic import synthetic_spreadsheet
+
+    h = AppHarness(synthetic_spreadsheet(200))
+    h.halaman = halaman
+    with h.patched():
+        at = h.new_app()
+        mulai = time.perf_counter()
+        at.run()
+        durasi = time.perf_counter() - mulai
+        assert not at.exception, [e.value for e in at.exception]
+    return {"render_ms": durasi * 1000, "plotly": "plotly.express" in sys.modules}
+
+
+def di_proses_baru(mode, halaman):
+    keluaran = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--anak", mode, "--halaman", halaman],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(keluaran.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ulang", type=int, default=3, help="jumlah pengukuran per halaman (diambil minimum)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="gagal bila render pertama melebihi ini")
+    parser.add_argument("--anak", choices=["import", "render"], help=argparse.SUPPRESS)
+    parser.add_argument("--halaman", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.anak:
+        hasil = ukur_import(args.halaman) if args.anak == "import" else ukur_render(args.halaman)
+        print(json.dumps(hasil))
+        return
+
+    gagal = []
+    print(f"{'halaman':<22} {'import (ms)':>12} {'render pertama (ms)':>20}  plotly.express")
+    for halaman in HALAMAN:
+        t_import = min(di_proses_baru("import", halaman)["import_ms"] for _ in range(args.ulang))
+        renders = [di_proses_baru("render", halaman) for _ in range(args.ulang)]
+        t_render = min(r["render_ms"] for r in renders)
+        plotly = renders[0]["plotly"]
+        print(f"{halaman:<22} {t_import:>12.0f} {t_render:>20.0f}  {'dimuat' if plotly else '-'}")
+        if plotly and halaman not in HALAMAN_GRAFIK:
+            gagal.append(f"{halaman}: plotly.express ikut dimuat padahal halaman ini tanpa grafik")
+        if args.budget_ms is not None and t_render > args.budget_ms:
+            gagal.append(f"{halaman}: render pertama {t_render:.0f} ms > budget {args.budget_ms:.0f} ms")
+    if gagal:
+        sys.exit("\n".join(gagal))
+
+
+if __name__ == "__main__":
+    main()
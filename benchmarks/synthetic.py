@@ -0,0 +1,64 @@
+"""Generator data kas sintetis (pengeluaran per bulan + status iuran) untuk spreadsheet palsu.
+
+Isinya sengaja meniru sheet asli, termasuk format Rupiah yang campur aduk
+dan sesekali sel yang rusak, supaya jalur parsing ikut teruji.
+"""
+import numpy as np
+
+from benchmarks.fake_gsheet import FakeSpreadsheet
+from kas.formatting import NAMA_BULAN_ID
+from kas.sheets import EXPENSE_COLUMNS, IURAN_COLUMNS
+
+NAMA_PENGHUNI = ["Yopha", "Degus", "Delon", "Dipta"]
+KEPERLUAN = ["Listrik", "Wifi", "PDAM", "Galon", "Keamanan", "Beras", "Minyak", "Gas", "Peralatan Mandi", "Bumbu Dapur", "Lainnya"]
+PEMBAYAR = NAMA_PENGHUNI + ["Kas Bersama", "Seabank"]
+
+
+def nama_bulan(tahun, bulan_awal=6, bulan_akhir=12):
+    return [f"{NAMA_BULAN_ID[i - 1]}{tahun}" for i in range(bulan_awal, bulan_akhir + 1)]
+
+
+def _rupiah(jumlah, gaya):
+    if gaya == 0:
+        return f"Rp {jumlah:,}".replace(",", ".")
+    if gaya == 1:
+        return f"Rp{jumlah:,}".replace(",", ".") + ",00"
+    return str(jumlah)
+
+
+def expense_rows(tahun, bulan, n, rng, rusak=0.005):
+    tanggal = rng.integers(1, 29, n)
+    keperluan = rng.choice(KEPERLUAN, n)
+    jumlah = rng.integers(1, 400, n) * 1000
+    gaya = rng.integers(0, 3, n)
+    pembayar = rng.choice(PEMBAYAR, n)
+    sudah = rng.random(n) < 0.7
+    rows = [
+        [f"{tahun}-{bulan:02d}-{t:02d}", str(k), _rupiah(int(j), g), str(p), "SUDAH" if s else "BELUM"]
+        for t, k, j, g, p, s in zip(tanggal, keperluan, jumlah, gaya, pembayar, sudah)
+    ]
+    for i in np.flatnonzero(rng.random(n) < rusak):
+        rows[i][0 if i % 2 else 2] = "??"
+    return rows
+
+
+def iuran_rows(bulan_list, rng, lunas=0.8):
+    return [
+        [bulan, nama, "LUNAS" if rng.random() < lunas else "BELUM LUNAS"]
+        for bulan in bulan_list
+        for nama in NAMA_PENGHUNI
+    ]
+
+
+def synthetic_sheets(baris_per_bulan=200, tahun=2025, bulan_awal=6, bulan_akhir=12, seed=0):
+    rng = np.random.default_rng(seed)
+    bulan_list = nama_bulan(tahun, bulan_awal, bulan_akhir)
+    sheets = {}
+    for offset, nama_sheet in enumerate(bulan_list):
+        sheets[nama_sheet] = [list(EXPENSE_COLUMNS)] + expense_rows(tahun, bulan_awal + offset, baris_per_bulan, rng)
+    sheets[f"StatusIuran{tahun}"] = [list(IURAN_COLUMNS)] + iuran_rows(bulan_list, rng)
+    return sheets
+
+
+def synthetic_spreadsheet(baris_per_bulan=200, latency=0.0, **kwargs):
+    return FakeSpreadsheet(synthetic_sheets(baris_per_bulan, **kwargs), latency=latency)
@@ -0,0 +1,109 @@
+"""Tandai Lunas compare-and-set: penghuni lain menyisipkan, menghapus, atau sudah menandai baris.
+
+Tiap skenario memakai bulan yang berbeda pada satu spreadsheet sintetis. Yang
+dicek: baris yang tertulis SUDAH adalah baris yang dipilih (bukan baris di
+posisi lamanya), jumlah request, dan ledger lokal sama dengan hasil
+menghitung ulang dari isi sheet. Skenario "tersinkron" menyinkronkan mirror
+sebelum klik, jadi yang dicocokkan harus identitas baris yang dirender.
+
+Jalankan: python -m benchmarks.tandai_lunas [--baris 200]
+"""
+import argparse
+
+import pandas as pd
+
+from benchmarks.app import AppHarness, nilai_sheet
+from benchmarks.synthetic import nama_bulan, synthetic_spreadsheet
+from kas.sheets import expense_frame, identitas_pengeluaran
+
+PILIH = 3
+
+
+def sisip(ws, rows):
+    ws.insert_row(["2025-01-01", "Galon", "20000", "Delon", "BELUM"], index=2)
+
+
+def hapus(ws, rows):
+    ws.delete_rows(rows[0])
+
+
+def sudah_ditandai(ws, rows):
+    ws.update_cell(rows[1], 5, "SUDAH")
+
+
+def tanpa_perubahan(ws, rows):
+    pass
+
+
+def dikosongkan(ws, rows):
+    ws.batch_update([{"range": f"A{rows[0]}:E{rows[0]}", "values": [[""] * 5]}])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    ss = synthetic_spreadsheet(args.baris)
+    h = AppHarness(ss)
+    skenario = [
+        ("tanpa perubahan", tanpa_perubahan, False, dict(ditandai=PILIH, dipindah=0, sudah=0, hilang=0)),
+        ("baris disisipkan di atas", sisip, False, dict(ditandai=PILIH, dipindah=PILIH, sudah=0, hilang=0)),
+        ("baris pertama dihapus", hapus, False, dict(ditandai=PILIH - 1, dipindah=PILIH - 1, sudah=0, hilang=1)),
+        ("sudah ditandai orang lain", sudah_ditandai, False, dict(ditandai=PILIH - 1, dipindah=0, sudah=1, hilang=0)),
+        # Mirror sudah tersinkron sebelum klik: baris yang dipilih kosong / sudah berganti isi juga di mirror
+        ("dikosongkan, tersinkron", dikosongkan, True, dict(ditandai=PILIH - 1, dipindah=0, sudah=0, hilang=1)),
+        ("dihapus, tersinkron", hapus, True, dict(ditandai=PILIH - 1, dipindah=PILIH - 1, sudah=0, hilang=1)),
+    ]
+    with h.patched():
+        # Diimpor di dalam patched() supaya kas.config membaca direktori mirror sementara
+        from kas import data
+        from kas.client import CachingSpreadsheet
+
+        spreadsheet = CachingSpreadsheet(ss)
+        print(f"{'skenario':<28} {'request':>8}  ditandai dipindah sudah hilang  salah (tanpa CAS)")
+        for (label, ubah, sinkron, harapan), bulan in zip(skenario, nama_bulan(2025)):
+            df = data.load_frame(spreadsheet, bulan)
+            data.sync_ledger(spreadsheet)
+            # Baris yang dirender ke pengguna (halaman pertama daftar belum diganti)
+            tampil = df[df['Sudah Diganti?'] == 'BELUM'].head(PILIH)
+            rows = tampil['row_number'].tolist()
+            items = [(bulan, r, ident) for r, ident in zip(rows, data.identitas_frame(tampil))]
+            sebelum = nilai_sheet(ss, bulan)
+            target = [identitas_pengeluaran(sebelum[r - 1]) for r in rows]
+
+            ubah(ss._worksheets[bulan], rows)
+            sesudah_diubah = nilai_sheet(ss, bulan)
+            if sinkron:
+                data.start_mirror_sync(spreadsheet).sync_once(full=True, names=[bulan])
+            # Penulisan buta ke nomor baris lama: berapa yang mengenai baris lain
+            salah = sum(
+                r > len(sesudah_diubah) or identitas_pengeluaran(sesudah_diubah[r - 1]) != t
+                for r, t in zip(rows, target)
+            )
+
+            ss.reset_calls()
+            hasil = data.tandai_sudah_diganti(spreadsheet, items)
+            calls = ss.total_calls
+            nyata = dict(ditandai=hasil.ditandai, dipindah=hasil.dipindah, sudah=hasil.sudah, hilang=len(hasil.hilang))
+            assert nyata == harapan, (label, nyata)
+            print(f"{label:<28} {calls:>8}  {hasil.ditandai:>8} {hasil.dipindah:>8} {hasil.sudah:>5} "
+                  f"{len(hasil.hilang):>6}  {salah}")
+
+            # Yang berubah hanya kolom status baris yang dipilih, di posisi mana pun sekarang
+            akhir = nilai_sheet(ss, bulan)
+            assert len(akhir) == len(sesudah_diubah)
+            for lama, baru in zip(sesudah_diubah, akhir):
+                if lama != baru:
+                    assert any(lama[:4]) and lama[:4] == baru[:4] and baru[4] == "SUDAH" and identitas_pengeluaran(baru) in target
+
+            # Ledger lokal (dipatch / bulan yang dipindai ulang saja) == hitung ulang dari sheet
+            ledger = data.sync_ledger(spreadsheet).outstanding()
+            segar = pd.concat([expense_frame(nilai_sheet(ss, b)) for b in nama_bulan(2025)])
+            belum = segar[segar['Sudah Diganti?'] == 'BELUM'].astype({'Yang Bayar': str})
+            ulang = belum.groupby('Yang Bayar')['Jumlah'].agg(['sum', 'size'])
+            assert ledger == {p: (int(r['sum']), int(r['size'])) for p, r in ulang.iterrows()}, label
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Mode tabel transaksi vs sheet per bulan: migrasi, kesetaraan data, dan biaya memilih bulan.
+
+Spreadsheet sintetis bulanan dimigrasi dengan kas.migrasi, lalu DataFrame tiap
+bulan dari tabel transaksi dibandingkan dengan hasil parse sheet bulanannya.
+
+Jalankan: python -m benchmarks.transaksi [--baris 2000] [--ulang 200]
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import nama_bulan, synthetic_spreadsheet
+from kas.migrasi import migrasi
+from kas.sheets import EXPENSE_COLUMNS, batch_fetch_values, expense_frame
+from kas.transaksi import pecah_per_bulan
+
+
+def ukur(fn, ulang=1):
+    mulai = time.perf_counter()
+    for _ in range(ulang):
+        hasil = fn()
+    return hasil, (time.perf_counter() - mulai) / ulang * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, default=2000, help="baris pengeluaran per bulan")
+    parser.add_argument("--ulang", type=int, default=200, help="ulangan pengukuran pilih bulan")
+    args = parser.parse_args(argv)
+
+    ss = synthetic_spreadsheet(args.baris)
+    bulan_list = nama_bulan(2025)
+    jumlah = migrasi(ss)
+    assert sum(jumlah.values()) == args.baris * len(bulan_list)
+    # Dijalankan ulang tidak menulis apa pun
+    assert sum(migrasi(ss).values()) == 0 and ss.calls["append_rows"] == 1
+    # Baris dihapus lalu baris baru ditambah di sheet bulanan: nomor barisnya sama, tetap ikut dimigrasi
+    ws, tabel_ws = ss.worksheet(bulan_list[0]), ss.worksheet("Transaksi")
+    dihapus, baru = list(ws.values[4]), list(ws.values[5])
+    baru[1] = "Migrasi ulang"
+    ws.delete_rows(5)
+    ws.append_rows([baru])
+    assert migrasi(ss) == {**dict.fromkeys(bulan_list, 0), bulan_list[0]: 1}
+    assert tabel_ws.values[-1][3:7] == baru[:4]
+    # Kembalikan sheet bulanan dan tabel ke isi semula untuk perbandingan di bawah
+    ws.delete_rows(len(ws.values))
+    ws.insert_row(dihapus, 5)
+    tabel_ws.delete_rows(len(tabel_ws.values))
+
+    ss.reset_calls()
+    bulanan, t_bulanan = ukur(lambda: batch_fetch_values(ss, bulan_list))
+    frames_bulanan, t_parse_bulanan = ukur(lambda: {b: expense_frame(v) for b, v in bulanan.items()})
+    tabel, t_tabel = ukur(lambda: batch_fetch_values(ss, ["Transaksi"])["Transaksi"])
+    frames_tabel, t_parse_tabel = ukur(lambda: pecah_per_bulan(tabel))
+    assert list(frames_tabel) == bulan_list
+
+    for bulan in bulan_list:
+        a, b = frames_bulanan[bulan], frames_tabel[bulan]
+        for kolom in EXPENSE_COLUMNS:
+            assert a[kolom].astype(str).tolist() == b[kolom].astype(str).tolist(), (bulan, kolom)
+        assert len(a.attrs['parse_errors']) == len(b.attrs['parse_errors']), bulan
+    assert frames_tabel[bulan_list[0]]['ID'].is_unique
+
+    print(f"{args.baris * len(bulan_list)} baris, {len(bulan_list)} bulan")
+    print(f"sheet per bulan : {len(bulan_list)} range, fetch {t_bulanan:6.1f} ms, parse {t_parse_bulanan:6.1f} ms")
+    print(f"tabel transaksi : 1 range, fetch {t_tabel:6.1f} ms, parse + indeks {t_parse_tabel:6.1f} ms")
+
+    # Memilih bulan: filter boolean di seluruh tabel tiap rerun vs ambil hasil indeks
+    gabungan = pd.concat(frames_tabel, names=['Bulan']).reset_index(level=0)
+    _, t_filter = ukur(lambda: gabungan[gabungan['Bulan'] == bulan_list[-1]], args.ulang)
+    _, t_indeks = ukur(lambda: frames_tabel[bulan_list[-1]], args.ulang)
+    print(f"pilih bulan     : filter tabel {t_filter:.3f} ms, indeks {t_indeks:.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
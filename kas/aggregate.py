@@ -0,0 +1,100 @@
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+KEPERLUAN_IURAN = 'Iuran Kas Bulanan'
+
+
+@dataclass(frozen=True)
+class MonthAggregate:
+    total_pengeluaran: int = 0
+    belum_diganti: int = 0
+    jumlah_transaksi: int = 0
+    per_keperluan: dict = field(default_factory=dict)
+
+
+def aggregate_month(df):
+    if df.empty:
+        return MonthAggregate()
+    per_keperluan = df.groupby('Keperluan', observed=True)['Jumlah'].sum()
+    belum = df.loc[df['Sudah Diganti?'] == 'BELUM', 'Jumlah'].sum()
+    return MonthAggregate(
+        total_pengeluaran=int(df['Jumlah'].sum()),
+        belum_diganti=int(belum),
+        jumlah_transaksi=len(df),
+        per_keperluan={str(k): int(v) for k, v in per_keperluan.items()},
+    )
+
+
+def count_lunas(df_iuran):
+    if df_iuran.empty:
+        return {}
+    lunas = df_iuran[df_iuran['Status'] == 'LUNAS']
+    return lunas.groupby('Bulan')['Nama'].nunique().to_dict()
+
+
+class AggregateStore:
+    """Agregat per bulan yang hanya dihitung ulang bila versi data bulan itu berubah.
+
+    Versi diambil dari DataCache.version, yang naik setiap kali entri dimuat,
+    di-patch, atau di-invalidate.
+    """
+
+    def __init__(self):
+        self.recomputed = Counter()
+        self._bulanan = {}
+        self._lunas = None
+        self._lock = threading.Lock()
+
+    def month(self, bulan, version, df):
+        with self._lock:
+            cached = self._bulanan.get(bulan)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+        agg = aggregate_month(df)
+        with self._lock:
+            self._bulanan[bulan] = (version, agg)
+            self.recomputed[bulan] += 1
+        return agg
+
+    def lunas(self, version, df_iuran):
+        with self._lock:
+            if self._lunas is not None and self._lunas[0] == version:
+                return self._lunas[1]
+        hasil = count_lunas(df_iuran)
+        with self._lock:
+            self._lunas = (version, hasil)
+            self.recomputed['iuran'] += 1
+        return hasil
+
+
+def distribusi_pengeluaran(agg):
+    distribusi = pd.DataFrame(list(agg.per_keperluan.items()), columns=['Keperluan', 'Jumlah'])
+    distribusi = distribusi[(distribusi['Keperluan'] != KEPERLUAN_IURAN) & (distribusi['Jumlah'] > 0)]
+    return distribusi.reset_index(drop=True)
+
+
+def year_summary(aggs, lunas, jumlah_iuran):
+    # aggs: {nama_sheet_bulan: MonthAggregate} berurutan; lunas: {nama_sheet_bulan: jumlah orang lunas}
+    rows = []
+    for bulan, agg in aggs.items():
+        kas_masuk = lunas.get(bulan, 0) * jumlah_iuran
+        rows.append({
+            'Bulan': bulan,
+            'Orang Lunas': lunas.get(bulan, 0),
+            'Kas Masuk': kas_masuk,
+            'Pengeluaran': agg.total_pengeluaran,
+            'Belum Diganti': agg.belum_diganti,
+            'Sisa Kas Bulan': kas_masuk - agg.total_pengeluaran,
+        })
+    ringkasan = pd.DataFrame(rows, columns=['Bulan', 'Orang Lunas', 'Kas Masuk', 'Pengeluaran', 'Belum Diganti', 'Sisa Kas Bulan'])
+    ringkasan['Saldo Berjalan'] = ringkasan['Sisa Kas Bulan'].cumsum()
+    return ringkasan
+
+
+def category_table(aggs):
+    # Baris = bulan, kolom = keperluan
+    tabel = pd.DataFrame.from_dict({bulan: agg.per_keperluan for bulan, agg in aggs.items()}, orient='index')
+    return tabel.reindex(list(aggs)).fillna(0).astype('int64')
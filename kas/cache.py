@@ -0,0 +1,80 @@
+import threading
+import time
+from collections import Counter
+
+
+class DataCache:
+    """Cache DataFrame per (worksheet_name, sheet_type) yang bisa di-invalidate per entri.
+
+    Setelah menulis ke sheet, entri cukup di-patch dengan baris yang baru ditulis
+    sehingga tidak perlu membaca ulang dari Google Sheets.
+    """
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self.stats = Counter(hits=0, misses=0, invalidations=0, patches=0)
+        self._entries = {}
+        self._versions = Counter()
+        self._epoch = 0
+        self._lock = threading.RLock()
+
+    def _fresh(self, entry):
+        return entry is not None and time.monotonic() - entry[1] < self.ttl
+
+    def get(self, key, loader):
+        with self._lock:
+            entry = self._entries.get(key)
+            if self._fresh(entry):
+                self.stats['hits'] += 1
+                return entry[0]
+            self.stats['misses'] += 1
+            sebelum = (self._epoch, self._versions[key])
+        df = loader()
+        with self._lock:
+            # Di-invalidate selagi loader berjalan (mis. oleh sinkronisasi latar): hasilnya mungkin
+            # dibaca sebelum perubahan, jadi tidak disimpan agar pemanggil berikutnya memuat ulang
+            if (self._epoch, self._versions[key]) == sebelum:
+                self.put(key, df)
+        return df
+
+    def put(self, key, df):
+        with self._lock:
+            self._entries[key] = (df, time.monotonic())
+            self._versions[key] += 1
+
+    def contains(self, key):
+        with self._lock:
+            return self._fresh(self._entries.get(key))
+
+    def peek(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if self._fresh(entry) else None
+
+    def patch(self, key, fn):
+        # Copy-on-write: sesi lain yang sedang memegang DataFrame lama tidak terganggu.
+        # Mengembalikan versi baru entri, atau None bila entri tidak ada di cache.
+        with self._lock:
+            entry = self._entries.get(key)
+            if not self._fresh(entry) or entry[0] is None:
+                return None
+            self._entries[key] = (fn(entry[0]), entry[1])
+            self._versions[key] += 1
+            self.stats['patches'] += 1
+            return self._versions[key]
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._epoch += 1
+                keys = list(self._entries)
+            else:
+                keys = [key]
+            for k in keys:
+                if self._entries.pop(k, None) is not None:
+                    self.stats['invalidations'] += 1
+                self._versions[k] += 1
+
+    def version(self, key):
+        with self._lock:
+            return self._versions[key]
@@ -0,0 +1,169 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import gspread
+from google.auth import _helpers
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2 import service_account
+from gspread.exceptions import SpreadsheetNotFound
+from requests.adapters import HTTPAdapter
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa kunci antar-proses, token tetap dibagi lewat file
+    fcntl = None
+
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+POOL_SIZE = 10
+TOKEN_FILE = "gsheets_token.json"
+KEY_FILE = "spreadsheet_keys.json"
+
+
+@contextmanager
+def _file_lock(path):
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _write_json(path, data):
+    # Tulis ke file sementara lalu rename, supaya proses lain tidak pernah membaca file setengah jadi
+    tmp = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class SharedTokenCredentials(service_account.Credentials):
+    """Kredensial service account yang berbagi access token lewat file antar-proses.
+
+    Sebelum meminta token baru ke Google, file token dibaca dulu di bawah
+    kunci file: bila replika lain sudah me-refresh dan tokennya masih segar,
+    token itu yang dipakai. Dengan non-blocking refresh, token yang tinggal
+    beberapa menit (REFRESH_THRESHOLD google-auth) di-refresh di latar
+    sementara request tetap memakai token lama.
+    """
+
+    token_file = None
+
+    @classmethod
+    def from_info(cls, info, token_file=None, scopes=SCOPES):
+        creds = cls.from_service_account_info(info, scopes=scopes)
+        creds.token_file = token_file
+        creds.with_non_blocking_refresh()
+        return creds
+
+    def refresh(self, request):
+        if self.token_file is None:
+            return super().refresh(request)
+        with _file_lock(f"{self.token_file}.lock"):
+            shared = _read_json(self.token_file)
+            if shared.get("token") and shared.get("expiry"):
+                expiry = datetime.fromisoformat(shared["expiry"])
+                if _helpers.utcnow() < expiry - _helpers.REFRESH_THRESHOLD:
+                    self.token, self.expiry = shared["token"], expiry
+                    return
+            super().refresh(request)
+            _write_json(self.token_file, {"token": self.token, "expiry": self.expiry.isoformat()})
+
+
+def pooled_session(credentials, pool_size=POOL_SIZE):
+    # Satu session per proses: koneksi HTTPS keep-alive dipakai ulang oleh thread script,
+    # MirrorSync, dan antrean tulis iuran sekaligus
+    session = AuthorizedSession(credentials)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    return session
+
+
+def build_client(info, state_dir=None):
+    token_file = os.path.join(state_dir, TOKEN_FILE) if state_dir else None
+    if state_dir:
+        os.makedirs(state_dir, exist_ok=True)
+    credentials = SharedTokenCredentials.from_info(info, token_file=token_file)
+    client = gspread.Client(credentials, session=pooled_session(credentials))
+    # HTTPClient hanya menyimpan `auth` bila membuat session sendiri; Client.expiry membutuhkannya
+    client.http_client.auth = credentials
+    return client
+
+
+class SpreadsheetKeyCache:
+    """Nama spreadsheet -> key, disimpan di file agar cold start tidak perlu pencarian Drive."""
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, KEY_FILE)
+
+    def get(self, name):
+        return _read_json(self.path).get(name)
+
+    def put(self, name, key):
+        with _file_lock(f"{self.path}.lock"):
+            keys = _read_json(self.path)
+            keys[name] = key
+            _write_json(self.path, keys)
+
+
+def open_spreadsheet(client, name, key_cache=None, key=None):
+    # Urutan: key eksplisit (secrets) -> key tersimpan -> client.open(name) (pencarian Drive, lalu disimpan)
+    key = key or (key_cache.get(name) if key_cache else None)
+    if key:
+        try:
+            return client.open_by_key(key)
+        except SpreadsheetNotFound:
+            pass  # key basi (spreadsheet dibuat ulang / akses dicabut), cari ulang lewat nama
+    spreadsheet = client.open(name)
+    if key_cache is not None:
+        key_cache.put(name, spreadsheet.id)
+    return spreadsheet
+
+
+class CachingSpreadsheet:
+    """Proxy spreadsheet yang menyimpan handle worksheet, jadi `worksheet(name)` tidak
+    mengambil metadata spreadsheet lagi di setiap penulisan."""
+
+    def __init__(self, spreadsheet):
+        self._spreadsheet = spreadsheet
+        self._worksheets = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self._spreadsheet, name)
+
+    def worksheet(self, title):
+        with self._lock:
+            ws = self._worksheets.get(title)
+        if ws is None:
+            ws = self._spreadsheet.worksheet(title)
+            with self._lock:
+                self._worksheets[title] = ws
+        return ws
+
+    def worksheets(self):
+        # Selalu ke API (dipakai untuk mendeteksi sheet yang hilang); sekalian mengisi cache
+        daftar = self._spreadsheet.worksheets()
+        with self._lock:
+            self._worksheets = {ws.title: ws for ws in daftar}
+        return daftar
+
+    def invalidate_worksheets(self):
+        with self._lock:
+            self._worksheets.clear()
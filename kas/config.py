@@ -0,0 +1,28 @@
+import os
+
+from kas.formatting import NAMA_BULAN_ID
+
+# --- KONFIGURASI AWAL & KONSTANTA ---
+NAMA_PENGHUNI = ["Yopha", "Degus", "Delon", "Dipta"]
+JUMLAH_IURAN = 350000
+TAHUN = 2025
+SPREADSHEET_NAME = "KAS CENDANA"
+IURAN_SHEET_NAME = f"StatusIuran{TAHUN}"
+LIST_BULAN = [f"{NAMA_BULAN_ID[i-1]}{TAHUN}" for i in range(6, 13)]
+OPSI_KEPERLUAN = ["Listrik", "Wifi", "PDAM", "Galon", "Keamanan", "Beras", "Minyak", "Gas", "Peralatan Mandi", "Bumbu Dapur", "Lainnya"]
+OPSI_PEMBAYAR = NAMA_PENGHUNI + ["Kas Bersama", "Seabank"]
+UKURAN_HALAMAN = 25
+MIRROR_DIR = os.environ.get("KAS_MIRROR_DIR", ".kas_mirror")
+# Tiap interval ini hanya revisi spreadsheet (modifiedTime Drive) yang dibaca; isi sheet ditarik bila berubah
+MIRROR_SYNC_INTERVAL = int(os.environ.get("KAS_MIRROR_SYNC_INTERVAL", "15"))
+# Token akses & key spreadsheet dibagi antar-replika lewat direktori ini
+SHARED_STATE_DIR = os.environ.get("KAS_SHARED_DIR", MIRROR_DIR)
+IURAN_POLL_INTERVAL = 1  # detik, status simpan checkbox iuran diperbarui hanya selagi ada yang menunggu disimpan
+SESSION_POLL_INTERVAL = int(os.environ.get("KAS_SESSION_POLL_INTERVAL", "5"))  # detik, sesi memeriksa apakah data bersama berubah
+# "bulanan": satu worksheet per bulan (LIST_BULAN); "tabel": semua pengeluaran di satu worksheet
+# TRANSAKSI_SHEET_NAME (isi lewat `python -m kas.migrasi`), daftar bulan diambil dari isinya
+STORAGE_MODE = os.environ.get("KAS_STORAGE_MODE", "bulanan")
+TABEL_TUNGGAL = STORAGE_MODE == "tabel"
+TRANSAKSI_SHEET_NAME = "Transaksi"
+# Baris per request saat tabel transaksi dibaca bertahap dari baris terbaru (cold start)
+UKURAN_POTONGAN = int(os.environ.get("KAS_UKURAN_POTONGAN", "2000"))
@@ -0,0 +1,503 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import streamlit as st
+
+from kas.aggregate import AggregateStore
+from kas.cache import DataCache
+from kas.client import CachingSpreadsheet, SpreadsheetKeyCache, build_client, open_spreadsheet
+from kas.config import (
+    IURAN_SHEET_NAME, LIST_BULAN, MIRROR_DIR, MIRROR_SYNC_INTERVAL, SHARED_STATE_DIR, SPREADSHEET_NAME,
+    TABEL_TUNGGAL, TRANSAKSI_SHEET_NAME, UKURAN_POTONGAN,
+)
+from kas.figures import FigureCache
+from kas.instrument import InstrumentedSpreadsheet, stage
+from kas.iuran import IuranWriter
+from kas.ledger import ReimburseLedger
+from kas.mirror import LocalMirror, MirrorSync, stream_mirror, sync_mirror
+from kas.sheets import (
+    FRAME_BUILDERS, IURAN_COLUMNS, KOLOM_SUDAH_DIGANTI, append_expense_rows, appended_start_row, batch_fetch_rows,
+    batch_set_cells, identitas_frame_pengeluaran, identitas_pengeluaran, iuran_frame, set_expense_status,
+    upsert_iuran_status,
+)
+from kas.transaksi import (
+    KOLOM_STATUS_TRANSAKSI, IndeksBulan, TabelBertahap, baris_transaksi, frame_kosong, identitas_transaksi,
+    nama_bulan,
+)
+from kas.writebehind import IuranWriteBehind
+
+# --- KONEKSI & AKSES DATA ---
+# Semua objek di sini dipakai bersama oleh seluruh sesi dalam satu proses (st.cache_resource).
+
+# Kolom yang diubah di tempat oleh aplikasi per tipe sheet, dicek murah oleh MirrorSync saat revisi berubah
+KOLOM_STATUS = {
+    'expense': KOLOM_SUDAH_DIGANTI,
+    'transaksi': KOLOM_STATUS_TRANSAKSI,
+    'iuran': IURAN_COLUMNS.index('Status') + 1,
+}
+# Sheet yang bila ditarik penuh dibaca per potongan: tabel transaksi tumbuh tanpa batas
+BERTAHAP = {TRANSAKSI_SHEET_NAME: UKURAN_POTONGAN}
+
+
+@st.cache_resource
+def connect_to_gsheet():
+    # Exception tidak di-cache oleh st.cache_resource, jadi rerun berikutnya mencoba lagi
+    client = build_client(dict(st.secrets["gcp_service_account"]), state_dir=SHARED_STATE_DIR)
+    # Dibuka lewat key (dari secrets atau cache file); pencarian Drive by name hanya sekali
+    spreadsheet = open_spreadsheet(
+        client, SPREADSHEET_NAME, SpreadsheetKeyCache(SHARED_STATE_DIR), key=st.secrets.get("spreadsheet_key")
+    )
+    # Semua panggilan API lewat proxy ini dicatat (jumlah, latency, byte) untuk panel debug;
+    # handle worksheet di-cache di luarnya sehingga hanya request sungguhan yang tercatat
+    return CachingSpreadsheet(InstrumentedSpreadsheet(spreadsheet))
+
+
+@st.cache_resource
+def get_mirror():
+    return LocalMirror(MIRROR_DIR)
+
+
+@st.cache_resource
+def start_mirror_sync(_spreadsheet):
+    targets = dict(sheet_targets())
+    cache = get_data_cache()
+
+    def on_change(changed):
+        # Cache di-invalidate supaya rerun berikutnya membangun ulang DataFrame dari mirror
+        for nama_sheet in changed:
+            if nama_sheet == TRANSAKSI_SHEET_NAME:
+                # Perubahan tabel transaksi bisa menyentuh bulan mana pun
+                cache.invalidate()
+            else:
+                cache.invalidate((nama_sheet, targets[nama_sheet]))
+            if nama_sheet == IURAN_SHEET_NAME:
+                # Baris StatusIuran bisa bergeser, indeks (Bulan, Nama) -> baris milik writer tidak dipercaya lagi
+                get_iuran_write_behind(_spreadsheet).writer.invalidate()
+
+    # Satu poller per proses: tiap interval hanya modifiedTime spreadsheet yang dibaca; bila berubah,
+    # kolom status + baris baru tiap sheet dicek, dan sesi diberi tahu lewat MirrorSync.generation
+    return MirrorSync(
+        _spreadsheet, get_mirror(), targets, interval=MIRROR_SYNC_INTERVAL, on_change=on_change,
+        revision=_spreadsheet.get_lastUpdateTime,
+        kolom_status={nama_sheet: KOLOM_STATUS[tipe] for nama_sheet, tipe in targets.items()}, bertahap=BERTAHAP,
+    ).start()
+
+
+@st.cache_resource
+def get_data_cache():
+    # Satu cache untuk semua sesi, menggantikan st.cache_data(ttl=3600) + st.cache_data.clear()
+    return DataCache(ttl=3600)
+
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(maxsize=32)
+
+
+def data_version(*keys):
+    # Versi gabungan beberapa entri DataCache, dipakai sebagai kunci FigureCache
+    cache = get_data_cache()
+    return tuple(cache.version(key) for key in keys)
+
+
+@st.cache_resource
+def get_indeks_bulan():
+    return IndeksBulan()
+
+
+def bulan_sekarang():
+    sekarang = datetime.now()
+    return nama_bulan(sekarang.year, sekarang.month)
+
+
+def daftar_bulan(spreadsheet):
+    # Mode bulanan: LIST_BULAN. Mode tabel: bulan yang ada di tabel transaksi, ditambah bulan berjalan
+    if not TABEL_TUNGGAL:
+        return LIST_BULAN
+    indeks = get_indeks_bulan()
+    if not indeks and not perlu_muat_bertahap(spreadsheet):
+        load_frame(spreadsheet, bulan_sekarang())
+    bulan = indeks.daftar()
+    if bulan_sekarang() not in bulan:
+        bulan.append(bulan_sekarang())
+    return bulan
+
+
+def sheet_targets():
+    # Worksheet yang dimirror beserta tipenya
+    if TABEL_TUNGGAL:
+        return [(TRANSAKSI_SHEET_NAME, 'transaksi'), (IURAN_SHEET_NAME, 'iuran')]
+    targets = [(nama_sheet, 'expense') for nama_sheet in LIST_BULAN]
+    targets.append((IURAN_SHEET_NAME, 'iuran'))
+    return targets
+
+
+def frame_keys(spreadsheet):
+    # Kunci DataCache untuk semua bulan + sheet iuran (di mode bulanan sama dengan sheet_targets)
+    return [(bulan, 'expense') for bulan in daftar_bulan(spreadsheet)] + [(IURAN_SHEET_NAME, 'iuran')]
+
+
+def load_frame(spreadsheet, worksheet_name, sheet_type='expense'):
+    # Sama dengan load_data, tapi sheet yang belum dibuat dikembalikan sebagai None
+    cache = get_data_cache()
+    key = (worksheet_name, sheet_type)
+
+    def loader():
+        if TABEL_TUNGGAL:
+            return _muat_tabel(spreadsheet, key)
+        # Data dibaca dari mirror lokal. Sheet yang belum pernah dimirror (cold start)
+        # ditarik sekaligus dalam satu values_batch_get, lalu semua bulan + sheet iuran
+        # yang belum ada di cache ikut dibangun, jadi ganti bulan di sidebar tidak perlu request
+        mirror = get_mirror()
+        keys = [k for k in sheet_targets() if k != key and not cache.contains(k)] + [key]
+        belum_dimirror = [nama_sheet for nama_sheet, _ in keys if not mirror.has(nama_sheet)]
+        if belum_dimirror and spreadsheet is not None:
+            sync_mirror(spreadsheet, mirror, belum_dimirror)
+        frames = {}
+        for nama_sheet, tipe in keys:
+            values = mirror.read_values(nama_sheet)
+            frames[nama_sheet] = None if values is None else FRAME_BUILDERS[tipe](values)
+        for nama_sheet, tipe in keys[:-1]:
+            cache.put((nama_sheet, tipe), frames[nama_sheet])
+        return frames[worksheet_name]
+
+    return cache.get(key, loader)
+
+
+def _muat_tabel(spreadsheet, key):
+    # Mode tabel: tabel transaksi dipecah per bulan sekali jalan, bulan yang belum di cache ikut diisi.
+    # Memilih bulan lain cukup mengambil DataFrame-nya dari cache, tanpa request maupun filter ulang
+    mirror = get_mirror()
+    belum_dimirror = [nama_sheet for nama_sheet, _ in sheet_targets() if not mirror.has(nama_sheet)]
+    if belum_dimirror and spreadsheet is not None:
+        sync_mirror(spreadsheet, mirror, belum_dimirror, bertahap=BERTAHAP)
+    # Dibaca dari mirror per potongan, jadi tabel mentah tidak pernah ada utuh di memori
+    hasil = mirror.read_chunks(TRANSAKSI_SHEET_NAME, UKURAN_POTONGAN)
+    tabel = None
+    if hasil is not None:
+        with stage("pandas: pecah tabel transaksi"):
+            tabel = TabelBertahap(hasil[0])
+            for first_row, rows in hasil[1]:
+                tabel.tambah(first_row, rows)
+    return _isi_cache_tabel(key, tabel)
+
+
+def _isi_cache_tabel(key, tabel):
+    # Semua bulan dari TabelBertahap (None: worksheet transaksi belum dibuat) + iuran masuk cache,
+    # kecuali `key` yang dikembalikan untuk disimpan oleh DataCache.get
+    cache = get_data_cache()
+    frames = {}
+    if tabel is not None:
+        frames = {(bulan, 'expense'): df for bulan, df in tabel.frames().items()}
+        get_indeks_bulan().set(bulan for bulan, _ in frames)
+    iuran = get_mirror().read_values(IURAN_SHEET_NAME)
+    frames[(IURAN_SHEET_NAME, 'iuran')] = None if iuran is None else iuran_frame(iuran)
+    if key not in frames:
+        # Bulan tanpa transaksi: kosong, kecuali tabelnya sendiri belum dibuat
+        frames[key] = None if tabel is None else frame_kosong()
+    for k, df in frames.items():
+        if k != key and not cache.contains(k):
+            cache.put(k, df)
+    return frames[key]
+
+
+def perlu_muat_bertahap(spreadsheet):
+    # Mode tabel, tabel transaksi belum pernah dimirror (cold start): dibaca bertahap lewat muat_bertahap
+    return TABEL_TUNGGAL and spreadsheet is not None and not get_mirror().has(TRANSAKSI_SHEET_NAME)
+
+
+def muat_bertahap(spreadsheet, bulan):
+    """Cold start mode tabel: tabel transaksi dibaca per UKURAN_POTONGAN baris, dari yang terbaru.
+
+    Generator; setelah tiap potongan menghasilkan (DataFrame `bulan` sejauh ini,
+    DataFrame iuran, jumlah baris terbaca) supaya halaman bisa dirender sebelum
+    seluruh tabel selesai. Setelah habis, tabel ada di mirror dan semua bulan
+    ada di cache. Tidak menghasilkan apa pun bila worksheet transaksi belum dibuat.
+    """
+    mirror = get_mirror()
+    if not mirror.has(IURAN_SHEET_NAME):
+        sync_mirror(spreadsheet, mirror, [IURAN_SHEET_NAME])
+    df_iuran = iuran_frame(mirror.read_values(IURAN_SHEET_NAME) or [])
+    hasil = stream_mirror(spreadsheet, mirror, TRANSAKSI_SHEET_NAME, UKURAN_POTONGAN)
+    if hasil is None:
+        return
+    tabel = TabelBertahap(hasil[0])
+    for first_row, rows in hasil[1]:
+        with stage("pandas: pecah tabel transaksi"):
+            tabel.tambah(first_row, rows)
+        yield tabel.bulan(bulan), df_iuran, tabel.jumlah_baris
+    key = (bulan, 'expense')
+    get_data_cache().get(key, lambda: _isi_cache_tabel(key, tabel))
+
+
+def load_data(spreadsheet, worksheet_name, sheet_type='expense'):
+    with stage("data: load_data"):
+        df = load_frame(spreadsheet, worksheet_name, sheet_type)
+    if df is None:
+        if TABEL_TUNGGAL and sheet_type == 'expense':
+            st.error(f"Sheet '{TRANSAKSI_SHEET_NAME}' tidak ditemukan. Jalankan `python -m kas.migrasi` lalu klik 'Muat Ulang Data Bulan Ini'.")
+        else:
+            st.error(f"Sheet '{worksheet_name}' tidak ditemukan. Mohon buat sheet tersebut lalu klik 'Muat Ulang Data Bulan Ini'.")
+        st.stop()
+    return df
+
+
+def muat_ulang(spreadsheet, nama_sheet):
+    # Tarik ulang seluruh isi sheet (bukan hanya baris baru) agar editan langsung di Sheets terbawa
+    # Lewat MirrorSync supaya sesi lain ikut rerun bila ternyata ada yang berubah
+    spreadsheet.invalidate_worksheets()
+    mirror_sync = start_mirror_sync(spreadsheet)
+    if TABEL_TUNGGAL:
+        mirror_sync.sync_once(full=True, names=[TRANSAKSI_SHEET_NAME, IURAN_SHEET_NAME])
+        get_data_cache().invalidate()
+        return
+    mirror_sync.sync_once(full=True, names=[nama_sheet, IURAN_SHEET_NAME])
+    get_data_cache().invalidate((nama_sheet, 'expense'))
+    get_data_cache().invalidate((IURAN_SHEET_NAME, 'iuran'))
+
+
+@st.cache_resource
+def get_aggregate_store():
+    return AggregateStore()
+
+
+def month_aggregate(bulan, df_pengeluaran):
+    # Dihitung ulang hanya bila versi cache bulan ini berubah (dimuat ulang / di-patch)
+    version = get_data_cache().version((bulan, 'expense'))
+    with stage("pandas: agregat bulan"):
+        return get_aggregate_store().month(bulan, version, df_pengeluaran)
+
+
+@st.cache_resource
+def get_ledger():
+    return ReimburseLedger()
+
+
+def sync_ledger(spreadsheet):
+    # Hanya bulan yang versi cache-nya berubah sejak terakhir dipindai yang dipindai ulang
+    ledger = get_ledger()
+    with stage("pandas: ledger"):
+        for bulan in daftar_bulan(spreadsheet):
+            df = load_frame(spreadsheet, bulan, 'expense')
+            ledger.sync_sheet(bulan, get_data_cache().version((bulan, 'expense')), df, identitas_frame)
+    return ledger
+
+
+@st.cache_resource
+def get_iuran_write_behind(_spreadsheet):
+    # Satu antrean tulis per proses; thread latarnya memegang IuranWriter (indeks Bulan, Nama -> baris)
+    cache = get_data_cache()
+    mirror = get_mirror()
+
+    def on_written(written, writer):
+        try:
+            cache.patch((IURAN_SHEET_NAME, 'iuran'), lambda df: upsert_iuran_status(df, written))
+            for (bulan, nama), status in written.items():
+                nomor_baris = writer.row_of(bulan, nama)
+                if nomor_baris:
+                    mirror.append(IURAN_SHEET_NAME, [[bulan, nama, status]], nomor_baris)
+        except Exception:
+            # Sheet sudah tertulis, hanya salinan lokal yang mungkin setengah jadi: dibuang
+            # supaya rerun berikutnya menarik ulang StatusIuran
+            try:
+                mirror.drop(IURAN_SHEET_NAME)
+            finally:
+                cache.invalidate((IURAN_SHEET_NAME, 'iuran'))
+            raise
+
+    writer = IuranWriter(_spreadsheet.worksheet(IURAN_SHEET_NAME))
+    return IuranWriteBehind(writer, on_written=on_written).start()
+
+
+def status_iuran(spreadsheet, df_iuran_all, bulan):
+    # {nama: status} bulan ini dari DataFrame iuran bersama, ditimpa perubahan yang masih di antrean tulis.
+    # Dibangun ulang tiap rerun, jadi status yang diubah penghuni lain langsung terlihat setelah sinkron
+    status = {}
+    if not df_iuran_all.empty:
+        bulan_ini = df_iuran_all[df_iuran_all['Bulan'] == bulan]
+        status = dict(zip(bulan_ini['Nama'], bulan_ini['Status']))
+    if spreadsheet is not None:
+        status.update(get_iuran_write_behind(spreadsheet).pending_for(bulan))
+    return status
+
+
+def lokasi_status(nama_sheet):
+    # (worksheet, kolom) tempat status 'Sudah Diganti?' sebuah bulan ditulis
+    if TABEL_TUNGGAL:
+        return TRANSAKSI_SHEET_NAME, KOLOM_STATUS_TRANSAKSI
+    return nama_sheet, KOLOM_SUDAH_DIGANTI
+
+
+def identitas_baris(cells):
+    # Mode tabel: kolom ID. Mode bulanan: Tanggal, Keperluan, Jumlah, Yang Bayar (sheet tidak punya ID)
+    return identitas_transaksi(cells) if TABEL_TUNGGAL else identitas_pengeluaran(cells)
+
+
+def identitas_frame(df):
+    # identitas_baris untuk tiap baris DataFrame bulan yang dirender (frame bulan mode tabel punya kolom ID)
+    if TABEL_TUNGGAL:
+        return df['ID'].astype(str).str.strip().tolist()
+    return identitas_frame_pengeluaran(df)
+
+
+def _status_sel(cells, kolom):
+    return str(cells[kolom - 1]).strip().upper() if len(cells) >= kolom else ''
+
+
+@dataclass
+class HasilTandai:
+    ditandai: int = 0  # ditulis SUDAH, termasuk yang posisinya bergeser
+    dipindah: int = 0  # bergeser karena sisip/hapus baris langsung di Sheets
+    sudah: int = 0  # ternyata sudah SUDAH di sheet (ditandai penghuni lain)
+    hilang: list = field(default_factory=list)  # [(nama_sheet, row_number)] yang tidak ditemukan lagi
+
+
+def _cari_ulang(spreadsheet, konflik, lokasi, harapan):
+    # Sheet yang barisnya bergeser saja yang disinkronkan ulang, lalu tiap baris dicari lewat identitasnya.
+    # Mengembalikan {item: (row baru, sudah_lunas)}; item yang tidak ketemu tidak ada di hasil
+    mirror = get_mirror()
+    sheets = sorted({lokasi[item][0] for item in konflik})
+    sync_mirror(spreadsheet, mirror, sheets, full=True, bertahap=BERTAHAP)
+    for sheet in sheets:
+        if sheet == TRANSAKSI_SHEET_NAME:
+            get_data_cache().invalidate()
+        else:
+            get_data_cache().invalidate((sheet, 'expense'))
+
+    ketemu = {}
+    for sheet in sheets:
+        values = mirror.read_values(sheet) or []
+        identitas = [identitas_baris(cells) for cells in values[1:]]
+        dipakai = set()
+        for item in [item for item in konflik if lokasi[item][0] == sheet]:
+            if harapan[item] == identitas_baris([]):
+                continue  # identitas kosong akan cocok dengan baris kosong mana pun
+            kolom = lokasi[item][1]
+            # Baris identik bisa lebih dari satu; yang belum lunas didahulukan
+            kandidat = [
+                (_status_sel(cells, kolom) == "SUDAH", row)
+                for row, cells, ident in zip(range(2, len(values) + 1), values[1:], identitas)
+                if row not in dipakai and ident == harapan[item]
+            ]
+            if kandidat:
+                sudah_lunas, row = min(kandidat)
+                dipakai.add(row)
+                ketemu[item] = (row, sudah_lunas)
+    return ketemu
+
+
+def tandai_sudah_diganti(spreadsheet, items):
+    """Tandai SUDAH secara compare-and-set: satu values_batch_get memeriksa, satu values_batch_update menulis.
+
+    items: [(nama_sheet, row_number, identitas)]; di mode tabel nama_sheet adalah
+    bulan dan row_number baris di worksheet transaksi. identitas adalah identitas
+    baris yang dirender ke pengguna (identitas_frame), jadi isi sheet dibandingkan
+    dengan baris yang diklik, bukan dengan mirror yang mungkin sudah tersinkron
+    sesudahnya: sisipan atau hapusan baris oleh penghuni lain tidak membuat baris
+    yang salah tertandai.
+    Baris yang bergeser dicari ulang tanpa memuat ulang bulan lain; yang sudah
+    SUDAH cukup diperbarui di lokal. Mengembalikan HasilTandai.
+    """
+    mirror = get_mirror()
+    hasil = HasilTandai()
+    lokasi = {item: lokasi_status(item[0]) for item in items}
+    harapan = {item: item[2] for item in items}
+    with stage("data: cek baris sebelum tandai"):
+        aktual = batch_fetch_rows(spreadsheet, [(lokasi[item][0], item[1]) for item in items])
+
+    tulis, sudah, konflik = {}, [], []
+    for item in items:
+        sheet, kolom = lokasi[item]
+        cells = aktual[(sheet, item[1])]
+        if identitas_baris(cells) != harapan[item]:
+            konflik.append(item)
+        elif _status_sel(cells, kolom) == "SUDAH":
+            sudah.append(item)
+        else:
+            tulis[item] = item[1]
+
+    if konflik:
+        ketemu = _cari_ulang(spreadsheet, konflik, lokasi, harapan)
+        for item in konflik:
+            if item not in ketemu:
+                hasil.hilang.append(item[:2])
+            elif ketemu[item][1]:
+                hasil.sudah += 1
+            else:
+                tulis[item] = ketemu[item][0]
+                hasil.dipindah += 1
+
+    batch_set_cells(spreadsheet, [(lokasi[item][0], row, lokasi[item][1], "SUDAH") for item, row in tulis.items()])
+    hasil.ditandai = len(tulis)
+    hasil.sudah += len(sudah)
+    per_sheet = {}
+    for item in list(tulis) + sudah:
+        sheet, kolom = lokasi[item]
+        row = tulis.get(item, item[1])
+        mirror.set_cell(sheet, row, kolom, "SUDAH")
+        per_sheet.setdefault(item[0], []).append(row)
+    # Sheet yang disinkronkan ulang sudah di-invalidate, jadi patch di bawah hanya mengenai bulan lain
+    for nama_sheet, rows in per_sheet.items():
+        versi = get_data_cache().patch((nama_sheet, 'expense'), lambda df, rows=rows: set_expense_status(df, rows, "SUDAH"))
+        if versi is not None:
+            get_ledger().apply(nama_sheet, versi - 1, versi, lunas=rows)
+    return hasil
+
+
+def simpan_pengeluaran(spreadsheet, nama_sheet, rows):
+    # rows: [[tanggal, keperluan, jumlah, yang_bayar, status_ganti]], ditulis dengan satu append_rows
+    if TABEL_TUNGGAL:
+        return simpan_transaksi(spreadsheet, {nama_sheet: rows})[nama_sheet]
+    response = spreadsheet.worksheet(nama_sheet).append_rows(rows)
+    mirror = get_mirror()
+    first_row = appended_start_row(response, mirror.last_row(nama_sheet) + 1)
+    mirror.append(nama_sheet, rows, first_row)
+    _patch_baris_baru(nama_sheet, rows, first_row)
+    return first_row
+
+
+def simpan_transaksi(spreadsheet, per_bulan):
+    # Mode tabel: baris semua bulan ditulis ke worksheet transaksi dengan satu append_rows
+    tabel = [baris_transaksi(bulan, row) for bulan, rows in per_bulan.items() for row in rows]
+    response = spreadsheet.worksheet(TRANSAKSI_SHEET_NAME).append_rows(tabel)
+    mirror = get_mirror()
+    first_row = appended_start_row(response, mirror.last_row(TRANSAKSI_SHEET_NAME) + 1)
+    mirror.append(TRANSAKSI_SHEET_NAME, tabel, first_row)
+    hasil = {}
+    baris = first_row
+    for bulan, rows in per_bulan.items():
+        # Baris frame bulan = kolom sheet bulanan + ID (kolom pertama baris transaksi)
+        frame_rows = [list(row[:5]) + [tabel[baris - first_row + i][0]] for i, row in enumerate(rows)]
+        _patch_baris_baru(bulan, frame_rows, baris)
+        get_indeks_bulan().add(bulan)
+        hasil[bulan] = baris
+        baris += len(rows)
+    return hasil
+
+
+def _patch_baris_baru(nama_sheet, rows, first_row):
+    cache = get_data_cache()
+    key = (nama_sheet, 'expense')
+    versi = cache.patch(key, lambda df: append_expense_rows(df, rows, first_row))
+    if versi is None:
+        cache.invalidate(key)
+    else:
+        # Baris frame mode tabel membawa ID di kolom terakhir
+        belum = [
+            (first_row + i, row[3], int(row[2]), str(row[5]).strip() if TABEL_TUNGGAL else identitas_pengeluaran(row))
+            for i, row in enumerate(rows) if row[4] == "BELUM"
+        ]
+        get_ledger().apply(nama_sheet, versi - 1, versi, tambah=belum)
+
+
+def impor_pengeluaran(spreadsheet, per_bulan):
+    # per_bulan: {nama_sheet: rows} dari importer.baris_per_bulan, satu append_rows per sheet bulan
+    # (mode tabel: satu append_rows untuk semua bulan)
+    if TABEL_TUNGGAL:
+        with stage("data: impor append_rows"):
+            return simpan_transaksi(spreadsheet, per_bulan)
+    hasil = {}
+    for nama_sheet, rows in per_bulan.items():
+        with stage("data: impor append_rows"):
+            hasil[nama_sheet] = simpan_pengeluaran(spreadsheet, nama_sheet, rows)
+    return hasil
@@ -0,0 +1,40 @@
+import threading
+from collections import Counter, OrderedDict
+
+
+class FigureCache:
+    """Figure plotly per nama grafik, dibangun ulang hanya bila versi datanya berubah.
+
+    Satu nama grafik (mis. ('pie_distribusi', 'Juni2025')) hanya menyimpan
+    figure untuk versi datanya yang terakhir, dan jumlah grafik yang disimpan
+    dibatasi `maxsize` dengan LRU. Versi boleh berupa tuple, jadi grafik
+    lintas bulan cukup memakai gabungan versi semua bulan yang digambarnya.
+    Figure yang dikembalikan dipakai bersama oleh semua sesi, jangan diubah.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self.stats = Counter(hits=0, misses=0, evictions=0)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name, version, builder):
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(name)
+                self.stats['hits'] += 1
+                return entry[1]
+            self.stats['misses'] += 1
+        fig = builder()
+        with self._lock:
+            self._entries[name] = (version, fig)
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return fig
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
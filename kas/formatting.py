@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+# Daftar manual untuk nama hari dan bulan dalam Bahasa Indonesia
+NAMA_BULAN_ID = [
+    "Januari", "Februari", "Maret", "April", "Mei", "Juni",
+    "Juli", "Agustus", "September", "Oktober", "November", "Desember"
+]
+HARI_ID = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+
+TANGGAL_TIDAK_VALID = "(tanggal tidak valid)"
+
+
+def format_tanggal_indonesia(dt_object):
+    nama_hari = HARI_ID[dt_object.weekday()]
+    nama_bulan = NAMA_BULAN_ID[dt_object.month - 1]
+    return f"{nama_hari}, {dt_object.day:02d} {nama_bulan} {dt_object.year}"
+
+
+def format_tanggal_series(tanggal, fallback=TANGGAL_TIDAK_VALID):
+    """Format kolom tanggal ke teks Indonesia dengan memformat tiap tanggal unik sekali saja.
+
+    Dalam satu bulan tanggal banyak berulang, jadi hasil format tanggal unik
+    disebar balik lewat kode factorize. Baris NaT memakai `fallback` per baris
+    (skalar, atau Series dengan index yang sama).
+    """
+    tanggal = pd.to_datetime(tanggal, errors='coerce')
+    codes, uniques = pd.factorize(tanggal)
+    # Kode -1 (NaT) menunjuk elemen terakhir, yaitu None
+    teks_unik = np.array([format_tanggal_indonesia(t) for t in uniques] + [None], dtype=object)
+    hasil = pd.Series(teks_unik[codes], index=tanggal.index, dtype=object)
+    if (codes == -1).any():
+        hasil = hasil.where(codes != -1, fallback)
+    return hasil
@@ -0,0 +1,218 @@
+import csv
+import re
+from collections import Counter
+
+import pandas as pd
+
+from kas.config import LIST_BULAN, OPSI_KEPERLUAN, OPSI_PEMBAYAR
+from kas.formatting import NAMA_BULAN_ID
+from kas.schema import FORMAT_TANGGAL, parse_rupiah
+from kas.sheets import EXPENSE_COLUMNS
+
+# --- IMPOR PENGELUARAN DARI CSV / XLSX ---
+
+UKURAN_CHUNK = 1000
+KOLOM_WAJIB = EXPENSE_COLUMNS[:4]
+STATUS_GANTI = ["BELUM", "SUDAH"]
+DUPLIKAT = "Duplikat"
+# Format tanggal yang umum di ekspor bank / spreadsheet lain, dicoba berurutan
+FORMAT_TANGGAL_IMPOR = [FORMAT_TANGGAL, '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%Y/%m/%d', '%d %m %Y']
+# "12 Juni 2025" / "12 Jun 2025" -> "12 6 2025", lalu dibaca dengan '%d %m %Y'
+_RE_NAMA_BULAN = re.compile(
+    r'\b(' + '|'.join(sorted({n[:3] for n in NAMA_BULAN_ID} | set(NAMA_BULAN_ID), key=len, reverse=True)) + r')\b',
+    re.IGNORECASE,
+)
+_NOMOR_BULAN = {nama.lower(): str(i) for i, nama in enumerate(NAMA_BULAN_ID, 1)}
+_NOMOR_BULAN.update({nama[:3].lower(): nomor for nama, nomor in list(_NOMOR_BULAN.items())})
+
+
+def _teks_sel(nilai):
+    # Sel XLSX bisa berupa datetime / float; disamakan dengan teks yang tertulis di CSV
+    if nilai is None:
+        return ''
+    if hasattr(nilai, 'strftime'):
+        return nilai.strftime(FORMAT_TANGGAL)
+    if isinstance(nilai, float) and nilai.is_integer():
+        return str(int(nilai))
+    return str(nilai)
+
+
+def _kolom_kanonik(headers):
+    kanonik = {kolom.lower(): kolom for kolom in EXPENSE_COLUMNS}
+    kolom = [kanonik.get(str(h).strip().lower(), str(h).strip()) for h in headers]
+    kurang = [k for k in KOLOM_WAJIB if k not in kolom]
+    if kurang:
+        raise ValueError(f"Kolom wajib tidak ada di berkas: {', '.join(kurang)}")
+    return kolom
+
+
+def _chunk_frame(rows, kolom, nomor_baris):
+    df = pd.DataFrame(rows, columns=kolom, dtype=object).fillna('')
+    if 'Sudah Diganti?' not in df.columns:
+        df['Sudah Diganti?'] = STATUS_GANTI[0]
+    df = df[EXPENSE_COLUMNS].astype(str)
+    df.insert(0, 'Baris', nomor_baris)
+    return df
+
+
+def _chunks_csv(berkas, ukuran):
+    contoh = berkas.read(4096)
+    berkas.seek(0)
+    teks = contoh.decode('utf-8-sig', errors='ignore') if isinstance(contoh, bytes) else contoh
+    try:
+        pemisah = csv.Sniffer().sniff(teks, delimiters=',;\t').delimiter
+    except csv.Error:
+        pemisah = ','
+    reader = pd.read_csv(
+        berkas, sep=pemisah, dtype=str, keep_default_na=False, encoding='utf-8-sig', chunksize=ukuran,
+    )
+    kolom = None
+    baris_awal = 2
+    for chunk in reader:
+        if kolom is None:
+            kolom = _kolom_kanonik(chunk.columns)
+        yield _chunk_frame(chunk.to_numpy(), kolom, range(baris_awal, baris_awal + len(chunk)))
+        baris_awal += len(chunk)
+
+
+def _chunks_xlsx(berkas, ukuran):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Impor XLSX butuh paket openpyxl (pip install openpyxl).") from None
+    # read_only: baris dibaca satu per satu dari XML, tidak seluruh workbook di memori
+    workbook = load_workbook(berkas, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        kolom = _kolom_kanonik(next(rows, ()))
+        batch, nomor_baris = [], []
+        for nomor, row in enumerate(rows, start=2):
+            if not any(sel not in (None, '') for sel in row):
+                continue
+            row = (list(row) + [None] * len(kolom))[:len(kolom)]
+            batch.append([_teks_sel(sel) for sel in row])
+            nomor_baris.append(nomor)
+            if len(batch) == ukuran:
+                yield _chunk_frame(batch, kolom, nomor_baris)
+                batch, nomor_baris = [], []
+        if batch:
+            yield _chunk_frame(batch, kolom, nomor_baris)
+    finally:
+        workbook.close()
+
+
+def baca_chunks(berkas, nama_berkas, ukuran=UKURAN_CHUNK):
+    """Baca berkas CSV/XLSX per potongan `ukuran` baris, semua kolom sebagai teks.
+
+    Header dicocokkan tanpa peduli huruf besar/kecil dengan kolom sheet
+    pengeluaran; kolom 'Sudah Diganti?' boleh tidak ada (dianggap BELUM).
+    Kolom 'Baris' berisi nomor baris asli di berkas untuk pesan kesalahan.
+    """
+    if nama_berkas.lower().endswith(('.xlsx', '.xlsm')):
+        return _chunks_xlsx(berkas, ukuran)
+    return _chunks_csv(berkas, ukuran)
+
+
+def normalisasi_tanggal(series):
+    teks = series.astype(str).str.strip()
+    teks = teks.str.replace(_RE_NAMA_BULAN, lambda m: _NOMOR_BULAN[m.group(1).lower()], regex=True)
+    tanggal = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+    for fmt in FORMAT_TANGGAL_IMPOR:
+        sisa = tanggal.isna() & (teks != '')
+        if not sisa.any():
+            break
+        tanggal[sisa] = pd.to_datetime(teks[sisa], format=fmt, errors='coerce')
+    return tanggal
+
+
+def _pilihan(series, opsi):
+    # Dicocokkan tanpa peduli huruf besar/kecil, hasilnya ditulis dengan ejaan baku
+    baku = {o.lower(): o for o in opsi}
+    return series.str.strip().str.lower().map(baku)
+
+
+def kunci_transaksi(tanggal, keperluan, jumlah, yang_bayar):
+    # (tanggal 'YYYY-MM-DD', keperluan, jumlah, yang bayar) untuk deteksi duplikat
+    return zip(pd.Series(tanggal).dt.strftime(FORMAT_TANGGAL), keperluan, jumlah, yang_bayar)
+
+
+def validasi_chunk(chunk, sisa_lama, periode=LIST_BULAN):
+    """Normalisasi & validasi satu potongan hasil baca_chunks.
+
+    `sisa_lama(bulan)` mengembalikan Counter kunci_transaksi di sheet bulan itu
+    (atau None bila sheet belum dibuat). Counter-nya dikurangi tiap ada baris
+    yang cocok, jadi dua baris identik di berkas vs satu di sheet -> satu duplikat.
+    `periode` adalah daftar bulan yang boleh diisi (None = bulan apa saja).
+    Mengembalikan DataFrame dengan kolom 'Bulan' (sheet tujuan) dan 'Masalah'
+    ('' untuk baris yang siap ditulis).
+    """
+    hasil = pd.DataFrame({'Baris': chunk['Baris']})
+    hasil['Tanggal'] = normalisasi_tanggal(chunk['Tanggal'])
+    hasil['Keperluan'] = _pilihan(chunk['Keperluan'], OPSI_KEPERLUAN)
+    jumlah, jumlah_gagal = parse_rupiah(chunk['Jumlah'])
+    hasil['Jumlah'] = jumlah
+    hasil['Yang Bayar'] = _pilihan(chunk['Yang Bayar'], OPSI_PEMBAYAR)
+    status = chunk['Sudah Diganti?'].str.strip().replace('', STATUS_GANTI[0])
+    hasil['Sudah Diganti?'] = _pilihan(status, STATUS_GANTI)
+    hasil['Bulan'] = [
+        None if pd.isna(t) else f"{NAMA_BULAN_ID[t.month - 1]}{t.year}" for t in hasil['Tanggal']
+    ]
+
+    masalah = pd.Series('', index=chunk.index, dtype=object)
+    di_luar_periode = pd.Series(False, index=chunk.index)
+    if periode is not None:
+        di_luar_periode = hasil['Bulan'].notna() & ~hasil['Bulan'].isin(periode)
+    # Dicek dari yang paling akhir supaya pesan yang tersisa adalah masalah pertama
+    periksa = [
+        (di_luar_periode, "Tanggal di luar periode kas"),
+        (hasil['Sudah Diganti?'].isna(), "Sudah Diganti? harus BELUM/SUDAH"),
+        (hasil['Yang Bayar'].isna(), "Yang Bayar tidak dikenal: " + chunk['Yang Bayar']),
+        (jumlah_gagal | (jumlah <= 0), "Jumlah tidak valid: " + chunk['Jumlah']),
+        (hasil['Keperluan'].isna(), "Keperluan tidak dikenal: " + chunk['Keperluan']),
+        (hasil['Tanggal'].isna(), "Tanggal tidak valid: " + chunk['Tanggal']),
+    ]
+    for mask, pesan in periksa:
+        masalah = masalah.mask(mask, pesan)
+
+    siap = hasil[masalah == '']
+    kunci_siap = kunci_transaksi(siap['Tanggal'], siap['Keperluan'], siap['Jumlah'], siap['Yang Bayar'])
+    for i, bulan, kunci in zip(siap.index, siap['Bulan'], kunci_siap):
+        lama = sisa_lama(bulan)
+        if lama is None:
+            masalah[i] = f"Sheet {bulan} belum dibuat"
+        elif lama[kunci] > 0:
+            lama[kunci] -= 1
+            masalah[i] = DUPLIKAT
+    hasil['Masalah'] = masalah
+    return hasil
+
+
+def validasi_berkas(berkas, nama_berkas, frame_bulan, periode=LIST_BULAN, ukuran=UKURAN_CHUNK):
+    """Validasi seluruh berkas per chunk. `frame_bulan(bulan)` -> DataFrame sheet bulan itu atau None."""
+    counters = {}
+
+    def sisa_lama(bulan):
+        if bulan not in counters:
+            df = frame_bulan(bulan)
+            counters[bulan] = None if df is None else Counter(kunci_transaksi(
+                df['Tanggal'], df['Keperluan'].astype(str), df['Jumlah'], df['Yang Bayar'].astype(str)
+            ))
+        return counters[bulan]
+
+    hasil = [validasi_chunk(chunk, sisa_lama, periode) for chunk in baca_chunks(berkas, nama_berkas, ukuran)]
+    if not hasil:
+        return pd.DataFrame(columns=['Baris'] + EXPENSE_COLUMNS + ['Bulan', 'Masalah'])
+    return pd.concat(hasil, ignore_index=True)
+
+
+def baris_per_bulan(hasil):
+    """Baris valid dikelompokkan per sheet bulan, urut kronologis, siap untuk satu append_rows per bulan."""
+    siap = hasil[hasil['Masalah'] == '']
+    per_bulan = {}
+    for bulan in pd.unique(siap.sort_values('Tanggal', kind='stable')['Bulan']):
+        bagian = siap[siap['Bulan'] == bulan]
+        per_bulan[bulan] = [
+            [t.strftime(FORMAT_TANGGAL), k, int(j), b, s]
+            for t, k, j, b, s in bagian[EXPENSE_COLUMNS].itertuples(index=False)
+        ]
+    return per_bulan
@@ -0,0 +1,240 @@
+import bisect
+import json
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+
+# Batas atas bucket histogram latency (ms); bucket terakhir = lebih dari itu
+BUCKET_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+_aktif = threading.local()
+
+
+def _ukuran(obj):
+    # Ukuran payload persis: panjang JSON dari argumen / hasil panggilan (hanya saat panel debug aktif)
+    try:
+        return len(json.dumps(obj, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _ukuran_sel(hasil):
+    # Perkiraan murah: jumlah panjang isi sel dari hasil baca (values_batch_get / get_all_values)
+    if isinstance(hasil, dict):
+        baris = [row for rng in hasil.get('valueRanges', []) for row in rng.get('values', [])]
+    elif isinstance(hasil, list):
+        baris = hasil
+    else:
+        return 0
+    total = 0
+    for row in baris:
+        if isinstance(row, list):
+            total += sum(len(cell) if isinstance(cell, str) else 8 for cell in row)
+    return total
+
+
+def histogram(latencies):
+    counts = [0] * (len(BUCKET_MS) + 1)
+    for detik in latencies:
+        counts[bisect.bisect_left(BUCKET_MS, detik * 1000)] += 1
+    labels = [f"<={b}ms" for b in BUCKET_MS] + [f">{BUCKET_MS[-1]}ms"]
+    return dict(zip(labels, counts))
+
+
+class RunStats:
+    """Catatan satu rerun (atau aktivitas thread latar): API call, byte, tahap, cache."""
+
+    def __init__(self, page=None, max_samples=None, ukur_byte=False):
+        # max_samples membatasi sampel latency per panggilan (untuk catatan latar yang hidup lama);
+        # ukur_byte=True menghitung payload persis lewat JSON, selain itu hanya perkiraan dari isi sel
+        self.page = page
+        self.ukur_byte = ukur_byte
+        self.started = time.time()
+        self.duration = None
+        self.counts = Counter()
+        self.calls = defaultdict(lambda: deque(maxlen=max_samples))
+        self.bytes = defaultdict(int)
+        self.stages = defaultdict(list)
+        self.cache = {}
+        self._lock = threading.Lock()
+
+    def record_call(self, name, detik, nbytes):
+        with self._lock:
+            self.counts[name] += 1
+            self.calls[name].append(detik)
+            self.bytes[name] += nbytes
+
+    def record_stage(self, name, detik):
+        with self._lock:
+            self.stages[name].append(detik)
+
+    @property
+    def total_calls(self):
+        with self._lock:
+            return sum(self.counts.values())
+
+    def call_rows(self):
+        with self._lock:
+            return [
+                {
+                    'Panggilan': name,
+                    'Jumlah': self.counts[name],
+                    'Total (ms)': round(sum(latencies) * 1000, 1),
+                    'Maks (ms)': round(max(latencies) * 1000, 1),
+                    'Byte': self.bytes[name],
+                }
+                for name, latencies in sorted(self.calls.items())
+            ]
+
+    def stage_rows(self):
+        with self._lock:
+            return [
+                {'Tahap': name, 'Jumlah': len(durasi), 'Total (ms)': round(sum(durasi) * 1000, 1)}
+                for name, durasi in sorted(self.stages.items())
+            ]
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'page': self.page,
+                'started': self.started,
+                'duration': self.duration,
+                'calls': {
+                    name: {
+                        'count': self.counts[name],
+                        'total_s': sum(latencies),
+                        'histogram': histogram(latencies),
+                        'bytes': self.bytes[name],
+                    }
+                    for name, latencies in self.calls.items()
+                },
+                'stages': {name: {'count': len(d), 'total_s': sum(d)} for name, d in self.stages.items()},
+                'cache': dict(self.cache),
+            }
+
+
+# Panggilan dari thread latar (MirrorSync, antrean tulis iuran) tidak milik rerun mana pun
+background = RunStats(page='(latar)', max_samples=1000)
+
+
+def record_call(name, detik, nbytes=0):
+    run = getattr(_aktif, 'run', None)
+    (run or background).record_call(name, detik, nbytes)
+
+
+def ukuran_payload(args, kwargs, hasil):
+    run = getattr(_aktif, 'run', None)
+    if run is not None and run.ukur_byte:
+        return _ukuran([args, kwargs]) + _ukuran(hasil)
+    return _ukuran_sel(hasil)
+
+
+@contextmanager
+def stage(name):
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        run = getattr(_aktif, 'run', None)
+        if run is not None:
+            run.record_stage(name, time.perf_counter() - mulai)
+
+
+class Profiler:
+    """Riwayat rerun satu sesi; rerun yang sedang berjalan terikat ke thread script."""
+
+    def __init__(self, history=50):
+        self.runs = deque(maxlen=history)
+        self._cache_awal = {}
+        self._mulai = None
+
+    def begin_run(self, page=None, cache_stats=None, ukur_byte=False):
+        if getattr(_aktif, 'run', None) is not None:
+            # Rerun sebelumnya berhenti di tengah (st.stop / exception)
+            self.end_run(cache_stats)
+        run = RunStats(page, ukur_byte=ukur_byte)
+        self.runs.append(run)
+        self._cache_awal = dict(cache_stats or {})
+        self._mulai = time.perf_counter()
+        _aktif.run = run
+        return run
+
+    def end_run(self, cache_stats=None):
+        run = getattr(_aktif, 'run', None)
+        if run is None:
+            return None
+        run.duration = time.perf_counter() - self._mulai
+        run.cache = {k: v - self._cache_awal.get(k, 0) for k, v in (cache_stats or {}).items()}
+        _aktif.run = None
+        return run
+
+    def page_rows(self):
+        # Rata-rata per halaman menu atas semua rerun yang selesai
+        per_page = defaultdict(list)
+        for run in self.runs:
+            if run.duration is not None:
+                per_page[run.page].append(run)
+        return [
+            {
+                'Halaman': page,
+                'Rerun': len(runs),
+                'Rata-rata (ms)': round(sum(r.duration for r in runs) / len(runs) * 1000, 1),
+                'API call / rerun': round(sum(r.total_calls for r in runs) / len(runs), 2),
+                'Cache hit': sum(r.cache.get('hits', 0) for r in runs),
+                'Cache miss': sum(r.cache.get('misses', 0) for r in runs),
+            }
+            for page, runs in per_page.items()
+        ]
+
+    def to_json(self):
+        return json.dumps(
+            {'runs': [run.as_dict() for run in self.runs], 'background': background.as_dict()},
+            indent=2,
+        )
+
+
+class _Instrumented:
+    # Proxy umum: method publik dibungkus agar durasi dan ukuran payload-nya dicatat
+    _label = None
+
+    def __init__(self, target):
+        object.__setattr__(self, '_target', target)
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+        nama_call = f"{self._label}.{name}"
+
+        def wrapper(*args, **kwargs):
+            mulai = time.perf_counter()
+            hasil = None
+            try:
+                hasil = attr(*args, **kwargs)
+                return self._wrap_result(name, hasil)
+            finally:
+                record_call(nama_call, time.perf_counter() - mulai, ukuran_payload(args, kwargs, hasil))
+
+        return wrapper
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def _wrap_result(self, name, hasil):
+        return hasil
+
+
+class InstrumentedWorksheet(_Instrumented):
+    _label = 'worksheet'
+
+
+class InstrumentedSpreadsheet(_Instrumented):
+    _label = 'spreadsheet'
+
+    def _wrap_result(self, name, hasil):
+        if name in ('worksheet', 'add_worksheet'):
+            return InstrumentedWorksheet(hasil)
+        if name == 'worksheets':
+            return [InstrumentedWorksheet(ws) for ws in hasil]
+        return hasil
@@ -0,0 +1,99 @@
+from kas.sheets import appended_start_row
+
+# Layout sheet StatusIuran: A = Bulan, B = Nama, C = Status (baris 1 = header)
+KOLOM_STATUS = "C"
+
+
+class IuranWriter:
+    """Antrean tulis status iuran dengan indeks (Bulan, Nama) -> nomor baris di memori.
+
+    Indeks dibangun dari satu kali baca penuh, lalu semua perubahan yang
+    diantrekan dikirim sekaligus lewat satu batch_update (baris yang sudah ada)
+    dan satu append_rows (baris baru). Sebelum menulis, kolom A:B baris tujuan
+    dicek dengan satu batch_get; bila ada yang tidak cocok (baris disisip/dihapus
+    langsung di Sheets) atau ada baris baru, indeks dibangun ulang dulu.
+    """
+
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+        self._index = None
+        self._basi = False
+        self._jumlah_baris = 0
+        self._pending = {}
+
+    def _build_index(self):
+        values = self.worksheet.get_all_values()
+        self._index = {}
+        for nomor_baris, row in enumerate(values[1:], start=2):
+            if len(row) < 2:
+                continue
+            # Sama seperti findall lama: baris pertama yang cocok yang dipakai
+            self._index.setdefault((row[0], row[1]), nomor_baris)
+        self._jumlah_baris = max(len(values), 1)
+
+    def invalidate(self):
+        # Dipanggil saat sheet diketahui berubah dari luar; indeks dibangun ulang saat flush berikutnya
+        self._basi = True
+
+    def _index_cocok(self):
+        rows = {key: self._index[key] for key in self._pending if key in self._index}
+        if len(rows) < len(self._pending):
+            # Ada baris baru: indeks disegarkan supaya tidak menambah baris yang sudah dibuat replika lain
+            return False
+        isi = self.worksheet.batch_get([f"A{row}:B{row}" for row in rows.values()])
+        for (bulan, nama), cells in zip(rows, isi):
+            cells = (list(cells[0]) if cells else []) + ['', '']
+            if (cells[0], cells[1]) != (bulan, nama):
+                return False
+        return True
+
+    def queue(self, bulan, nama, status):
+        # Toggle berulang untuk orang yang sama cukup ditulis sekali (nilai terakhir)
+        self._pending[(bulan, nama)] = status
+
+    def row_of(self, bulan, nama):
+        return (self._index or {}).get((bulan, nama))
+
+    @property
+    def pending(self):
+        return dict(self._pending)
+
+    def discard(self):
+        # Buang antrean yang gagal dikirim; pemanggil yang memutuskan apa yang diantrekan ulang
+        self._pending = {}
+
+    def flush(self):
+        if not self._pending:
+            return {}
+        if self._index is None or self._basi or not self._index_cocok():
+            self._basi = False
+            self._build_index()
+
+        updates, appends = [], []
+        for (bulan, nama), status in self._pending.items():
+            nomor_baris = self._index.get((bulan, nama))
+            if nomor_baris:
+                updates.append({"range": f"{KOLOM_STATUS}{nomor_baris}", "values": [[status]]})
+            else:
+                appends.append((bulan, nama, status))
+
+        try:
+            if updates:
+                self.worksheet.batch_update(updates)
+            if appends:
+                response = self.worksheet.append_rows([list(row) for row in appends])
+                self._register_appends(appends, response)
+        except Exception:
+            # Indeks bisa jadi basi (sheet diubah orang lain), bangun ulang saat flush berikutnya
+            self._index = None
+            raise
+
+        written = self._pending
+        self._pending = {}
+        return written
+
+    def _register_appends(self, appends, response):
+        baris_awal = appended_start_row(response, self._jumlah_baris + 1)
+        for offset, (bulan, nama, _) in enumerate(appends):
+            self._index.setdefault((bulan, nama), baris_awal + offset)
+        self._jumlah_baris = baris_awal + len(appends) - 1
@@ -0,0 +1,86 @@
+import threading
+from collections import defaultdict
+
+
+class ReimburseLedger:
+    """Saldo pengeluaran yang belum diganti per 'Yang Bayar', lintas semua bulan.
+
+    Tiap sheet bulan dipindai sekali per versi cache-nya. Setelah itu penulisan
+    dari aplikasi (baris baru, tandai SUDAH) diterapkan langsung lewat `apply`
+    tanpa memindai ulang sheet mana pun. Tiap entri menyimpan identitas baris
+    yang dipindai, untuk dicocokkan ulang dengan sheet saat ditandai lunas.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._saldo = defaultdict(int)
+        self._jumlah_item = defaultdict(int)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def _add(self, nama_sheet, row_number, pembayar, jumlah, identitas=None):
+        key = (nama_sheet, row_number)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (pembayar, jumlah, identitas)
+        self._saldo[pembayar] += jumlah
+        self._jumlah_item[pembayar] += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        pembayar, jumlah, _ = entry
+        self._saldo[pembayar] -= jumlah
+        self._jumlah_item[pembayar] -= 1
+
+    def sync_sheet(self, nama_sheet, version, df, identitas=None):
+        # identitas(df) -> identitas tiap baris df, disimpan bersama entrinya
+        with self._lock:
+            if self._versions.get(nama_sheet) == version:
+                return False
+            for key in [k for k in self._entries if k[0] == nama_sheet]:
+                self._remove(key)
+            if df is not None and not df.empty:
+                belum = df[df['Sudah Diganti?'] == 'BELUM']
+                kunci = identitas(belum) if identitas is not None else [None] * len(belum)
+                for row_number, pembayar, jumlah, ident in zip(
+                    belum['row_number'], belum['Yang Bayar'], belum['Jumlah'], kunci
+                ):
+                    self._add(nama_sheet, int(row_number), str(pembayar), int(jumlah), ident)
+            self._versions[nama_sheet] = version
+            return True
+
+    def apply(self, nama_sheet, version_lama, version_baru, tambah=(), lunas=()):
+        """Terapkan penulisan aplikasi ke satu sheet secara inkremental.
+
+        tambah: [(row_number, pembayar, jumlah, identitas)] baris BELUM yang baru ditulis;
+        lunas: [row_number] yang baru ditandai SUDAH. Bila ledger tidak sedang
+        berada di `version_lama`, perubahan diabaikan dan sheet itu dipindai
+        ulang pada sync_sheet berikutnya.
+        """
+        with self._lock:
+            if self._versions.get(nama_sheet) != version_lama:
+                return False
+            for row_number, pembayar, jumlah, identitas in tambah:
+                self._add(nama_sheet, row_number, pembayar, jumlah, identitas)
+            for row_number in lunas:
+                self._remove((nama_sheet, row_number))
+            self._versions[nama_sheet] = version_baru
+            return True
+
+    def outstanding(self, urutan=()):
+        # {pembayar: (total, jumlah_item)} untuk yang masih punya saldo, urut sesuai `urutan`
+        with self._lock:
+            aktif = [p for p, n in self._jumlah_item.items() if n > 0]
+            posisi = {p: i for i, p in enumerate(urutan)}
+            aktif.sort(key=lambda p: (posisi.get(p, len(posisi)), p))
+            return {p: (self._saldo[p], self._jumlah_item[p]) for p in aktif}
+
+    def items_for(self, pembayar):
+        # [(nama_sheet, row_number, identitas)] siap untuk tandai_sudah_diganti
+        with self._lock:
+            return sorted(
+                (nama_sheet, row, identitas)
+                for (nama_sheet, row), (p, _, identitas) in self._entries.items() if p == pembayar
+            )
@@ -0,0 +1,95 @@
+"""Migrasi sheet pengeluaran per bulan ("Juni2025", ...) ke satu worksheet Transaksi.
+
+Aman dijalankan berulang: baris dicocokkan ke tabel transaksi menurut isinya
+(sheet asal + Tanggal, Keperluan, Jumlah, Yang Bayar), bukan nomor barisnya,
+jadi sheet bulanan yang masih dipakai -- termasuk yang barisnya sempat dihapus
+lalu ditambah -- bisa dimigrasi lagi belakangan tanpa baris ganda atau hilang.
+Baris identik dihitung sebagai multiset: dua baris sama di sheet vs satu di
+tabel -> satu baris baru. Sheet bulanan tidak diubah.
+
+Jalankan: python -m kas.migrasi [--secrets .streamlit/secrets.toml] [--dry-run]
+"""
+import argparse
+import tomllib
+from collections import Counter
+
+from kas.client import SpreadsheetKeyCache, build_client, open_spreadsheet
+from kas.config import SHARED_STATE_DIR, SPREADSHEET_NAME, TRANSAKSI_SHEET_NAME
+from kas.sheets import batch_fetch_values
+from kas.transaksi import TRANSAKSI_COLUMNS, baris_transaksi, urai_nama_bulan
+
+
+def sheet_bulanan(spreadsheet):
+    # Semua worksheet bernama <NamaBulan><Tahun>, urut kronologis
+    nama = [ws.title for ws in spreadsheet.worksheets() if urai_nama_bulan(ws.title)]
+    return sorted(nama, key=urai_nama_bulan)
+
+
+def kunci_baris(nama_sheet, row):
+    # (sheet asal, tanggal, keperluan, jumlah, yang bayar); status ganti boleh berubah setelah migrasi
+    row = (list(row) + [''] * 4)[:4]
+    return (nama_sheet,) + tuple(str(sel).strip() for sel in row)
+
+
+def migrasi(spreadsheet, nama_sheets=None, dry_run=False):
+    """Salin baris semua sheet bulanan yang belum dimigrasi dengan satu append_rows.
+
+    Mengembalikan {nama_sheet: jumlah baris baru}.
+    """
+    nama_sheets = list(nama_sheets) if nama_sheets is not None else sheet_bulanan(spreadsheet)
+    values = batch_fetch_values(spreadsheet, nama_sheets + [TRANSAKSI_SHEET_NAME])
+    tabel = values.pop(TRANSAKSI_SHEET_NAME)
+    kolom_sumber = TRANSAKSI_COLUMNS.index('Sumber')
+    kolom_isi = slice(TRANSAKSI_COLUMNS.index('Tanggal'), kolom_sumber)
+    # Baris hasil migrasi sebelumnya, dikenali dari nama sheet di Sumber ("Juni2025!12") + isinya
+    sudah = Counter(
+        kunci_baris(row[kolom_sumber].split('!')[0], row[kolom_isi])
+        for row in (tabel or [])[1:]
+        if len(row) > kolom_sumber and row[kolom_sumber]
+    )
+
+    rows, jumlah = [], {}
+    for nama_sheet in nama_sheets:
+        jumlah[nama_sheet] = 0
+        for nomor_baris, row in enumerate((values[nama_sheet] or [])[1:], start=2):
+            if not any(str(sel).strip() for sel in row):
+                continue
+            kunci = kunci_baris(nama_sheet, row)
+            if sudah[kunci] > 0:
+                sudah[kunci] -= 1
+                continue
+            sumber = f"{nama_sheet}!{nomor_baris}"
+            rows.append(baris_transaksi(nama_sheet, row, sumber))
+            jumlah[nama_sheet] += 1
+
+    if dry_run or not rows:
+        return jumlah
+    if tabel is None:
+        ws = spreadsheet.add_worksheet(TRANSAKSI_SHEET_NAME, rows=len(rows) + 1000, cols=len(TRANSAKSI_COLUMNS))
+        rows.insert(0, TRANSAKSI_COLUMNS)
+    else:
+        ws = spreadsheet.worksheet(TRANSAKSI_SHEET_NAME)
+    ws.append_rows(rows)
+    return jumlah
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--secrets", default=".streamlit/secrets.toml", help="berkas secrets Streamlit")
+    parser.add_argument("--dry-run", action="store_true", help="hanya hitung baris yang akan dimigrasi")
+    args = parser.parse_args(argv)
+
+    with open(args.secrets, 'rb') as berkas:
+        secrets = tomllib.load(berkas)
+    client = build_client(dict(secrets["gcp_service_account"]), state_dir=SHARED_STATE_DIR)
+    spreadsheet = open_spreadsheet(
+        client, SPREADSHEET_NAME, SpreadsheetKeyCache(SHARED_STATE_DIR), key=secrets.get("spreadsheet_key")
+    )
+    jumlah = migrasi(spreadsheet, dry_run=args.dry_run)
+    for nama_sheet, n in jumlah.items():
+        print(f"{nama_sheet:<16} {n:5d} baris")
+    print(f"Total {sum(jumlah.values())} baris {'akan' if args.dry_run else 'sudah'} ditulis ke {TRANSAKSI_SHEET_NAME}.")
+
+
+if __name__ == "__main__":
+    main()
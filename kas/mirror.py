@@ -0,0 +1,480 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from gspread.exceptions import APIError
+from gspread.utils import rowcol_to_a1
+
+from kas.sheets import baca_potongan, batch_fetch_values, quote_sheet
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheet_rows (
+    sheet TEXT NOT NULL,
+    row_number INTEGER NOT NULL,
+    cells TEXT NOT NULL,
+    PRIMARY KEY (sheet, row_number)
+);
+CREATE TABLE IF NOT EXISTS sheet_state (
+    sheet TEXT PRIMARY KEY,
+    headers TEXT NOT NULL,
+    last_row INTEGER NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+class LocalMirror:
+    """Salinan lokal (SQLite) dari isi worksheet, baris disimpan per nomor baris sheet.
+
+    Aplikasi membaca dari sini; Google Sheets hanya dipakai untuk sinkronisasi
+    dan penulisan.
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "kas_mirror.sqlite3")
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def sheets(self):
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT sheet FROM sheet_state")]
+
+    def has(self, sheet):
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM sheet_state WHERE sheet = ?", (sheet,)).fetchone() is not None
+
+    def last_row(self, sheet):
+        with self._connect() as conn:
+            row = conn.execute("SELECT last_row FROM sheet_state WHERE sheet = ?", (sheet,)).fetchone()
+        return row[0] if row else 0
+
+    def synced_at(self, sheet):
+        with self._connect() as conn:
+            row = conn.execute("SELECT synced_at FROM sheet_state WHERE sheet = ?", (sheet,)).fetchone()
+        return row[0] if row else None
+
+    def headers(self, sheet):
+        with self._connect() as conn:
+            state = conn.execute("SELECT headers FROM sheet_state WHERE sheet = ?", (sheet,)).fetchone()
+        return json.loads(state[0]) if state else None
+
+    def column(self, sheet, col):
+        # {row_number: isi sel} satu kolom, tanpa memuat seluruh baris
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT row_number, json_extract(cells, ?) FROM sheet_rows WHERE sheet = ?", (f"$[{col - 1}]", sheet)
+            ).fetchall()
+        return {row_number: "" if nilai is None else str(nilai) for row_number, nilai in rows}
+
+    def read_values(self, sheet):
+        # Format sama dengan get_all_values: baris header lalu baris data
+        with self._connect() as conn:
+            state = conn.execute("SELECT headers FROM sheet_state WHERE sheet = ?", (sheet,)).fetchone()
+            if state is None:
+                return None
+            rows = conn.execute(
+                "SELECT cells FROM sheet_rows WHERE sheet = ? ORDER BY row_number", (sheet,)
+            ).fetchall()
+        return [json.loads(state[0])] + [json.loads(cells) for (cells,) in rows]
+
+    def read_chunks(self, sheet, size):
+        """Seperti read_values, tapi baris dibaca per `size` baris.
+
+        Mengembalikan (headers, iterator (first_row, rows)) atau None bila sheet
+        belum dimirror; baris dari iterator urut naik menurut nomor baris.
+        """
+        with self._connect() as conn:
+            state = conn.execute("SELECT headers FROM sheet_state WHERE sheet = ?", (sheet,)).fetchone()
+        if state is None:
+            return None
+
+        def chunks():
+            terakhir = 1
+            while True:
+                with self._connect() as conn:
+                    rows = conn.execute(
+                        "SELECT row_number, cells FROM sheet_rows WHERE sheet = ? AND row_number > ? "
+                        "ORDER BY row_number LIMIT ?",
+                        (sheet, terakhir, size),
+                    ).fetchall()
+                if not rows:
+                    return
+                terakhir = rows[-1][0]
+                yield rows[0][0], [json.loads(cells) for _, cells in rows]
+
+        return json.loads(state[0]), chunks()
+
+    def rows(self, sheet, first_row, last_row):
+        # Isi baris first_row..last_row berurutan; baris yang tidak ada di mirror -> []
+        with self._connect() as conn:
+            rows = dict(conn.execute(
+                "SELECT row_number, cells FROM sheet_rows WHERE sheet = ? AND row_number BETWEEN ? AND ?",
+                (sheet, first_row, last_row),
+            ).fetchall())
+        return [json.loads(rows[n]) if n in rows else [] for n in range(first_row, last_row + 1)]
+
+    def row(self, sheet, row_number):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT cells FROM sheet_rows WHERE sheet = ? AND row_number = ?", (sheet, row_number)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def replace(self, sheet, values):
+        headers = values[0] if values else []
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM sheet_rows WHERE sheet = ?", (sheet,))
+            conn.executemany(
+                "INSERT INTO sheet_rows (sheet, row_number, cells) VALUES (?, ?, ?)",
+                [(sheet, i, json.dumps(row)) for i, row in enumerate(values[1:], start=2)],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO sheet_state (sheet, headers, last_row, synced_at) VALUES (?, ?, ?, ?)",
+                (sheet, json.dumps(headers), max(len(values), 1), time.time()),
+            )
+
+    def drop(self, sheet):
+        # Lupakan isi sheet; pembaca berikutnya menariknya ulang seperti cold start
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM sheet_state WHERE sheet = ?", (sheet,))
+            conn.execute("DELETE FROM sheet_rows WHERE sheet = ?", (sheet,))
+
+    def begin_replace(self, sheet):
+        # Isi ulang per potongan: has(sheet) baru True lagi setelah finish_replace
+        self.drop(sheet)
+
+    def put_rows(self, sheet, first_row, rows):
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sheet_rows (sheet, row_number, cells) VALUES (?, ?, ?)",
+                [(sheet, first_row + i, json.dumps(row)) for i, row in enumerate(rows)],
+            )
+
+    def finish_replace(self, sheet, headers, last_row):
+        # Baris di bawah last_row (sudah dihapus di sheet) ikut dibuang
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM sheet_rows WHERE sheet = ? AND row_number > ?", (sheet, last_row))
+            conn.execute(
+                "INSERT OR REPLACE INTO sheet_state (sheet, headers, last_row, synced_at) VALUES (?, ?, ?, ?)",
+                (sheet, json.dumps(headers), last_row, time.time()),
+            )
+
+    def append(self, sheet, rows, first_row):
+        # INSERT OR REPLACE: aman bila baris yang sama juga ditarik oleh sinkronisasi
+        last = first_row + len(rows) - 1
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sheet_rows (sheet, row_number, cells) VALUES (?, ?, ?)",
+                [(sheet, first_row + i, json.dumps([str(v) for v in row])) for i, row in enumerate(rows)],
+            )
+            conn.execute(
+                "UPDATE sheet_state SET last_row = MAX(last_row, ?), synced_at = ? WHERE sheet = ?",
+                (last, time.time(), sheet),
+            )
+
+    def set_cell(self, sheet, row_number, col, value):
+        self.set_cells(sheet, col, {row_number: value})
+
+    def set_cells(self, sheet, col, values):
+        # values: {row_number: isi}; baris yang tidak ada di mirror dilewati
+        with self._lock, self._connect() as conn:
+            for row_number, value in values.items():
+                row = conn.execute(
+                    "SELECT cells FROM sheet_rows WHERE sheet = ? AND row_number = ?", (sheet, row_number)
+                ).fetchone()
+                if row is None:
+                    continue
+                cells = json.loads(row[0])
+                cells.extend([""] * (col - len(cells)))
+                cells[col - 1] = str(value)
+                conn.execute(
+                    "UPDATE sheet_rows SET cells = ? WHERE sheet = ? AND row_number = ?",
+                    (json.dumps(cells), sheet, row_number),
+                )
+
+
+def sync_mirror(spreadsheet, mirror, names, full=False, bertahap=None):
+    """Tarik perubahan dari Google Sheets ke mirror dengan satu values_batch_get.
+
+    Sheet yang sudah ada di mirror hanya diambil mulai baris setelah last_row;
+    sheet baru (atau full=True) diambil seluruhnya. Sheet besar di `bertahap`
+    ({nama: ukuran potongan}) yang perlu diambil seluruhnya dibaca per potongan
+    lewat sync_bertahap, tidak ikut values_batch_get. Mengembalikan nama sheet yang berubah.
+    """
+    names = list(names)
+    start_rows = {} if full else {n: mirror.last_row(n) + 1 for n in names if mirror.has(n)}
+    besar = [n for n in names if n in (bertahap or {}) and n not in start_rows]
+    changed = [n for n in besar if sync_bertahap(spreadsheet, mirror, n, bertahap[n])]
+    fetched = batch_fetch_values(spreadsheet, [n for n in names if n not in besar], start_rows)
+
+    for name, values in fetched.items():
+        if values is None:
+            continue
+        if name in start_rows:
+            if values:
+                mirror.append(name, values, start_rows[name])
+                changed.append(name)
+        elif mirror.read_values(name) != values:
+            mirror.replace(name, values)
+            changed.append(name)
+    return changed
+
+
+def _rapat(cells):
+    # Isi baris untuk dibandingkan: sel kosong di ujung dibuang (values_batch_get tidak mengirimnya)
+    cells = [str(c) for c in cells]
+    while cells and cells[-1] == "":
+        cells.pop()
+    return cells
+
+
+def _tanpa_kolom(cells, col):
+    cells = list(cells)
+    if len(cells) >= col:
+        cells[col - 1] = ""
+    return _rapat(cells)
+
+
+def periksa_mirror(spreadsheet, mirror, kolom_status):
+    """Cek murah sheet yang sudah dimirror, semua sheet dalam satu values_batch_get.
+
+    kolom_status: {nama_sheet: kolom} kolom yang diubah di tempat oleh aplikasi
+    (mis. 'Sudah Diganti?'). Per sheet hanya diambil kolom itu sampai baris
+    terakhir di mirror, ditambah baris terakhir itu dan baris sesudahnya; baris
+    baru ditambahkan dan status yang berbeda ditimpa di mirror. Sheet yang
+    belum dimirror, atau yang baris terakhirnya tidak lagi sama (ada baris
+    disisip/dihapus di atasnya), perlu sinkron penuh. Editan di kolom lain baru
+    terbawa oleh sinkron penuh. Mengembalikan (berubah, perlu_penuh).
+    """
+    cek = {name: mirror.last_row(name) for name in kolom_status if mirror.has(name)}
+    penuh = [name for name in kolom_status if name not in cek]
+    if not cek:
+        return [], penuh
+    ranges = []
+    for name, last in cek.items():
+        col = kolom_status[name]
+        ranges.append(f"{quote_sheet(name)}!{rowcol_to_a1(2, col)}:{rowcol_to_a1(max(last, 2), col)}")
+        ranges.append(f"{quote_sheet(name)}!A{last}:Z")
+    try:
+        value_ranges = spreadsheet.values_batch_get(ranges).get('valueRanges', [])
+    except APIError:
+        # Ada sheet yang dihapus/diganti nama: biar sinkron penuh yang menanganinya
+        return [], penuh + list(cek)
+
+    changed = []
+    for i, (name, last) in enumerate(cek.items()):
+        col = kolom_status[name]
+        status, ekor = (value_ranges[2 * i].get('values', []), value_ranges[2 * i + 1].get('values', []))
+        lama = mirror.headers(name) if last == 1 else mirror.row(name, last)
+        if _tanpa_kolom(ekor[0] if ekor else [], col) != _tanpa_kolom(lama or [], col):
+            penuh.append(name)
+            continue
+        di_mirror = mirror.column(name, col)
+        beda = {}
+        for row_number in range(2, last + 1):
+            cells = status[row_number - 2] if row_number - 2 < len(status) else []
+            nilai = str(cells[0]) if cells else ""
+            if nilai != di_mirror.get(row_number, ""):
+                beda[row_number] = nilai
+        if beda:
+            mirror.set_cells(name, col, beda)
+        if ekor[1:]:
+            mirror.append(name, ekor[1:], last + 1)
+        if beda or ekor[1:]:
+            changed.append(name)
+    return changed, penuh
+
+
+def sync_bertahap(spreadsheet, mirror, name, size):
+    """Tarik ulang seluruh isi satu sheet besar per potongan (baca_potongan) dan samakan mirror.
+
+    Tiap potongan dibandingkan dengan baris yang sama di mirror dan hanya yang
+    berbeda yang ditulis, jadi yang ada di memori paling banyak beberapa
+    potongan mentah. Sheet yang belum dimirror diisi lewat stream_mirror.
+    Mengembalikan True bila isinya berubah (None bila sheet belum dibuat).
+    Bila terputus di tengah, sheet dibuang dari mirror supaya ditarik ulang utuh.
+    """
+    if not mirror.has(name):
+        hasil = stream_mirror(spreadsheet, mirror, name, size)
+        if hasil is None:
+            return None
+        for _ in hasil[1]:
+            pass
+        return True
+    hasil = baca_potongan(spreadsheet, name, size)
+    if hasil is None:
+        return None
+    headers, potongan = hasil
+    try:
+        berubah = _rapat(headers) != _rapat(mirror.headers(name))
+        last_row = 1
+        for first_row, rows in potongan:
+            ujung = first_row + len(rows) - 1
+            if [_rapat(r) for r in rows] != [_rapat(r) for r in mirror.rows(name, first_row, ujung)]:
+                mirror.put_rows(name, first_row, rows)
+                berubah = True
+            last_row = max(last_row, ujung)
+        berubah = berubah or last_row != mirror.last_row(name)
+        mirror.finish_replace(name, headers, last_row)
+    except Exception:
+        mirror.drop(name)
+        raise
+    return berubah
+
+
+def stream_mirror(spreadsheet, mirror, name, size):
+    """Isi ulang mirror satu sheet lewat baca_potongan, potongan terbaru lebih dulu.
+
+    Mengembalikan (headers, iterator (first_row, rows)) seperti baca_potongan,
+    atau None bila sheet belum dibuat. Tiap potongan ditulis ke mirror sebelum
+    diteruskan ke pemanggil; sheet baru dianggap sudah dimirror setelah iterator
+    habis, jadi pembacaan yang terputus diulang dari awal.
+    """
+    hasil = baca_potongan(spreadsheet, name, size)
+    if hasil is None:
+        return None
+    headers, potongan = hasil
+
+    def tulis():
+        mirror.begin_replace(name)
+        last_row = 1
+        for first_row, rows in potongan:
+            mirror.put_rows(name, first_row, rows)
+            last_row = max(last_row, first_row + len(rows) - 1)
+            yield first_row, rows
+        mirror.finish_replace(name, headers, last_row)
+
+    return headers, tulis()
+
+
+class MirrorSync:
+    """Thread latar yang menyinkronkan mirror secara berkala, dipakai bersama oleh semua sesi.
+
+    Dengan `revision` (fungsi murah yang nilainya berubah setiap spreadsheet
+    diubah, mis. modifiedTime dari Drive) tiap `interval` detik hanya revisi itu
+    yang dibaca. Bila revisinya berubah, sheet yang punya `kolom_status` dicek
+    murah lewat periksa_mirror dan hanya yang strukturnya berubah (atau tanpa
+    `kolom_status`) yang ditarik penuh; yang isinya berbeda dari mirror
+    dilaporkan ke `on_change`. Bila cek murah tidak menemukan apa pun padahal
+    revisinya berubah, perubahannya ada di kolom lain (atau tulisan aplikasi
+    sendiri), jadi semua sheet dibandingkan penuh. Editan kolom lain yang masuk
+    bersamaan dengan perubahan status terbawa oleh perbandingan penuh tiap
+    `full_interval` detik, yang dilewati bila revisinya tidak berubah sejak
+    perbandingan penuh terakhir. Tanpa `revision` (atau bila tidak bisa dibaca)
+    hanya baris baru yang ditarik tiap `interval` detik, ditambah perbandingan
+    penuh tiap `full_interval` detik. Sheet di `bertahap` ({nama: ukuran
+    potongan}) yang perlu ditarik penuh dibaca per potongan (sync_bertahap).
+
+    `generation` naik setiap ada sheet yang berubah; sesi cukup membandingkannya
+    dengan nilai yang terakhir dilihat untuk tahu kapan perlu rerun.
+    """
+
+    def __init__(self, spreadsheet, mirror, names, interval=60, full_interval=15 * 60, on_change=None,
+                 revision=None, kolom_status=None, bertahap=None):
+        self.spreadsheet = spreadsheet
+        self.mirror = mirror
+        self.names = list(names)
+        self.interval = interval
+        self.full_interval = full_interval
+        self.on_change = on_change
+        self.revision = revision
+        self.kolom_status = dict(kolom_status or {})
+        self.bertahap = bertahap
+        self.generation = 0
+        self.last_sync = None
+        self.last_error = None
+        self._revisi = None
+        self._revisi_penuh = None
+        self._last_full = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="kas-mirror-sync", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def sync_once(self, full=False, names=None):
+        changed = sync_mirror(
+            self.spreadsheet, self.mirror, self.names if names is None else names, full=full, bertahap=self.bertahap,
+        )
+        return self._lapor(changed)
+
+    def periksa_once(self, revisi=None):
+        # Cek murah per sheet, lalu tarik penuh hanya sheet yang perlu. Bila tidak ada yang terlihat berubah,
+        # semua sheet dibandingkan penuh: editan kolom selain status tidak terlihat oleh cek murah
+        kolom = {name: self.kolom_status[name] for name in self.names if name in self.kolom_status}
+        changed, penuh = periksa_mirror(self.spreadsheet, self.mirror, kolom)
+        penuh += [name for name in self.names if name not in kolom]
+        if not changed and not penuh:
+            penuh = list(self.names)
+            self._revisi_penuh = revisi
+            self._last_full = time.monotonic()
+        if penuh:
+            changed += sync_mirror(self.spreadsheet, self.mirror, penuh, full=True, bertahap=self.bertahap)
+        return self._lapor(changed)
+
+    def _lapor(self, changed):
+        self.last_sync = time.time()
+        self.last_error = None
+        if changed:
+            if self.on_change:
+                self.on_change(changed)
+            # Dinaikkan setelah cache di-invalidate, jadi sesi yang melihat generasi baru memuat data baru
+            self.generation += 1
+        return changed
+
+    def poll_once(self):
+        full = time.monotonic() - self._last_full >= self.full_interval
+        if self.revision is not None:
+            try:
+                revisi = self.revision()
+            except Exception:
+                # Revisi tidak bisa dibaca tapi sheet bisa (mis. Drive API belum diaktifkan): pakai pola lama
+                changed = self.sync_once()
+                self.revision = None
+                return changed
+            if revisi == self._revisi and (not full or revisi == self._revisi_penuh):
+                # Tidak berubah sejak poll terakhir (dan, bila jatuh tempo, sejak perbandingan penuh terakhir)
+                if full:
+                    self._last_full = time.monotonic()
+                self.last_sync = time.time()
+                self.last_error = None
+                return []
+            # Revisi dibaca sebelum isi sheet, jadi tulisan di antaranya terbawa di poll berikutnya
+            if full:
+                changed = self.sync_once(full=True)
+                self._revisi_penuh = revisi
+                self._last_full = time.monotonic()
+            else:
+                changed = self.periksa_once(revisi)
+            self._revisi = revisi
+            return changed
+        changed = self.sync_once(full=full)
+        if full:
+            self._last_full = time.monotonic()
+        return changed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.last_error = e
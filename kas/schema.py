@@ -0,0 +1,95 @@
+import re
+from datetime import datetime
+
+import pandas as pd
+
+# Skema kolom sheet pengeluaran setelah di-parse
+EXPENSE_SCHEMA = {
+    'Tanggal': 'datetime64[ns]',
+    'Keperluan': 'category',
+    'Jumlah': 'int64',
+    'Yang Bayar': 'category',
+    'Sudah Diganti?': 'category',
+}
+CATEGORY_COLUMNS = [kolom for kolom, dtype in EXPENSE_SCHEMA.items() if dtype == 'category']
+FORMAT_TANGGAL = '%Y-%m-%d'
+
+# "Rp 1.250.000,00" -> "1250000": buang "Rp", spasi, titik ribuan dan sen di belakang koma
+_RE_SAMPAH_RUPIAH = r'Rp\.?|[\s.]|,\d{0,2}$'
+_RE_BILANGAN_BULAT = r'-?\d{1,18}'
+
+
+def parse_rupiah(series):
+    """Parse kolom Jumlah dalam satu pass regex. Mengembalikan (int64, mask baris gagal).
+
+    Semua langkah berjalan di string pyarrow (RE2 + cast Arrow), tanpa pd.to_numeric
+    yang mengubah tiap sel jadi objek Python.
+    """
+    bersih = (
+        series.astype('string[pyarrow]')
+              .fillna('')
+              .str.replace(_RE_SAMPAH_RUPIAH, '', regex=True)
+    )
+    valid = bersih.str.fullmatch(_RE_BILANGAN_BULAT)
+    gagal = ~valid & (bersih != '')
+    angka = bersih.where(valid, '0').astype('int64[pyarrow]').astype('int64')
+    return angka, gagal.astype(bool)
+
+
+def bersihkan_rupiah(teks):
+    # Versi skalar parse_rupiah untuk membandingkan satu sel: "Rp 1.250.000,00" -> "1250000"
+    return re.sub(_RE_SAMPAH_RUPIAH, '', str(teks))
+
+
+def angka_rupiah(teks):
+    # Nilai satu sel persis seperti hasil parse_rupiah: yang tidak bisa dibaca jadi 0
+    bersih = bersihkan_rupiah(teks)
+    return int(bersih) if re.fullmatch(_RE_BILANGAN_BULAT, bersih) else 0
+
+
+def tanggal_kunci(teks):
+    # Tanggal satu sel dalam FORMAT_TANGGAL seperti hasil parse_tanggal; '' bila tidak bisa dibaca
+    try:
+        return datetime.strptime(str(teks).strip(), FORMAT_TANGGAL).strftime(FORMAT_TANGGAL)
+    except ValueError:
+        return ''
+
+
+def parse_tanggal(series):
+    teks = series.astype(str).str.strip()
+    tanggal = pd.to_datetime(teks, format=FORMAT_TANGGAL, errors='coerce')
+    gagal = tanggal.isna() & (teks != '')
+    return tanggal.astype(EXPENSE_SCHEMA['Tanggal']), gagal
+
+
+def categorize(df):
+    for kolom in CATEGORY_COLUMNS:
+        if kolom in df.columns:
+            df[kolom] = df[kolom].astype(str).astype('category')
+    return df
+
+
+def parse_expense(df):
+    """Terapkan EXPENSE_SCHEMA ke DataFrame mentah (semua kolom string).
+
+    Nilai yang tidak bisa dibaca tidak lagi diam-diam jadi 0/NaT tanpa jejak:
+    dicatat di df.attrs['parse_errors'] sebagai (row_number, kolom, nilai asli).
+    """
+    errors = []
+    for kolom, parser in (('Tanggal', parse_tanggal), ('Jumlah', parse_rupiah)):
+        if kolom not in df.columns:
+            continue
+        asli = df[kolom]
+        df[kolom], gagal = parser(asli)
+        if gagal.any():
+            errors.extend(zip(df.loc[gagal, 'row_number'].tolist(), [kolom] * int(gagal.sum()), asli[gagal].tolist()))
+    categorize(df)
+    df.attrs['parse_errors'] = sorted(errors)
+    return df
+
+
+def set_category_value(df, mask, kolom, value):
+    if isinstance(df[kolom].dtype, pd.CategoricalDtype) and value not in df[kolom].cat.categories:
+        df[kolom] = df[kolom].cat.add_categories([value])
+    df.loc[mask, kolom] = value
+    return df
@@ -0,0 +1,228 @@
+import re
+
+import pandas as pd
+from gspread.exceptions import APIError
+from gspread.utils import fill_gaps, rowcol_to_a1
+
+from kas.schema import (
+    FORMAT_TANGGAL, angka_rupiah, categorize, parse_expense, set_category_value, tanggal_kunci,
+)
+
+EXPENSE_COLUMNS = ['Tanggal', 'Keperluan', 'Jumlah', 'Yang Bayar', 'Sudah Diganti?']
+IURAN_COLUMNS = ['Bulan', 'Nama', 'Status']
+KOLOM_SUDAH_DIGANTI = 5
+
+_RE_BARIS_AWAL = re.compile(r"![A-Z]+(\d+)")
+
+
+# --- MEMBANGUN DATAFRAME DARI NILAI MENTAH SHEET ---
+
+def _pad(values):
+    # values_batch_get tidak mengisi sel kosong di ujung baris seperti get_all_values
+    return fill_gaps(values, cols=len(values[0])) if values else values
+
+
+def expense_frame(values):
+    if len(values) < 2:
+        df = pd.DataFrame(columns=EXPENSE_COLUMNS)
+        df['row_number'] = pd.Series(dtype='int64')
+        return parse_expense(df)
+
+    values = _pad(values)
+    headers, rows = values[0], values[1:]
+    df = pd.DataFrame(rows, columns=headers)
+    df['row_number'] = range(2, len(df) + 2)
+    return parse_expense(df)
+
+
+def iuran_frame(values):
+    if len(values) < 2:
+        return pd.DataFrame(columns=IURAN_COLUMNS)
+    values = _pad(values)
+    return pd.DataFrame(values[1:], columns=values[0])
+
+
+FRAME_BUILDERS = {'expense': expense_frame, 'iuran': iuran_frame}
+
+
+# --- MEMUAT BANYAK WORKSHEET DALAM SATU REQUEST ---
+
+def quote_sheet(name):
+    return "'" + name.replace("'", "''") + "'"
+
+
+def sheet_range(name, start_row=None, end_row=None):
+    # Tanpa start_row berarti seluruh sheet; dengan start_row hanya baris start_row ke bawah (s.d. end_row)
+    if start_row is None:
+        return quote_sheet(name)
+    return f"{quote_sheet(name)}!A{start_row}:Z{end_row or ''}"
+
+
+def batch_fetch_values(spreadsheet, names, start_rows=None):
+    """Ambil isi beberapa worksheet dengan satu values_batch_get.
+
+    Mengembalikan {nama: values}; nama sheet yang belum dibuat bernilai None.
+    """
+    names = list(names)
+    start_rows = start_rows or {}
+    if not names:
+        return {}
+    try:
+        response = spreadsheet.values_batch_get([sheet_range(n, start_rows.get(n)) for n in names])
+    except APIError:
+        # Satu range yang tidak valid (sheet belum dibuat) menggagalkan seluruh request,
+        # jadi cek dulu sheet mana yang ada lalu ulangi tanpa sheet tersebut
+        existing = {ws.title for ws in spreadsheet.worksheets()}
+        if all(n in existing for n in names):
+            raise
+        hasil = {n: None for n in names if n not in existing}
+        hasil.update(batch_fetch_values(spreadsheet, [n for n in names if n in existing], start_rows))
+        return hasil
+
+    value_ranges = response.get('valueRanges', [])
+    return {n: vr.get('values', []) for n, vr in zip(names, value_ranges)}
+
+
+def batch_fetch_rows(spreadsheet, rows):
+    """Ambil isi beberapa baris [(nama_sheet, row)] dengan satu values_batch_get.
+
+    Mengembalikan {(nama_sheet, row): cells}; baris kosong atau di luar sheet -> [].
+    """
+    rows = list(rows)
+    if not rows:
+        return {}
+    response = spreadsheet.values_batch_get([f"{quote_sheet(nama)}!A{row}:Z{row}" for nama, row in rows])
+    value_ranges = response.get('valueRanges', [])
+    return {key: (vr.get('values') or [[]])[0] for key, vr in zip(rows, value_ranges)}
+
+
+def batch_load(spreadsheet, targets):
+    # targets: {worksheet_name: sheet_type}; sheet yang tidak ada bernilai None
+    values = batch_fetch_values(spreadsheet, targets)
+    return {
+        name: None if values[name] is None else FRAME_BUILDERS[sheet_type](values[name])
+        for name, sheet_type in targets.items()
+    }
+
+
+def batch_set_cells(spreadsheet, cells):
+    """Tulis banyak sel, boleh lintas worksheet, dengan satu values_batch_update.
+
+    cells: iterable (nama_sheet, row, col, value).
+    """
+    data = [
+        {'range': f"{quote_sheet(nama)}!{rowcol_to_a1(row, col)}", 'values': [[value]]}
+        for nama, row, col, value in cells
+    ]
+    if data:
+        spreadsheet.values_batch_update({'valueInputOption': 'USER_ENTERED', 'data': data})
+    return len(data)
+
+
+def identitas_pengeluaran(cells):
+    # Isi baris sheet bulanan yang tidak berubah saat ditandai lunas. Tanggal dan Jumlah dinormalisasi
+    # seperti parse_expense (Sheets bisa menampilkan angka dengan format mata uang), jadi hasilnya
+    # sebanding dengan identitas_frame_pengeluaran dari baris DataFrame yang dirender
+    cells = [str(c).strip() for c in (list(cells) + [''] * 4)[:4]]
+    return tanggal_kunci(cells[0]), cells[1], str(angka_rupiah(cells[2])), cells[3]
+
+
+def identitas_frame_pengeluaran(df):
+    # identitas_pengeluaran untuk tiap baris DataFrame hasil expense_frame
+    return list(zip(
+        df['Tanggal'].dt.strftime(FORMAT_TANGGAL).fillna(''),
+        df['Keperluan'].astype(str).str.strip(),
+        df['Jumlah'].astype(str),
+        df['Yang Bayar'].astype(str).str.strip(),
+    ))
+
+
+# --- MEMBACA SATU WORKSHEET BESAR PER POTONGAN ---
+
+def baris_grid(spreadsheet, name):
+    # Jumlah baris grid dari metadata (>= baris terakhir yang berisi); None bila sheet belum dibuat
+    for ws in spreadsheet.worksheets():
+        if ws.title == name:
+            return ws.row_count
+    return None
+
+
+def baca_potongan(spreadsheet, name, size, per_request=4):
+    """Baca worksheet per range A1 sebanyak `size` baris, mulai dari baris paling bawah (terbaru).
+
+    Mengembalikan (headers, iterator (first_row, rows)), atau None bila sheet
+    belum dibuat. Request pertama hanya mengambil header dan potongan terbaru
+    supaya bisa cepat dirender; sisanya diambil `per_request` range sekaligus
+    saat iterator dilanjutkan, jadi yang ada di memori paling banyak
+    `per_request` potongan mentah. Baris kosong di bawah data terakhir
+    dilewati, yang di atasnya dikembalikan sebagai [] seperti get_all_values.
+    """
+    akhir = baris_grid(spreadsheet, name)
+    if akhir is None:
+        return None
+    batas = [(max(2, ujung - size + 1), ujung) for ujung in range(akhir, 1, -size)]
+    ranges = [f"{quote_sheet(name)}!A1:Z1"] + [sheet_range(name, *b) for b in batas[:1]]
+    value_ranges = spreadsheet.values_batch_get(ranges).get('valueRanges', [])
+    headers = (value_ranges[0].get('values') or [[]])[0]
+    antrean = [(b, vr.get('values', [])) for b, vr in zip(batas[:1], value_ranges[1:])]
+
+    def potongan():
+        sisa = batas[1:]
+        ada_data = False
+        while antrean or sisa:
+            if not antrean:
+                kelompok, sisa = sisa[:per_request], sisa[per_request:]
+                response = spreadsheet.values_batch_get([sheet_range(name, *b) for b in kelompok])
+                antrean.extend((b, vr.get('values', [])) for b, vr in zip(kelompok, response.get('valueRanges', [])))
+            (awal, ujung), rows = antrean.pop(0)
+            if ada_data:
+                # Di atas data terakhir: baris kosong di ujung potongan tetap dihitung
+                rows = rows + [[] for _ in range(ujung - awal + 1 - len(rows))]
+            if rows:
+                ada_data = True
+                yield awal, rows
+
+    return headers, potongan()
+
+
+# --- PATCH DATAFRAME DI CACHE SETELAH MENULIS KE SHEET ---
+
+def appended_start_row(response, fallback):
+    # Respons append_row/append_rows berisi updatedRange, mis. "Juni2025!A12:E13"
+    updated_range = ((response or {}).get("updates") or {}).get("updatedRange", "")
+    match = _RE_BARIS_AWAL.search(updated_range)
+    return int(match.group(1)) if match else fallback
+
+
+def append_expense_rows(df, rows, first_row_number):
+    kolom = [c for c in df.columns if c != 'row_number']
+    baru = pd.DataFrame([[str(v) for v in list(row)[:len(kolom)]] for row in rows], columns=kolom)
+    baru['row_number'] = range(first_row_number, first_row_number + len(baru))
+    baru = parse_expense(baru)
+    if df.empty:
+        return baru
+    errors = df.attrs.get('parse_errors', []) + baru.attrs['parse_errors']
+    # Kategori kedua frame berbeda, jadi kolom kategori dibangun ulang setelah concat
+    gabungan = categorize(pd.concat([df, baru], ignore_index=True))
+    gabungan.attrs['parse_errors'] = errors
+    return gabungan
+
+
+def set_expense_status(df, row_numbers, status):
+    df = df.copy()
+    return set_category_value(df, df['row_number'].isin(row_numbers), 'Sudah Diganti?', status)
+
+
+def upsert_iuran_status(df, changes):
+    # changes: {(bulan, nama): status}, sama dengan hasil IuranWriter.flush()
+    df = df.copy()
+    baris_baru = []
+    for (bulan, nama), status in changes.items():
+        mask = (df['Bulan'] == bulan) & (df['Nama'] == nama)
+        if mask.any():
+            df.loc[mask[mask].index[0], 'Status'] = status
+        else:
+            baris_baru.append({'Bulan': bulan, 'Nama': nama, 'Status': status})
+    if baris_baru:
+        df = pd.concat([df, pd.DataFrame(baris_baru)], ignore_index=True)
+    return df
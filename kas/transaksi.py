@@ -0,0 +1,151 @@
+import re
+import threading
+import uuid
+
+import pandas as pd
+from gspread.utils import fill_gaps
+
+from kas.formatting import NAMA_BULAN_ID
+from kas.schema import categorize, parse_expense
+from kas.sheets import EXPENSE_COLUMNS, expense_frame
+
+# --- MODE TABEL TUNGGAL: SEMUA PENGELUARAN DI SATU WORKSHEET TRANSAKSI ---
+
+# Append-only; ID dibuat sekali saat baris ditulis dan tidak pernah berubah,
+# Sumber mencatat asal baris hasil migrasi (mis. "Juni2025!12")
+TRANSAKSI_COLUMNS = ['ID', 'Tahun', 'Bulan'] + EXPENSE_COLUMNS + ['Sumber']
+KOLOM_STATUS_TRANSAKSI = TRANSAKSI_COLUMNS.index('Sudah Diganti?') + 1
+# Kolom DataFrame per bulan: sama dengan mode sheet bulanan, ditambah ID
+KOLOM_FRAME = EXPENSE_COLUMNS + ['ID']
+
+_RE_NAMA_BULAN = re.compile(r"^(" + "|".join(NAMA_BULAN_ID) + r")(\d{4})$")
+
+
+def nama_bulan(tahun, bulan):
+    return f"{NAMA_BULAN_ID[bulan - 1]}{tahun}"
+
+
+def urai_nama_bulan(nama):
+    # "Juni2025" -> (2025, 6); None bila bukan nama sheet bulanan
+    match = _RE_NAMA_BULAN.match(nama)
+    if match is None:
+        return None
+    return int(match.group(2)), NAMA_BULAN_ID.index(match.group(1)) + 1
+
+
+def id_baru():
+    return uuid.uuid4().hex[:12]
+
+
+def baris_transaksi(bulan, row, sumber=''):
+    # row: [tanggal, keperluan, jumlah, yang_bayar, status_ganti] seperti di sheet bulanan
+    tahun, nomor = urai_nama_bulan(bulan)
+    row = (list(row) + [''] * len(EXPENSE_COLUMNS))[:len(EXPENSE_COLUMNS)]
+    return [id_baru(), tahun, nomor] + row + [sumber]
+
+
+def identitas_transaksi(cells):
+    # Baris tabel transaksi dikenali dari ID-nya saja
+    return str(cells[0]).strip() if cells else ''
+
+
+def frame_kosong():
+    df = expense_frame([])
+    df.insert(len(EXPENSE_COLUMNS), 'ID', pd.Series(dtype=object))
+    return df
+
+
+def pecah_per_bulan(values):
+    """Bangun DataFrame per bulan dari isi worksheet transaksi (format get_all_values).
+
+    Hasilnya {nama_bulan: DataFrame} urut kronologis dengan kolom KOLOM_FRAME +
+    row_number (nomor baris di worksheet transaksi). Baris dengan Tahun/Bulan
+    yang tidak bisa dibaca tidak masuk bulan mana pun.
+    """
+    if len(values) < 2:
+        return {}
+    tabel = TabelBertahap(values[0])
+    tabel.tambah(2, values[1:])
+    return tabel.frames()
+
+
+class TabelBertahap:
+    """Tabel transaksi yang dipecah per bulan potongan demi potongan, urutan potongan bebas.
+
+    Tiap potongan baris mentah langsung di-parse ke kolom bertipe, lalu posisi
+    baris per (Tahun, Bulan) diambil dari satu groupby; baris mentahnya boleh
+    dilepas setelah `tambah`. Jadi memori puncak kira-kira satu potongan mentah
+    ditambah kolom bertipe yang sudah terkumpul, bukan seluruh tabel dua kali.
+    """
+
+    def __init__(self, headers):
+        self.headers = list(headers)
+        self.jumlah_baris = 0
+        self._bagian = {}
+
+    def tambah(self, first_row, rows):
+        if not rows:
+            return
+        values = fill_gaps([self.headers] + rows, cols=len(self.headers))
+        df = pd.DataFrame(values[1:], columns=values[0])
+        df['row_number'] = range(first_row, first_row + len(df))
+        periode = pd.to_numeric(df['Tahun'], errors='coerce') * 100 + pd.to_numeric(df['Bulan'], errors='coerce')
+        df = parse_expense(df[KOLOM_FRAME + ['row_number']])
+        errors_per_baris = {}
+        for error in df.attrs['parse_errors']:
+            errors_per_baris.setdefault(error[0], []).append(error)
+
+        for kode, posisi in df.groupby(periode).indices.items():
+            tahun, bulan = divmod(int(kode), 100)
+            if not 1 <= bulan <= 12:
+                continue
+            bagian = df.iloc[posisi]
+            bagian.attrs['parse_errors'] = [
+                e for baris in bagian['row_number'] for e in errors_per_baris.get(baris, [])
+            ]
+            self._bagian.setdefault(nama_bulan(tahun, bulan), []).append(bagian)
+        self.jumlah_baris += len(df)
+
+    def bulan(self, nama):
+        # DataFrame satu bulan dari potongan yang sudah masuk sejauh ini (kosong bila belum ada)
+        bagian = self._bagian.get(nama)
+        return _gabung(bagian) if bagian else frame_kosong()
+
+    def frames(self):
+        return {nama: _gabung(self._bagian[nama]) for nama in sorted(self._bagian, key=urai_nama_bulan)}
+
+
+def _gabung(bagian):
+    # Kategori tiap potongan berbeda, jadi kolom kategori dibangun ulang setelah concat
+    bagian = sorted(bagian, key=lambda df: df['row_number'].iat[0])
+    df = categorize(pd.concat(bagian, ignore_index=True))
+    df.attrs['parse_errors'] = sorted(e for b in bagian for e in b.attrs['parse_errors'])
+    return df
+
+
+class IndeksBulan:
+    """Daftar bulan yang punya transaksi, menggantikan LIST_BULAN di mode tabel tunggal.
+
+    Diisi ulang setiap tabel transaksi dipecah per bulan, dan ditambah saat
+    aplikasi menulis transaksi untuk bulan yang belum ada.
+    """
+
+    def __init__(self):
+        self._bulan = set()
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        with self._lock:
+            return bool(self._bulan)
+
+    def set(self, daftar):
+        with self._lock:
+            self._bulan = set(daftar)
+
+    def add(self, bulan):
+        with self._lock:
+            self._bulan.add(bulan)
+
+    def daftar(self):
+        with self._lock:
+            return sorted(self._bulan, key=urai_nama_bulan)
@@ -0,0 +1,85 @@
+import plotly.express as px
+import streamlit as st
+
+from kas.aggregate import category_table, year_summary
+from kas.config import IURAN_SHEET_NAME, JUMLAH_IURAN, TAHUN
+from kas.data import (
+    daftar_bulan, data_version, frame_keys, get_aggregate_store, get_data_cache, get_figure_cache, load_data,
+    load_frame, month_aggregate,
+)
+from kas.instrument import stage
+
+
+def bar_kas_masuk(ringkasan):
+    with stage("plotly: kas masuk vs pengeluaran"):
+        fig = px.bar(ringkasan, x='Bulan', y=['Kas Masuk', 'Pengeluaran'], barmode='group')
+        fig.update_layout(margin=dict(l=20, r=20, t=30, b=20), legend_title_text='')
+    return fig
+
+
+def line_saldo(ringkasan):
+    with stage("plotly: saldo berjalan"):
+        fig = px.line(ringkasan, x='Bulan', y='Saldo Berjalan', markers=True)
+        fig.update_layout(margin=dict(l=20, r=20, t=30, b=20))
+    return fig
+
+
+def bar_keperluan(per_keperluan):
+    with stage("plotly: keperluan per bulan"):
+        fig = px.bar(per_keperluan, barmode='stack', labels={'index': 'Bulan', 'value': 'Jumlah', 'variable': 'Keperluan'})
+        fig.update_layout(margin=dict(l=20, r=20, t=30, b=20))
+    return fig
+
+
+def display_analitik(spreadsheet):
+    st.subheader(f"Analitik Tahun {TAHUN}")
+    st.markdown("---")
+
+    store = get_aggregate_store()
+    aggs = {}
+    for bulan in daftar_bulan(spreadsheet):
+        df = load_frame(spreadsheet, bulan, 'expense')
+        if df is not None:
+            aggs[bulan] = month_aggregate(bulan, df)
+    df_iuran = load_data(spreadsheet, IURAN_SHEET_NAME, sheet_type='iuran')
+    lunas = store.lunas(get_data_cache().version((IURAN_SHEET_NAME, 'iuran')), df_iuran)
+
+    if not aggs:
+        st.info("Belum ada sheet bulanan untuk dianalisis.")
+        return
+
+    with stage("pandas: ringkasan tahunan"):
+        ringkasan = year_summary(aggs, lunas, JUMLAH_IURAN)
+        ringkasan['Bulan'] = ringkasan['Bulan'].str.replace(str(TAHUN), '', regex=False)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Total Kas Masuk", f"Rp {ringkasan['Kas Masuk'].sum():,.0f}")
+    col2.metric("Total Pengeluaran", f"Rp {ringkasan['Pengeluaran'].sum():,.0f}")
+    saldo_akhir = ringkasan['Saldo Berjalan'].iloc[-1]
+    col3.metric("Saldo Kas Saat Ini", f"Rp {saldo_akhir:,.0f}", delta_color=("inverse" if saldo_akhir < 0 else "normal"))
+    st.markdown("---")
+
+    # Grafik tahunan bergantung pada semua bulan + sheet iuran, jadi versinya gabungan semuanya
+    figures = get_figure_cache()
+    versi = data_version(*frame_keys(spreadsheet))
+    col_kiri, col_kanan = st.columns(2)
+    with col_kiri:
+        st.subheader("Kas Masuk vs Pengeluaran")
+        fig = figures.get('bar_kas_masuk', versi, lambda: bar_kas_masuk(ringkasan))
+        st.plotly_chart(fig, use_container_width=True)
+    with col_kanan:
+        st.subheader("Saldo Kas Berjalan")
+        fig = figures.get('line_saldo', versi, lambda: line_saldo(ringkasan))
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Pengeluaran per Keperluan")
+    with stage("pandas: tabel keperluan"):
+        per_keperluan = category_table(aggs)
+        per_keperluan.index = [bulan.replace(str(TAHUN), '') for bulan in per_keperluan.index]
+    if not per_keperluan.empty:
+        fig = figures.get('bar_keperluan', versi, lambda: bar_keperluan(per_keperluan))
+        st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(per_keperluan, use_container_width=True)
+
+    st.subheader("Ringkasan per Bulan")
+    st.dataframe(ringkasan, use_container_width=True, hide_index=True)
@@ -0,0 +1,32 @@
+import pandas as pd
+import streamlit as st
+
+from kas.instrument import Profiler
+
+
+def get_profiler():
+    if 'profiler' not in st.session_state:
+        st.session_state.profiler = Profiler()
+    return st.session_state.profiler
+
+
+def display_debug_panel(profiler):
+    run = profiler.runs[-1] if profiler.runs else None
+    with st.sidebar.expander("🛠 Debug Profiler", expanded=True):
+        if run is None:
+            return
+        st.caption(f"Rerun terakhir ({run.page}): {run.duration * 1000:.0f} ms, {run.total_calls} API call")
+        st.markdown("**API call**")
+        if run.total_calls:
+            st.dataframe(pd.DataFrame(run.call_rows()), hide_index=True)
+        else:
+            st.caption("Tidak ada API call di rerun ini (semua dari cache/mirror).")
+        st.markdown("**Tahap**")
+        st.dataframe(pd.DataFrame(run.stage_rows()), hide_index=True)
+        st.markdown("**Cache**")
+        st.json(run.cache)
+        st.markdown("**Per halaman**")
+        st.dataframe(pd.DataFrame(profiler.page_rows()), hide_index=True)
+        st.download_button(
+            "Ekspor JSON", profiler.to_json(), file_name="kas_profiler.json", mime="application/json"
+        )
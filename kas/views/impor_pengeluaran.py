@@ -0,0 +1,65 @@
+import streamlit as st
+
+from kas.config import LIST_BULAN, TABEL_TUNGGAL
+from kas.data import impor_pengeluaran, load_frame
+from kas.importer import DUPLIKAT, baris_per_bulan, validasi_berkas
+from kas.instrument import stage
+
+
+def display_impor_pengeluaran(spreadsheet):
+    st.subheader("Impor Pengeluaran dari CSV / Excel")
+    st.markdown("---")
+
+    if spreadsheet is None:
+        st.warning("Sedang offline, pengeluaran belum bisa diimpor.")
+        return
+
+    st.caption(
+        "Kolom: Tanggal, Keperluan, Jumlah, Yang Bayar, dan opsional Sudah Diganti? (default BELUM). "
+        "Tiap baris masuk ke sheet bulan sesuai tanggalnya."
+    )
+    # Key diganti setelah impor sukses supaya uploader kosong lagi
+    berkas = st.file_uploader(
+        "Pilih berkas", type=["csv", "xlsx"], key=f"impor_berkas_{st.session_state.get('impor_ke', 0)}"
+    )
+    if berkas is None:
+        return
+
+    try:
+        with stage("impor: validasi berkas"):
+            # Mode tabel transaksi menerima bulan apa saja; mode bulanan hanya sheet di LIST_BULAN
+            hasil = validasi_berkas(
+                berkas, berkas.name, lambda bulan: load_frame(spreadsheet, bulan, 'expense'),
+                periode=None if TABEL_TUNGGAL else LIST_BULAN,
+            )
+    except (ValueError, UnicodeDecodeError) as e:
+        st.error(f"Berkas tidak bisa dibaca: {e}")
+        return
+
+    per_bulan = baris_per_bulan(hasil)
+    jumlah_siap = sum(len(rows) for rows in per_bulan.values())
+    duplikat = hasil[hasil['Masalah'] == DUPLIKAT]
+    bermasalah = hasil[~hasil['Masalah'].isin(['', DUPLIKAT])]
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Siap Diimpor", jumlah_siap)
+    c2.metric("Duplikat", len(duplikat))
+    c3.metric("Tidak Valid", len(bermasalah))
+
+    if per_bulan:
+        st.write("Per sheet bulan: " + ", ".join(f"{bulan} ({len(rows)})" for bulan, rows in per_bulan.items()))
+    if not bermasalah.empty:
+        with st.expander(f"Baris tidak valid ({len(bermasalah)})", expanded=True):
+            st.dataframe(bermasalah[['Baris', 'Masalah']], use_container_width=True, hide_index=True)
+    if not duplikat.empty:
+        with st.expander(f"Sudah ada di sheet, dilewati ({len(duplikat)})"):
+            st.dataframe(duplikat.drop(columns=['Masalah']), use_container_width=True, hide_index=True)
+
+    if jumlah_siap and st.button(f"📥 Impor {jumlah_siap} Baris", type="primary"):
+        try:
+            impor_pengeluaran(spreadsheet, per_bulan)
+            st.success(f"{jumlah_siap} pengeluaran berhasil diimpor ke {len(per_bulan)} sheet.")
+            st.session_state.impor_ke = st.session_state.get('impor_ke', 0) + 1
+        except Exception as e:
+            # Sheet yang sudah tertulis terdeteksi sebagai duplikat saat berkas yang sama diimpor ulang
+            st.error(f"Gagal mengimpor data: {e}")
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+import streamlit as st
+
+from kas.config import OPSI_KEPERLUAN, OPSI_PEMBAYAR
+from kas.data import simpan_pengeluaran
+
+
+def display_input_pengeluaran(spreadsheet, bulan_terpilih):
+    st.subheader("Input Pengeluaran / Reimburse Baru")
+    st.markdown("---")
+
+    if spreadsheet is None:
+        st.warning("Sedang offline, pengeluaran baru belum bisa disimpan.")
+        return
+
+    with st.form("input_form", clear_on_submit=True):
+        opsi_keperluan = OPSI_KEPERLUAN
+        opsi_pembayar = OPSI_PEMBAYAR
+        
+        c1, c2, c3 = st.columns(3)
+        tanggal = c1.date_input("Tanggal", value=datetime.now())
+        keperluan = c2.selectbox("Keperluan", options=opsi_keperluan)
+        jumlah = c3.number_input("Jumlah", min_value=0, step=1000)
+            
+        c4, c5 = st.columns(2)
+        yang_bayar = c4.selectbox("Yang Bayar", options=opsi_pembayar)
+        status_ganti = c5.selectbox("Sudah Diganti?", options=["BELUM", "SUDAH"], index=0)
+
+        submitted = st.form_submit_button("💾 Simpan Pengeluaran")
+        if submitted:
+            if jumlah > 0:
+                try:
+                    tanggal_standar = tanggal.strftime('%Y-%m-%d')
+                    simpan_pengeluaran(spreadsheet, bulan_terpilih, [[tanggal_standar, keperluan, jumlah, yang_bayar, status_ganti]])
+                    st.success("Data pengeluaran berhasil disimpan!")
+                except Exception as e:
+                    st.error(f"Gagal menyimpan data: {e}")
+            else:
+                st.warning("Jumlah tidak boleh nol.")
@@ -0,0 +1,212 @@
+import math
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from kas.aggregate import aggregate_month, distribusi_pengeluaran
+from kas.config import JUMLAH_IURAN, NAMA_PENGHUNI, OPSI_PEMBAYAR, TAHUN, UKURAN_HALAMAN
+from kas.data import (
+    data_version, get_figure_cache, get_ledger, identitas_frame, month_aggregate, muat_bertahap,
+    perlu_muat_bertahap, status_iuran, sync_ledger, tandai_sudah_diganti,
+)
+from kas.formatting import TANGGAL_TIDAK_VALID, format_tanggal_series
+from kas.instrument import stage
+from kas.sheets import EXPENSE_COLUMNS
+
+
+def tanggal_tampil(df):
+    # Tanggal yang gagal di-parse ditampilkan apa adanya seperti tertulis di sheet
+    asli = {baris: nilai for baris, kolom, nilai in df.attrs.get('parse_errors', []) if kolom == 'Tanggal'}
+    with stage("pandas: format tanggal"):
+        fallback = df['row_number'].map(asli).fillna(TANGGAL_TIDAK_VALID) if asli else TANGGAL_TIDAK_VALID
+        return format_tanggal_series(df['Tanggal'], fallback)
+
+
+def _laporkan_tandai(hasil, keterangan=""):
+    st.toast(f"{hasil.ditandai + hasil.sudah} pengeluaran{keterangan} ditandai sudah diganti. ✅")
+    if hasil.dipindah:
+        st.toast(f"{hasil.dipindah} baris bergeser di Google Sheets dan ditandai di posisi barunya.")
+    if hasil.hilang:
+        st.warning(
+            f"{len(hasil.hilang)} pengeluaran berubah atau dihapus di Google Sheets sejak dimuat, "
+            "jadi tidak ditandai. Daftar di bawah sudah diperbarui."
+        )
+
+
+def _tandai_terpilih(spreadsheet, nama_sheet, baris_tampil, editor_key):
+    # Callback tombol: berjalan sebelum rerun, jadi daftar langsung tampil tanpa st.rerun() tambahan.
+    # baris_tampil: [(row_number, identitas)] halaman yang dirender, urut seperti di editor
+    edits = st.session_state.get(editor_key, {}).get('edited_rows', {})
+    terpilih = [baris_tampil[int(pos)] for pos, ubah in edits.items() if ubah.get('Pilih')]
+    if not terpilih:
+        st.toast("Belum ada pengeluaran yang dipilih.")
+        return
+    try:
+        items = [(nama_sheet, row, identitas) for row, identitas in terpilih]
+        _laporkan_tandai(tandai_sudah_diganti(spreadsheet, items))
+        st.session_state.versi_editor_belum = st.session_state.get('versi_editor_belum', 0) + 1
+    except Exception as e:
+        st.error(f"Gagal mengupdate: {e}")
+
+
+def _lunasi_semua(spreadsheet, pembayar):
+    items = get_ledger().items_for(pembayar)
+    if not items:
+        return
+    try:
+        _laporkan_tandai(tandai_sudah_diganti(spreadsheet, items), f" {pembayar}")
+    except Exception as e:
+        st.error(f"Gagal mengupdate: {e}")
+
+
+def display_ledger(spreadsheet):
+    st.subheader("Belum Diganti per Orang (Semua Bulan)")
+    saldo = sync_ledger(spreadsheet).outstanding(urutan=OPSI_PEMBAYAR)
+    if not saldo:
+        st.success("Tidak ada pengeluaran yang belum diganti di bulan mana pun. ✅")
+        return
+
+    cols = st.columns(len(saldo))
+    for col, (pembayar, (total, jumlah_item)) in zip(cols, saldo.items()):
+        col.metric(pembayar, f"Rp {total:,.0f}", f"{jumlah_item} pengeluaran", delta_color="off")
+
+    c1, c2 = st.columns([0.7, 0.3])
+    pembayar = c1.selectbox("Lunasi semua pengeluaran milik:", list(saldo), key="ledger_pembayar")
+    c2.button(
+        f"Lunasi Semua ({saldo[pembayar][1]})",
+        on_click=_lunasi_semua,
+        args=(spreadsheet, pembayar),
+        disabled=spreadsheet is None,
+        use_container_width=True,
+    )
+
+
+def display_belum_diganti(spreadsheet, bulan_terpilih, df_belum_diganti):
+    st.caption(f"{len(df_belum_diganti)} pengeluaran, total Rp {df_belum_diganti['Jumlah'].sum():,.0f}")
+
+    total_halaman = max(1, math.ceil(len(df_belum_diganti) / UKURAN_HALAMAN))
+    halaman = 1
+    if total_halaman > 1:
+        halaman = st.number_input(
+            f"Halaman (dari {total_halaman})", min_value=1, max_value=total_halaman, value=1, step=1,
+            key=f"halaman_belum_{bulan_terpilih}",
+        )
+    potong = df_belum_diganti.iloc[(halaman - 1) * UKURAN_HALAMAN:halaman * UKURAN_HALAMAN]
+    baris_tampil = list(zip(potong['row_number'].tolist(), identitas_frame(potong)))
+
+    # Semua teks tampilan disiapkan per kolom untuk satu halaman saja, lalu dirender sebagai satu tabel
+    tabel = pd.DataFrame({
+        'Pilih': False,
+        'Tanggal': tanggal_tampil(potong),
+        'Keperluan': potong['Keperluan'].astype(str),
+        'Jumlah': potong['Jumlah'].map('Rp {:,.0f}'.format),
+        'Dibayar oleh': potong['Yang Bayar'].astype(str),
+    }).reset_index(drop=True)
+
+    editor_key = f"editor_belum_{bulan_terpilih}_{halaman}_{st.session_state.get('versi_editor_belum', 0)}"
+    st.data_editor(
+        tabel,
+        key=editor_key,
+        hide_index=True,
+        use_container_width=True,
+        disabled=['Tanggal', 'Keperluan', 'Jumlah', 'Dibayar oleh'],
+        column_config={'Pilih': st.column_config.CheckboxColumn("Pilih", width="small")},
+    )
+    st.button(
+        "Tandai Lunas yang Dipilih",
+        on_click=_tandai_terpilih,
+        args=(spreadsheet, bulan_terpilih, baris_tampil, editor_key),
+        disabled=spreadsheet is None,
+    )
+
+
+def pie_distribusi(distribusi):
+    with stage("plotly: pie distribusi"):
+        fig = px.pie(distribusi, values='Jumlah', names='Keperluan', hole=0.3)
+        fig.update_layout(margin=dict(l=20, r=20, t=30, b=20))
+    return fig
+
+
+def display_metrik(agg, iuran_status):
+    jumlah_lunas = sum(1 for status in iuran_status.values() if status == "LUNAS")
+    kas_masuk_dari_iuran = jumlah_lunas * JUMLAH_IURAN
+    total_pengeluaran = agg.total_pengeluaran
+    sisa_kas = kas_masuk_dari_iuran - total_pengeluaran
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Jumlah Kas Masuk (Iuran)", f"Rp {kas_masuk_dari_iuran:,.0f}", f"{jumlah_lunas}/{len(NAMA_PENGHUNI)} Orang Lunas")
+    col2.metric("Total Pengeluaran", f"Rp {total_pengeluaran:,.0f}")
+    col3.metric("Sisa Kas", f"Rp {sisa_kas:,.0f}", delta_color=("inverse" if sisa_kas < 0 else "normal"))
+
+
+def display_overview_bertahap(spreadsheet, bulan_terpilih):
+    # Cold start mode tabel: ringkasan bulan dirender dari potongan terbaru dan diperbarui tiap potongan
+    # yang lebih lama datang. Hanya elemen tanpa widget (dirender ulang di wadah yang sama); halaman
+    # lengkap menyusul di rerun berikutnya dari cache. Mengembalikan True bila tabel selesai dimuat.
+    wadah = st.empty()
+    for df_sebagian, df_iuran, dibaca in muat_bertahap(spreadsheet, bulan_terpilih):
+        with wadah.container():
+            st.subheader(f"Dashboard Bulan: {bulan_terpilih.replace(str(TAHUN), '')}")
+            st.caption(f"⏳ Memuat tabel transaksi dari baris terbaru: {dibaca:,} baris terbaca...")
+            # Tanpa overlay antrean tulis: StatusIuran mungkin belum dibuat, pesannya menyusul dari load_data
+            display_metrik(aggregate_month(df_sebagian), status_iuran(None, df_iuran, bulan_terpilih))
+            if not df_sebagian.empty:
+                terbaru = df_sebagian.sort_values('row_number', ascending=False)
+                tampil = terbaru[EXPENSE_COLUMNS].copy()
+                tampil['Tanggal'] = tanggal_tampil(terbaru)
+                st.dataframe(tampil, use_container_width=True, hide_index=True)
+    wadah.empty()
+    return not perlu_muat_bertahap(spreadsheet)
+
+
+def display_overview(spreadsheet, bulan_terpilih, df_pengeluaran, iuran_status):
+    st.subheader(f"Dashboard Bulan: {bulan_terpilih.replace(str(TAHUN), '')}")
+    st.markdown("---")
+
+    agg = month_aggregate(bulan_terpilih, df_pengeluaran)
+    display_metrik(agg, iuran_status)
+
+    parse_errors = df_pengeluaran.attrs.get('parse_errors', [])
+    if parse_errors:
+        detail = "; ".join(f"baris {baris} kolom {kolom}: '{nilai}'" for baris, kolom, nilai in parse_errors)
+        st.warning(f"Ada {len(parse_errors)} nilai di sheet yang tidak bisa dibaca dan dihitung 0/kosong: {detail}")
+    st.markdown("---")
+
+    col_bawah1, col_bawah2 = st.columns([0.6, 0.4])
+    with col_bawah1:
+        st.subheader("Daftar Pengeluaran yang Belum Diganti")
+        df_belum_diganti = df_pengeluaran[df_pengeluaran['Sudah Diganti?'] == 'BELUM']
+        
+        if df_belum_diganti.empty:
+            st.success("Semua pengeluaran sudah diganti. ✅")
+        else:
+            display_belum_diganti(spreadsheet, bulan_terpilih, df_belum_diganti)
+
+    with col_bawah2:
+        st.subheader("Distribusi Pengeluaran")
+        distribusi = distribusi_pengeluaran(agg)
+        if distribusi.empty:
+            st.info("Belum ada data pengeluaran untuk ditampilkan di diagram.")
+        else:
+            # Figure yang sama (objek & JSON identik) dipakai lagi selama data bulan ini tidak berubah
+            fig = get_figure_cache().get(
+                ('pie_distribusi', bulan_terpilih),
+                data_version((bulan_terpilih, 'expense')),
+                lambda: pie_distribusi(distribusi),
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("---")
+    display_ledger(spreadsheet)
+
+    st.markdown("---")
+    st.subheader("Seluruh Catatan Pengeluaran Bulan Ini")
+
+    if df_pengeluaran.empty:
+        st.info("Belum ada data pengeluaran untuk bulan ini.")
+    else:
+        df_full_display = df_pengeluaran.copy()
+        df_full_display['Tanggal'] = tanggal_tampil(df_pengeluaran)
+        df_full_display = df_full_display.drop(columns=['row_number'])
+        st.dataframe(df_full_display, use_container_width=True)
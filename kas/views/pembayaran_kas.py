@@ -0,0 +1,71 @@
+import streamlit as st
+
+from kas.config import IURAN_POLL_INTERVAL, NAMA_PENGHUNI
+from kas.data import get_iuran_write_behind
+from kas.writebehind import FAILED, PENDING
+
+
+def display_pembayaran_kas(spreadsheet, bulan_terpilih):
+    st.subheader("Input Pembayaran Kas per Orang")
+    st.info("Centang nama untuk menandakan sudah membayar iuran kas bulan ini. Status akan tersimpan otomatis di sheet StatusIuran2025.")
+    st.markdown("---")
+
+    if spreadsheet is None:
+        st.warning("Sedang offline, status iuran belum bisa disimpan.")
+        return
+    
+    daftar_checkbox_iuran(get_iuran_write_behind(spreadsheet), bulan_terpilih)
+
+
+def daftar_checkbox_iuran(antrean, bulan_terpilih):
+    # Fragment berkala hanya dipakai selagi ada status yang sedang disimpan; tanpa itu sesi yang
+    # sekadar membuka halaman ini tidak ikut rerun tiap detik
+    if antrean.busy(bulan_terpilih):
+        _daftar_checkbox_menyimpan(antrean, bulan_terpilih)
+    else:
+        _daftar_checkbox_diam(antrean, bulan_terpilih)
+
+
+@st.fragment(run_every=IURAN_POLL_INTERVAL)
+def _daftar_checkbox_menyimpan(antrean, bulan_terpilih):
+    _isi_daftar_checkbox(antrean, bulan_terpilih, berkala=True)
+
+
+@st.fragment
+def _daftar_checkbox_diam(antrean, bulan_terpilih):
+    _isi_daftar_checkbox(antrean, bulan_terpilih, berkala=False)
+
+
+def _isi_daftar_checkbox(antrean, bulan_terpilih, berkala):
+    # Checkbox langsung berubah (optimistic), penulisan ke Sheets berjalan di thread latar.
+    # Selagi menyimpan, fragment dijalankan ulang berkala agar status ⏳/⚠️ ikut diperbarui tanpa rerun penuh
+    def handle_checkbox_change(nama):
+        new_status = "LUNAS" if st.session_state[f"cb_{nama}"] else "BELUM LUNAS"
+        st.session_state.iuran_status[nama] = new_status
+        antrean.submit(bulan_terpilih, nama, new_status)
+
+    def coba_lagi(nama):
+        antrean.submit(bulan_terpilih, nama, st.session_state.iuran_status.get(nama, "BELUM LUNAS"))
+
+    for nama in NAMA_PENGHUNI:
+        status_saat_ini = st.session_state.iuran_status.get(nama, "BELUM LUNAS")
+        # State widget diisi dari status bersama tiap render; dengan `value=` saja checkbox ber-key
+        # tetap menampilkan nilai lama setelah penghuni lain mengubahnya atau bulan diganti
+        st.session_state[f"cb_{nama}"] = status_saat_ini == "LUNAS"
+        col_cb, col_status = st.columns([2, 3])
+        col_cb.checkbox(
+            nama,
+            key=f"cb_{nama}",
+            on_change=handle_checkbox_change,
+            args=(nama,)
+        )
+        status_tulis, error = antrean.status(bulan_terpilih, nama)
+        if status_tulis == PENDING:
+            col_status.caption("⏳ Menyimpan...")
+        elif status_tulis == FAILED:
+            col_status.caption(f"⚠️ Gagal disimpan: {error}")
+            col_status.button("Coba lagi", key=f"retry_{nama}", on_click=coba_lagi, args=(nama,))
+
+    if antrean.busy(bulan_terpilih) != berkala:
+        # Baru mulai / selesai menyimpan: pindah ke fragment dengan jadwal rerun yang sesuai
+        st.rerun(scope="app")
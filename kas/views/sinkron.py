@@ -0,0 +1,24 @@
+from datetime import datetime
+
+import streamlit as st
+
+from kas.config import SESSION_POLL_INTERVAL
+
+
+def tandai_data_dimuat(mirror_sync):
+    # Dipanggil sebelum data halaman dimuat: generasi data bersama yang dipakai rerun ini
+    st.session_state.generasi_data = mirror_sync.generation
+
+
+@st.fragment(run_every=SESSION_POLL_INTERVAL)
+def status_sinkron(mirror_sync):
+    # Berjalan berkala di tiap sesi tanpa request ke Google: bila poller bersama sudah menarik
+    # perubahan sejak halaman ini dimuat, seluruh halaman di-rerun dengan data baru
+    if mirror_sync.generation != st.session_state.get('generasi_data'):
+        tandai_data_dimuat(mirror_sync)
+        st.rerun(scope="app")
+
+    if mirror_sync.last_error is not None:
+        st.caption(f"⚠️ Sinkronisasi gagal: {mirror_sync.last_error}")
+    elif mirror_sync.last_sync is not None:
+        st.caption(f"Sinkron terakhir: {datetime.fromtimestamp(mirror_sync.last_sync):%H:%M:%S}")
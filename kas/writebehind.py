@@ -0,0 +1,130 @@
+import logging
+import threading
+
+_log = logging.getLogger(__name__)
+
+PENDING = "pending"
+FAILED = "failed"
+
+
+class IuranWriteBehind:
+    """Antrean tulis status iuran yang dikirim oleh thread latar (write-behind).
+
+    UI cukup memanggil `submit` lalu langsung lanjut. Toggle berulang untuk
+    (bulan, nama) yang sama digabung jadi satu nilai terakhir, kegagalan dicoba
+    ulang dengan backoff eksponensial, dan status per (bulan, nama) bisa dibaca
+    lewat `status` untuk ditampilkan di samping checkbox. Error dari
+    `on_written` dicatat di log dan `last_error` tanpa menghentikan thread,
+    karena saat itu tulisan ke sheet sudah berhasil.
+    """
+
+    def __init__(self, writer, on_written=None, max_retries=5, backoff=0.5, backoff_max=30.0):
+        self.writer = writer
+        self.on_written = on_written
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.last_error = None
+        self._pending = {}
+        self._errors = {}
+        self._failed = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="kas-iuran-write-behind", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def submit(self, bulan, nama, status):
+        with self._lock:
+            self._pending[(bulan, nama)] = status
+            self._errors.pop((bulan, nama), None)
+            self._failed.pop((bulan, nama), None)
+        self._wake.set()
+
+    def status(self, bulan, nama):
+        # (PENDING/FAILED/None, pesan error terakhir)
+        key = (bulan, nama)
+        with self._lock:
+            if key in self._errors:
+                return FAILED, self._errors[key]
+            if key in self._pending or key in self._in_flight:
+                return PENDING, None
+            return None, None
+
+    def pending_for(self, bulan):
+        # Nilai yang belum tersimpan (termasuk yang gagal), dipakai untuk menimpa status dari cache (optimistic UI)
+        with self._lock:
+            nilai = {nama: status for (b, nama), status in self._failed.items() if b == bulan}
+            nilai.update({nama: status for (b, nama), status in self._in_flight.items() if b == bulan})
+            nilai.update({nama: status for (b, nama), status in self._pending.items() if b == bulan})
+            return nilai
+
+    def busy(self, bulan):
+        # Masih ada yang menunggu / sedang dikirim untuk bulan ini (yang gagal permanen tidak dihitung)
+        with self._lock:
+            return any(b == bulan for b, _ in list(self._pending) + list(self._in_flight))
+
+    def wait_idle(self, timeout=None):
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+
+    def _run(self):
+        percobaan = 0
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                self._in_flight, self._pending = self._pending, {}
+                batch = dict(self._in_flight)
+            if not batch:
+                continue
+
+            try:
+                for (bulan, nama), status in batch.items():
+                    self.writer.queue(bulan, nama, status)
+                written = self.writer.flush()
+            except Exception as e:
+                percobaan += 1
+                self._retry_or_fail(batch, e, percobaan)
+                if percobaan <= self.max_retries:
+                    self._stop.wait(min(self.backoff * 2 ** (percobaan - 1), self.backoff_max))
+                    self._wake.set()
+                else:
+                    percobaan = 0
+                continue
+
+            percobaan = 0
+            try:
+                if self.on_written:
+                    self.on_written(written, self.writer)
+            except Exception as e:
+                self.last_error = e
+                _log.exception("on_written gagal setelah status iuran tersimpan")
+            finally:
+                with self._idle:
+                    self._in_flight = {}
+                    self._idle.notify_all()
+
+    def _retry_or_fail(self, batch, error, percobaan):
+        # Antrean internal writer dibuang; yang perlu dicoba lagi diantrekan ulang di sini
+        self.writer.discard()
+        with self._idle:
+            self._in_flight = {}
+            for key, status in batch.items():
+                if key in self._pending:
+                    continue  # sudah ada toggle yang lebih baru
+                if percobaan <= self.max_retries:
+                    self._pending[key] = status
+                else:
+                    self._errors[key] = str(error)
+                    self._failed[key] = status
+            self._idle.notify_all()